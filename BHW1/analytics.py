@@ -1,61 +1,464 @@
-from typing import Dict, List, Tuple
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from repositories import (
     InMemoryOperationRepository,
     InMemoryCategoryRepository,
     InMemoryBankAccountRepository,
 )
-from models import TransactionType, BankAccount
+from models import BankAccount, Operation
+from money import DEFAULT_SCALE, from_minor, to_minor
+from queries import NO_CATEGORY, UNKNOWN_ACCOUNT
+
+
+class RollupEngine:
+    """
+    Сводки операций по интервалам day/week/month/year в разрезе счетов и
+    категорий: доход, расход и количество операций в каждом интервале.
+    Обновляется фасадом операций при каждой записи, поэтому отчет за годы
+    читает несколько сотен интервалов вместо всей истории операций.
+    Состояние отдельных операций не хранится: при изменении и удалении
+    фасад передает прежнюю версию операции. Суммы хранятся в минимальных
+    единицах валюты и переводятся в Decimal в ответах
+    """
+
+    RESOLUTIONS = ("day", "week", "month", "year")
+    DIMENSIONS = ("account", "category")
+
+    def __init__(
+        self,
+        scale: int = DEFAULT_SCALE,
+        resolutions: Tuple[str, ...] = RESOLUTIONS,
+        dimensions: Tuple[str, ...] = DIMENSIONS,
+    ):
+        for resolution in resolutions:
+            if resolution not in self.RESOLUTIONS:
+                raise ValueError(f"Неподдерживаемый интервал сводки: {resolution}")
+        for dimension in dimensions:
+            if dimension not in self.DIMENSIONS:
+                raise ValueError(f"Неподдерживаемый разрез сводки: {dimension}")
+        self.scale = scale
+        self.resolutions = tuple(resolutions)
+        self.dimensions = tuple(dimensions)
+        # (разрез, интервал) -> ID счета или категории -> ключ -> [доход, расход, количество]
+        self._buckets: Dict[Tuple[str, str], Dict[Optional[int], Dict[int, List]]] = {
+            (dimension, resolution): {}
+            for dimension in self.dimensions
+            for resolution in self.resolutions
+        }
+        self._bucket_keys: Dict[Tuple[str, str], Dict[Optional[int], List[int]]] = {
+            slot: {} for slot in self._buckets
+        }
+
+    def add(self, operation: Operation) -> None:
+        self._apply(operation, 1)
+
+    def update(self, previous: Optional[Operation], operation: Operation) -> None:
+        """Заменяет вклад прежней версии операции вкладом новой"""
+        if previous is not None:
+            self._apply(previous, -1)
+        self._apply(operation, 1)
+
+    def remove(self, operation: Operation) -> None:
+        """Вычитает вклад операции в том виде, в каком она была добавлена"""
+        self._apply(operation, -1)
+
+    def rebuild(self, operations: Iterable[Operation]) -> None:
+        """Заполняет сводки заново по переданным операциям"""
+        for buckets in self._buckets.values():
+            buckets.clear()
+        for keys in self._bucket_keys.values():
+            keys.clear()
+        for operation in operations:
+            self.add(operation)
+
+    def bucket_key(self, resolution: str, date: datetime) -> int:
+        if resolution == "day":
+            return date.toordinal()
+        if resolution == "week":
+            # Первый день календаря, 1 января 1 года, приходится на понедельник
+            return (date.toordinal() - 1) // 7
+        if resolution == "month":
+            return date.year * 12 + date.month - 1
+        if resolution == "year":
+            return date.year
+        raise ValueError(f"Неподдерживаемый интервал сводки: {resolution}")
+
+    def bucket_start(self, resolution: str, key: int) -> datetime:
+        if resolution == "day":
+            return datetime.fromordinal(key)
+        if resolution == "week":
+            return datetime.fromordinal(key * 7 + 1)
+        if resolution == "month":
+            return datetime(key // 12, key % 12 + 1, 1)
+        if resolution == "year":
+            return datetime(key, 1, 1)
+        raise ValueError(f"Неподдерживаемый интервал сводки: {resolution}")
+
+    def bucket_end(self, resolution: str, key: int) -> datetime:
+        """Возвращает последний момент интервала"""
+        try:
+            return self.bucket_start(resolution, key + 1) - timedelta(microseconds=1)
+        except (ValueError, OverflowError):
+            return datetime.max
+
+    def covered_buckets(
+        self, resolution: str, start_date: datetime, end_date: datetime
+    ) -> Tuple[int, int]:
+        """Возвращает диапазон ключей интервалов, целиком входящих в период"""
+        first = self.bucket_key(resolution, start_date)
+        if self.bucket_start(resolution, first) < start_date:
+            first += 1
+
+        last = self.bucket_key(resolution, end_date)
+        if end_date < self.bucket_end(resolution, last):
+            last -= 1
+
+        return first, last
+
+    def totals(
+        self, resolution: str, dimension: str, first_key: int, last_key: int
+    ) -> Dict[Optional[int], List]:
+        """
+        Возвращает [сумма со знаком, количество] по счетам или категориям
+        за диапазон ключей интервалов
+        """
+        slot = self._slot(dimension, resolution)
+        result = {}
+        for id, keys in self._bucket_keys[slot].items():
+            lo = bisect_left(keys, first_key)
+            hi = bisect_right(keys, last_key, lo)
+            if lo == hi:
+                continue
+
+            buckets = self._buckets[slot][id]
+            total = 0
+            count = 0
+            for key in keys[lo:hi]:
+                income, expense, bucket_count = buckets[key]
+                total += income - expense
+                count += bucket_count
+            result[id] = [from_minor(total, self.scale), count]
+        return result
+
+    def query(
+        self,
+        resolution: str,
+        dimension: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[Optional[int], List[Tuple[datetime, Decimal, Decimal, int]]]:
+        """
+        Возвращает по каждому счету или категории список интервалов
+        (начало, доход, расход, количество), пересекающихся с периодом.
+        Границы периода расширяются до границ интервалов
+        """
+        slot = self._slot(dimension, resolution)
+        first_key = self.bucket_key(resolution, start_date)
+        last_key = self.bucket_key(resolution, end_date)
+
+        result = {}
+        buckets_by_id = self._buckets[slot]
+        for id, keys in self._bucket_keys[slot].items():
+            lo = bisect_left(keys, first_key)
+            hi = bisect_right(keys, last_key, lo)
+            if lo == hi:
+                continue
+
+            buckets = buckets_by_id[id]
+            rows = []
+            for key in keys[lo:hi]:
+                income, expense, count = buckets[key]
+                rows.append(
+                    (
+                        self.bucket_start(resolution, key),
+                        from_minor(income, self.scale),
+                        from_minor(expense, self.scale),
+                        count,
+                    )
+                )
+            result[id] = rows
+        return result
+
+    def _slot(self, dimension: str, resolution: str) -> Tuple[str, str]:
+        slot = (dimension, resolution)
+        if slot not in self._buckets:
+            raise ValueError(f"Сводка {resolution} по разрезу {dimension} не ведется")
+        return slot
+
+    def _apply(self, operation: Operation, sign: int) -> None:
+        amount = to_minor(operation.amount, self.scale)
+        if operation.type_flag > 0:
+            income, expense = amount, 0
+        else:
+            income, expense = 0, amount
+        keys = [
+            self.bucket_key(resolution, operation.date)
+            for resolution in self.resolutions
+        ]
+        ids = {
+            "account": operation.bank_account_id,
+            "category": operation.category_id or None,
+        }
+        for dimension in self.dimensions:
+            id = ids[dimension]
+            for resolution, key in zip(self.resolutions, keys):
+                slot = (dimension, resolution)
+                buckets = self._buckets[slot].setdefault(id, {})
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = [0, 0, 0]
+                    insort(self._bucket_keys[slot].setdefault(id, []), key)
+
+                bucket[0] += sign * income
+                bucket[1] += sign * expense
+                bucket[2] += sign
+                if bucket[2] == 0:
+                    del buckets[key]
+                    keys_by_id = self._bucket_keys[slot]
+                    id_keys = keys_by_id[id]
+                    del id_keys[bisect_left(id_keys, key)]
+                    if not id_keys:
+                        del keys_by_id[id]
+                        del self._buckets[slot][id]
+
+
+class AnalyticsResultCache:
+    """
+    Кэш результатов отчетов по ключу (метод, начало, конец периода).
+    Запись операции сбрасывает только отчеты, в период которых попадает ее дата
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[str, datetime, datetime], Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, method: str, start_date: datetime, end_date: datetime) -> Any:
+        key = (method, start_date, end_date)
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(
+        self, method: str, start_date: datetime, end_date: datetime, result: Any
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (method, start_date, end_date)
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, first_date: datetime, last_date: datetime = None) -> None:
+        """Сбрасывает отчеты, период которых пересекается с [first_date, last_date]"""
+        if last_date is None:
+            last_date = first_date
+        stale = [
+            key for key in self.entries if key[1] <= last_date and first_date <= key[2]
+        ]
+        for key in stale:
+            del self.entries[key]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики попаданий и промахов кэша"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
 
 
 class AnalyticsService:
+    # Интервалы, из которых собираются суммы по категориям: полные годы,
+    # затем полные месяцы и дни на краях периода
+    CATEGORY_RESOLUTIONS = ("year", "month", "day")
+
     def __init__(
         self,
         operation_repository: InMemoryOperationRepository,
         category_repository: InMemoryCategoryRepository,
         account_repository: InMemoryBankAccountRepository = None,
+        result_cache: Optional[AnalyticsResultCache] = None,
+        rollups: Optional[RollupEngine] = None,
     ):
         self.operation_repository = operation_repository
         self.category_repository = category_repository
         self.account_repository = account_repository
+        self.result_cache = result_cache
+        self.rollups = rollups
 
     def calculate_balance_for_period(
         self, start_date: datetime, end_date: datetime
     ) -> Decimal:
-        operations = self.operation_repository.get_all()
-        balance = Decimal("0.0")
+        cache = self.result_cache
+        if cache is not None:
+            result = cache.get("balance", start_date, end_date)
+            if result is not None:
+                return result
 
-        for op in operations:
-            if start_date <= op.date <= end_date:
-                if op.type == TransactionType.INCOME:
-                    balance += op.amount
-                else:
-                    balance -= op.amount
-
-        return balance
+        result = self.operation_repository.get_period_balance(start_date, end_date)
+        if cache is not None:
+            cache.put("balance", start_date, end_date, result)
+        return result
 
     def group_by_category(
         self, start_date: datetime, end_date: datetime
     ) -> Dict[str, Decimal]:
-        operations = self.operation_repository.get_all()
-        result = {}
+        cache = self.result_cache
+        if cache is not None:
+            result = cache.get("by_category", start_date, end_date)
+            if result is not None:
+                # Копия защищает закэшированный отчет от изменений вызывающим кодом
+                return dict(result)
 
-        for op in operations:
-            if start_date <= op.date <= end_date and op.category_id:
-                category = self.category_repository.get_by_id(op.category_id)
-                if category:
-                    if category.name not in result:
-                        result[category.name] = Decimal("0.0")
+        result = self._group_by_category(start_date, end_date)
+        if cache is not None:
+            cache.put("by_category", start_date, end_date, dict(result))
+        return result
 
-                    if op.type == TransactionType.INCOME:
-                        result[category.name] += op.amount
-                    else:
-                        result[category.name] -= op.amount
+    def _group_by_category(
+        self, start_date: datetime, end_date: datetime
+    ) -> Dict[str, Decimal]:
+        if start_date > end_date:
+            return {}
+
+        totals = {}
+        if self.rollups is None:
+            self._add_category_totals(totals, start_date, end_date)
+        else:
+            self._add_rollup_totals(
+                totals, start_date, end_date, self.CATEGORY_RESOLUTIONS
+            )
+
+        result = {}
+        for category_id, (amount, count) in totals.items():
+            category = self.category_repository.get_by_id(category_id)
+            if category and count:
+                result[category.name] = (
+                    result.get(category.name, Decimal("0.0")) + amount
+                )
 
         return result
 
+    def _add_rollup_totals(
+        self,
+        totals: Dict[int, List],
+        start_date: datetime,
+        end_date: datetime,
+        resolutions: Tuple[str, ...],
+    ) -> None:
+        # Полные интервалы берутся из сводок, края периода собираются из
+        # интервалов меньшего размера, остаток внутри дня - из репозитория
+        if start_date > end_date:
+            return
+        if not resolutions:
+            self._add_category_totals(totals, start_date, end_date)
+            return
+
+        rollups = self.rollups
+        resolution, finer = resolutions[0], resolutions[1:]
+        first_key, last_key = rollups.covered_buckets(resolution, start_date, end_date)
+        if first_key > last_key:
+            self._add_rollup_totals(totals, start_date, end_date, finer)
+            return
+
+        bucket_totals = rollups.totals(resolution, "category", first_key, last_key)
+        for category_id, (amount, count) in bucket_totals.items():
+            if category_id is not None:
+                self._merge_totals(totals, category_id, amount, count)
+
+        covered_start = rollups.bucket_start(resolution, first_key)
+        covered_end = rollups.bucket_end(resolution, last_key)
+        self._add_rollup_totals(
+            totals, start_date, covered_start - timedelta(microseconds=1), finer
+        )
+        if covered_end < datetime.max:
+            self._add_rollup_totals(
+                totals, covered_end + timedelta(microseconds=1), end_date, finer
+            )
+
+    def _add_category_totals(
+        self, totals: Dict[int, List], start_date: datetime, end_date: datetime
+    ) -> None:
+        period_totals = self.operation_repository.get_category_totals(
+            start_date, end_date
+        )
+        for category_id, (amount, count) in period_totals.items():
+            self._merge_totals(totals, category_id, amount, count)
+
+    @staticmethod
+    def _merge_totals(
+        totals: Dict[int, List], category_id: int, amount: Decimal, count: int
+    ) -> None:
+        entry = totals.get(category_id)
+        if entry is None:
+            totals[category_id] = [amount, count]
+        else:
+            entry[0] += amount
+            entry[1] += count
+
+    def rollup(
+        self,
+        resolution: str,
+        dimension: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[Dict]:
+        """
+        Возвращает сводку по интервалам resolution в разрезе dimension
+        (account или category): строки с названием, началом интервала,
+        доходом, расходом, чистым итогом и количеством операций
+        """
+        rollups = self.rollups
+        if rollups is None:
+            # Без поддерживаемых сводок строится только запрошенная сводка
+            # по операциям периода, расширенного до границ интервалов
+            rollups = RollupEngine(resolutions=(resolution,), dimensions=(dimension,))
+            first = rollups.bucket_key(resolution, start_date)
+            last = rollups.bucket_key(resolution, end_date)
+            rollups.rebuild(
+                self.operation_repository.get_by_period(
+                    rollups.bucket_start(resolution, first),
+                    rollups.bucket_end(resolution, last),
+                )
+            )
+
+        totals = rollups.query(resolution, dimension, start_date, end_date)
+        if dimension == "account":
+            repository, default_name = self.account_repository, UNKNOWN_ACCOUNT
+        else:
+            repository, default_name = self.category_repository, NO_CATEGORY
+        ids = [id for id in totals if id is not None]
+        entities = repository.get_by_ids(ids) if repository is not None else {}
+
+        rows = []
+        for id, buckets in totals.items():
+            entity = entities.get(id)
+            name = entity.name if entity else default_name
+            for period, income, expense, count in buckets:
+                rows.append(
+                    {
+                        "id": id,
+                        "name": name,
+                        "period": period,
+                        "income": income,
+                        "expense": expense,
+                        "net": income - expense,
+                        "count": count,
+                    }
+                )
+        rows.sort(key=lambda row: (row["name"], row["id"] or 0, row["period"]))
+        return rows
+
     def recalculate_account_balances(
         self,
     ) -> List[Tuple[BankAccount, Decimal, Decimal]]:
@@ -66,25 +469,12 @@ class AnalyticsService:
         if not self.account_repository:
             raise ValueError("Account repository is not set")
 
-        accounts = self.account_repository.get_all()
-        operations = self.operation_repository.get_all()
         discrepancies = []
 
-        account_operations = {}
-        for op in operations:
-            if op.bank_account_id not in account_operations:
-                account_operations[op.bank_account_id] = []
-            account_operations[op.bank_account_id].append(op)
-
-        for account in accounts:
-            calculated_balance = Decimal("0.0")
-
-            ops = account_operations.get(account.id, [])
-            for op in ops:
-                if op.type == TransactionType.INCOME:
-                    calculated_balance += op.amount
-                else:
-                    calculated_balance -= op.amount
+        for account in self.account_repository.iter_all():
+            calculated_balance = self.operation_repository.get_account_balance(
+                account.id
+            )
 
             if account.balance != calculated_balance:
                 discrepancies.append((account, account.balance, calculated_balance))
@@ -0,0 +1,84 @@
+"""
+Сравнение архивных снимков операций: JSON (indent=2) против Arrow IPC.
+Измеряются размер файла, время записи и время загрузки.
+
+Запуск: python benchmarks/bench_arrow_snapshot.py [записей]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from exporters import ArrowExporter, JSONExporter
+from importers import ArrowImporter, JSONImporter
+from models import TransactionType
+
+
+def generate_records(count: int):
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        yield {
+            "id": i + 1,
+            "type": TransactionType.INCOME if i % 3 == 0 else TransactionType.EXPENSE,
+            "bank_account_id": i % 10 + 1,
+            "amount": Decimal(i % 10000) / 100,
+            "category_id": i % 7 + 1,
+            "date": start + timedelta(seconds=i),
+            "description": "Покупка",
+        }
+
+
+def measure(name, exporter, load, count, mode):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        began = time.perf_counter()
+        if mode == "wb":
+            with open(path, "wb") as file:
+                exporter.export_to_stream(generate_records(count), file)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                exporter.export_to_stream(generate_records(count), file)
+        write_time = time.perf_counter() - began
+        size = os.path.getsize(path)
+
+        began = time.perf_counter()
+        loaded = load(path)
+        load_time = time.perf_counter() - began
+        assert len(loaded) == count
+    finally:
+        os.remove(path)
+
+    print(
+        f"{name:>6}: {size / 1024 / 1024:8.1f} МБ, запись {write_time:6.2f} с, "
+        f"загрузка {load_time:6.2f} с"
+    )
+    return size, load_time
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return JSONImporter().import_data(file.read())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Записей: {count}")
+    json_size, json_load = measure("JSON", JSONExporter(), load_json, count, "w")
+    arrow_size, arrow_load = measure(
+        "Arrow", ArrowExporter(), ArrowImporter().import_file, count, "wb"
+    )
+    print(
+        f"Arrow меньше в {json_size / arrow_size:.1f} раза, "
+        f"загружается быстрее в {json_load / arrow_load:.1f} раза"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Сравнение политик кэширования репозитория операций при смешанной нагрузке:
+список операций, просмотр по ID и меню аналитики вперемешку с записями.
+
+Запуск: python benchmarks/bench_cache_policies.py [операций] [шагов]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from container import FinanceModuleContainer
+from models import TransactionType
+
+WRITE_RATIO = 0.1
+
+
+def run(policy: str, operations: int, steps: int) -> float:
+    rng = random.Random(1)
+    container = FinanceModuleContainer(cache_policy=policy)
+    facade = container.operation_facade
+    analytics = container.analytics_service
+
+    account = container.bank_account_facade.create_account("Bench", Decimal("0"))
+    category = container.category_facade.create_category(
+        "Salary", TransactionType.INCOME
+    )
+    start = datetime(2024, 1, 1)
+    for i in range(operations):
+        facade.create_operation(
+            TransactionType.INCOME,
+            account.id,
+            Decimal("10.00"),
+            start + timedelta(minutes=i),
+            category.id,
+        )
+
+    period_end = start + timedelta(minutes=operations)
+    began = time.perf_counter()
+    for step in range(steps):
+        roll = rng.random()
+        if roll < WRITE_RATIO:
+            facade.create_operation(
+                TransactionType.INCOME,
+                account.id,
+                Decimal("1.00"),
+                start + timedelta(minutes=rng.randrange(operations)),
+                category.id,
+            )
+        elif roll < 0.4:
+            facade.get_all_operations()
+        elif roll < 0.8:
+            facade.get_operation(rng.randint(1, 100))
+        else:
+            analytics.calculate_balance_for_period(start, period_end)
+            analytics.group_by_category(start, period_end)
+    elapsed = time.perf_counter() - began
+
+    proxy = container.operation_repository_proxy
+    stats = proxy.stats() if proxy else {"hits": 0, "misses": 0}
+    print(
+        f"{policy:>14}: {elapsed:8.3f} с, попаданий {stats['hits']}, "
+        f"промахов {stats['misses']}"
+    )
+    return elapsed
+
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    print(f"Операций: {operations}, шагов нагрузки: {steps}")
+    baseline = run("none", operations, steps)
+    for policy in ("lru", "ttl", "write-through"):
+        elapsed = run(policy, operations, steps)
+        print(f"{'':>14}  ускорение: x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Круговой тест CSV: операции экспортируются так же, как из консоли
+(строки OperationQueryService через CSVExporter), и импортируются обратно
+в пустой контейнер конвейером импорта. Описания содержат запятые, кавычки
+и переводы строк.
+
+Запуск: python benchmarks/bench_csv_roundtrip.py [записей]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import itertools
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from container import FinanceModuleContainer
+from models import Operation, TransactionType
+
+ACCOUNTS = 10
+DESCRIPTIONS = ["Обед", "Кофе, круассан", 'Подарок "на память"', "Строка 1\nСтрока 2"]
+
+
+def generate_operations(count: int):
+    start = datetime(2024, 1, 1)
+    return [
+        Operation(
+            0,
+            TransactionType.INCOME if i % 3 == 0 else TransactionType.EXPENSE,
+            i % ACCOUNTS + 1,
+            Decimal(i % 10000 + 1) / 100,
+            start + timedelta(seconds=i),
+            None,
+            DESCRIPTIONS[i % len(DESCRIPTIONS)],
+        )
+        for i in range(count)
+    ]
+
+
+def snapshot(container):
+    return [
+        (op.type, op.bank_account_id, op.amount, op.date, op.description)
+        for op in container.operation_facade.get_all_operations()
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    source = FinanceModuleContainer(cache_policy="none")
+    for id in range(1, ACCOUNTS + 1):
+        source.bank_account_facade.create_account(f"Счет {id}", Decimal("100000000"))
+    source.operation_facade.create_operations_bulk(generate_operations(count))
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        began = time.perf_counter()
+        pages = source.operation_query_service.iter_pages()
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            written = source.csv_exporter.export_to_stream(
+                itertools.chain.from_iterable(pages), file
+            )
+        export_time = time.perf_counter() - began
+        size = os.path.getsize(path) / 1024 / 1024
+
+        target = FinanceModuleContainer(cache_policy="none")
+        began = time.perf_counter()
+        result = target.import_pipeline.run(target.csv_importer, path)
+        import_time = time.perf_counter() - began
+    finally:
+        os.remove(path)
+
+    assert written == count
+    assert result.imported == count and not result.rejected, result.rejected[:3]
+    assert snapshot(target) == snapshot(source)
+    print(f"Записей: {count}, файл {size:.1f} МБ")
+    print(f"Экспорт: {export_time:.2f} с ({count / export_time:,.0f} записей/с)")
+    print(f"Импорт:  {import_time:.2f} с ({count / import_time:,.0f} записей/с)")
+    print("Все операции восстановлены без искажений")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Подготовка импортируемых записей: прежняя цепочка попыток
+fromisoformat -> strptime против RecordPreparer с определением формата
+и кэшем строк. Даты в данных записаны в нескольких форматах.
+
+Запуск: python benchmarks/bench_import_parsing.py [записей]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from importers import RecordPreparer
+from models import TransactionType
+
+FORMATS = ["%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y", "%Y-%m-%dT%H:%M:%S"]
+
+
+def generate_rows(count: int):
+    rng = random.Random(1)
+    start = datetime(2023, 1, 1)
+    rows = []
+    for i in range(count):
+        date = start + timedelta(minutes=rng.randrange(60 * 24 * 365))
+        rows.append(
+            {
+                "id": str(i + 1),
+                "type": rng.choice(["INCOME", "EXPENSE", "expense"]),
+                "amount": f"{rng.randrange(1, 500)}.{rng.randrange(100):02d}",
+                "date": date.strftime(FORMATS[i % len(FORMATS)]),
+                "description": "Покупка",
+            }
+        )
+    return rows
+
+
+def legacy_prepare(item):
+    # Разбор до введения RecordPreparer, неразобранная дата заменялась текущей
+    prepared_item = {}
+    for key, value in item.items():
+        if key == "amount":
+            prepared_item[key] = Decimal(value)
+        elif key == "date":
+            try:
+                prepared_item[key] = datetime.fromisoformat(value)
+            except ValueError:
+                try:
+                    prepared_item[key] = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+                except ValueError:
+                    prepared_item[key] = datetime.now()
+        elif key == "type":
+            try:
+                prepared_item[key] = TransactionType(value)
+            except ValueError:
+                prepared_item[key] = TransactionType(value.upper())
+        else:
+            prepared_item[key] = value
+    return prepared_item
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = generate_rows(count)
+    print(f"Записей: {count}, форматов дат: {len(set(FORMATS))}")
+
+    began = time.perf_counter()
+    legacy = [legacy_prepare(row) for row in rows]
+    legacy_time = time.perf_counter() - began
+
+    preparer = RecordPreparer()
+    began = time.perf_counter()
+    prepared = [preparer.prepare(row) for row in rows]
+    prepared_time = time.perf_counter() - began
+
+    wrong = sum(1 for old, new in zip(legacy, prepared) if old["date"] != new["date"])
+    print(
+        f"Прежний разбор:  {legacy_time:6.2f} с, дат заменено текущим временем: {wrong}"
+    )
+    print(f"RecordPreparer:  {prepared_time:6.2f} с")
+    print(f"Ускорение: x{legacy_time / prepared_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
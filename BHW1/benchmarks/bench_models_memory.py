@@ -0,0 +1,69 @@
+"""
+Сравнение памяти, занимаемой операциями с __slots__ и с обычным __dict__.
+
+Запуск: python benchmarks/bench_models_memory.py [количество_операций]
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import Operation, TransactionType
+
+
+class DictOperation:
+    """Операция без __slots__ — прежнее представление модели"""
+
+    def __init__(
+        self, id, type, bank_account_id, amount, date, category_id=None, description=""
+    ):
+        self.id = id
+        self.type = type
+        self.bank_account_id = bank_account_id
+        self.amount = amount
+        self.date = date
+        self.category_id = category_id
+        self.description = description
+
+
+def measure(operation_class, count: int) -> int:
+    # Суммы и даты общие для всех объектов: измеряется только сам объект
+    amount = Decimal("100.00")
+    date = datetime(2024, 1, 1) + timedelta(hours=1)
+
+    # Доходы и расходы чередуются: представление не должно зависеть от типа
+    types = [TransactionType.INCOME, TransactionType.EXPENSE]
+
+    tracemalloc.start()
+    operations = [
+        operation_class(i, types[i % 2], 1, amount, date, 1, "") for i in range(count)
+    ]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del operations
+    return allocated
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    dict_bytes = measure(DictOperation, count)
+    slots_bytes = measure(Operation, count)
+
+    print(f"Операций: {count}")
+    print(
+        f"  __dict__:  {dict_bytes / 2**20:8.1f} МБ, {dict_bytes / count:6.1f} байт/объект"
+    )
+    print(
+        f"  __slots__: {slots_bytes / 2**20:8.1f} МБ, {slots_bytes / count:6.1f} байт/объект"
+    )
+    print(f"  Экономия:  {(dict_bytes - slots_bytes) / count:6.1f} байт/объект")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Суммы в целых минимальных единицах против Decimal: сложение в цикле,
+загрузка операций в репозиторий, сверка балансов счетов и балансы
+за случайные периоды.
+
+Запуск: python benchmarks/bench_money.py [операций]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analytics import AnalyticsService
+from money import from_minor, to_minor
+from models import BankAccount, Operation, TransactionType
+from repositories import (
+    InMemoryBankAccountRepository,
+    InMemoryCategoryRepository,
+    InMemoryOperationRepository,
+)
+
+ACCOUNTS = 1000
+PERIODS = 2000
+
+
+def generate_operations(count: int):
+    rng = random.Random(1)
+    start = datetime(2023, 1, 1)
+    operations = [
+        Operation(
+            0,
+            rng.choice([TransactionType.INCOME, TransactionType.EXPENSE]),
+            rng.randrange(1, ACCOUNTS + 1),
+            Decimal(f"{rng.randrange(1, 500)}.{rng.randrange(100):02d}"),
+            start + timedelta(minutes=rng.randrange(60 * 24 * 365)),
+        )
+        for _ in range(count)
+    ]
+    # Операции загружаются в хронологическом порядке, как при импорте выписки
+    operations.sort(key=lambda op: op.date)
+    return operations
+
+
+def measure(name: str, func):
+    began = time.perf_counter()
+    result = func()
+    print(f"{name:<40} {time.perf_counter() - began:8.3f} с")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    operations = generate_operations(count)
+    amounts = [op.amount for op in operations]
+    minors = [to_minor(amount) for amount in amounts]
+    print(f"Операций: {count}, счетов: {ACCOUNTS}, периодов: {PERIODS}")
+
+    decimal_total = measure("Сумма Decimal", lambda: sum(amounts, Decimal("0.00")))
+    minor_total = measure("Сумма в минимальных единицах", lambda: sum(minors))
+    assert from_minor(minor_total) == decimal_total
+
+    repository = InMemoryOperationRepository()
+    measure("Загрузка в репозиторий", lambda: repository.add_many(operations))
+
+    accounts = InMemoryBankAccountRepository()
+    for id in range(1, ACCOUNTS + 1):
+        accounts.add(BankAccount(id, f"Счет {id}", Decimal("0.00")))
+    service = AnalyticsService(repository, InMemoryCategoryRepository(), accounts)
+    measure("Сверка балансов счетов", service.recalculate_account_balances)
+
+    rng = random.Random(2)
+    periods = []
+    for _ in range(PERIODS):
+        start = datetime(2023, 1, 1) + timedelta(minutes=rng.randrange(525600))
+        periods.append((start, start + timedelta(minutes=rng.randrange(1, 525600))))
+    measure(
+        "Балансы за периоды",
+        lambda: [service.calculate_balance_for_period(*p) for p in periods],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Сводка "чистый итог по категориям помесячно за три года": чтение
+поддерживаемых фасадом интервалов RollupEngine против построения сводки
+по всем операциям периода.
+
+Запуск: python benchmarks/bench_rollups.py [операций]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analytics import AnalyticsService, RollupEngine
+from models import Category, Operation, TransactionType
+from repositories import (
+    InMemoryBankAccountRepository,
+    InMemoryCategoryRepository,
+    InMemoryOperationRepository,
+)
+
+ACCOUNTS = 100
+CATEGORIES = 20
+YEARS = 3
+QUERIES = 20
+
+
+def generate_operations(count: int):
+    rng = random.Random(1)
+    start = datetime(2022, 1, 1)
+    operations = [
+        Operation(
+            i + 1,
+            rng.choice([TransactionType.INCOME, TransactionType.EXPENSE]),
+            rng.randrange(1, ACCOUNTS + 1),
+            Decimal(f"{rng.randrange(1, 500)}.{rng.randrange(100):02d}"),
+            start + timedelta(minutes=rng.randrange(60 * 24 * 365 * YEARS)),
+            rng.randrange(1, CATEGORIES + 1),
+        )
+        for i in range(count)
+    ]
+    operations.sort(key=lambda op: op.date)
+    return operations
+
+
+def measure(name: str, func):
+    began = time.perf_counter()
+    result = func()
+    print(f"{name:<40} {time.perf_counter() - began:8.3f} с")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    operations = generate_operations(count)
+    print(f"Операций: {count}, категорий: {CATEGORIES}, лет: {YEARS}")
+
+    repository = InMemoryOperationRepository()
+    repository.add_many(operations)
+    categories = InMemoryCategoryRepository()
+    for id in range(1, CATEGORIES + 1):
+        categories.add(Category(id, f"Категория {id}", TransactionType.EXPENSE))
+    accounts = InMemoryBankAccountRepository()
+
+    rollups = RollupEngine()
+    measure("Построение сводок", lambda: rollups.rebuild(operations))
+
+    service = AnalyticsService(repository, categories, accounts, rollups=rollups)
+    scan_service = AnalyticsService(repository, categories, accounts)
+    start, end = datetime(2022, 1, 1), datetime(2024, 12, 31, 23, 59, 59)
+
+    expected = measure(
+        f"Сводка по операциям x{QUERIES}",
+        lambda: [
+            scan_service.rollup("month", "category", start, end) for _ in range(QUERIES)
+        ],
+    )
+    result = measure(
+        f"Сводка по интервалам x{QUERIES}",
+        lambda: [
+            service.rollup("month", "category", start, end) for _ in range(QUERIES)
+        ],
+    )
+    assert result == expected
+    print(f"Строк в сводке: {len(result[0])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Расчеты трех методов аналитики (баланс за период, суммы по категориям,
+сверка балансов счетов) по списку операций в минимальных единицах, как в
+индексах репозиториев: ветвление по типу операции против умножения на
+заранее вычисленный type_flag.
+
+Запуск: python benchmarks/bench_signed_amounts.py [операций]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import Operation, TransactionType
+from money import to_minor
+
+ACCOUNTS = 1000
+CATEGORIES = 50
+
+
+def generate_operations(count: int):
+    rng = random.Random(1)
+    start = datetime(2023, 1, 1)
+    return [
+        Operation(
+            i + 1,
+            rng.choice([TransactionType.INCOME, TransactionType.EXPENSE]),
+            rng.randrange(1, ACCOUNTS + 1),
+            Decimal(f"{rng.randrange(1, 500)}.{rng.randrange(100):02d}"),
+            start + timedelta(minutes=rng.randrange(60 * 24 * 365)),
+            rng.randrange(1, CATEGORIES + 1),
+        )
+        for i in range(count)
+    ]
+
+
+def branching_amount(op) -> int:
+    if op.type == TransactionType.INCOME:
+        return to_minor(op.amount)
+    return -to_minor(op.amount)
+
+
+def flag_amount(op) -> int:
+    return op.type_flag * to_minor(op.amount)
+
+
+def balance(operations, signed):
+    return sum([signed(op) for op in operations])
+
+
+def by_category(operations, signed):
+    totals = {}
+    for op in operations:
+        totals[op.category_id] = totals.get(op.category_id, 0) + signed(op)
+    return totals
+
+
+def account_balances(operations, signed):
+    balances = {}
+    for op in operations:
+        balances[op.bank_account_id] = balances.get(op.bank_account_id, 0) + signed(op)
+    return balances
+
+
+def measure(func, operations, signed):
+    began = time.perf_counter()
+    result = func(operations, signed)
+    return result, time.perf_counter() - began
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    operations = generate_operations(count)
+    print(f"Операций: {count}, счетов: {ACCOUNTS}, категорий: {CATEGORIES}")
+
+    for name, func in (
+        ("Баланс за период", balance),
+        ("Суммы по категориям", by_category),
+        ("Сверка балансов счетов", account_balances),
+    ):
+        expected, branching_time = measure(func, operations, branching_amount)
+        result, flag_time = measure(func, operations, flag_amount)
+        assert result == expected
+        print(
+            f"{name:<24} ветвление {branching_time:6.3f} с, "
+            f"type_flag {flag_time:6.3f} с, "
+            f"ускорение {branching_time / flag_time:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
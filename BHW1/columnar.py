@@ -0,0 +1,299 @@
+from array import array
+from decimal import Decimal
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from indexes import SortedIdIndex
+from money import DEFAULT_SCALE, from_minor, to_minor
+from models import Operation, TransactionType
+from repositories import Repository
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class ColumnarOperationRepository(Repository):
+    """
+    Хранилище операций по столбцам: ID, счета, категории, типы, суммы
+    в минимальных единицах валюты и время в микросекундах от эпохи лежат
+    в непрерывных массивах. Объекты Operation создаются только по запросу.
+    Даты должны быть без часового пояса
+    """
+
+    def __init__(self, scale: int = DEFAULT_SCALE):
+        self.scale = scale
+        self.next_id = 1
+        self._ids = array("q")
+        self._account_ids = array("q")
+        self._category_ids = array("q")  # 0 - операция без категории
+        self._type_flags = array("b")  # 1 - доход, -1 - расход
+        self._amounts = array("q")
+        self._timestamps = array("q")
+        self._descriptions: List[str] = []
+        self._rows: Dict[int, int] = {}
+        self._account_balances: Dict[int, int] = {}
+        # Строки переставляются при удалении, порядок ID хранится отдельно
+        self._id_index = SortedIdIndex()
+
+    def get_all(self) -> List[Operation]:
+        return [self._view(row) for row in range(len(self._ids))]
+
+    def iter_all(self) -> Iterator[Operation]:
+        return (self._view(row) for row in range(len(self._ids)))
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[Operation]:
+        self._check_limit(limit)
+        rows = self._rows
+        return [self._view(rows[id]) for id in self._id_index.after(after_id, limit)]
+
+    def get_by_id(self, id: int) -> Optional[Operation]:
+        row = self._rows.get(id)
+        if row is None:
+            return None
+        return self._view(row)
+
+    def get_stored(self, id: int) -> Optional[Operation]:
+        # Представления строятся по столбцам заново и уже являются копиями
+        return self.get_by_id(id)
+
+    def add(self, entity: Operation) -> Operation:
+        if entity.id is None or entity.id == 0:
+            entity.id = self.next_id
+            self.next_id += 1
+        if entity.id in self._rows:
+            self._remove_row(entity.id)
+        self._append_row(entity)
+        self._id_index.add(entity.id)
+        return entity
+
+    def add_many(self, entities: List[Operation]) -> List[Operation]:
+        """Добавляет пачку операций, выделяя ID новым операциям одним диапазоном"""
+        new_entities = [e for e in entities if e.id is None or e.id == 0]
+        first_id = self.next_id
+        self.next_id += len(new_entities)
+        for offset, entity in enumerate(new_entities):
+            entity.id = first_id + offset
+
+        for entity in entities:
+            if entity.id in self._rows:
+                self._remove_row(entity.id)
+            self._append_row(entity)
+            self._id_index.add(entity.id)
+        return entities
+
+    def update(self, entity: Operation) -> Operation:
+        if entity.id not in self._rows:
+            raise ValueError(f"Операция с ID {entity.id} не найдена")
+        # Строка обновляется целиком: новые значения проверяются до записи
+        values = self._encode(entity)
+        row = self._rows[entity.id]
+        self._apply_balance(row, -1)
+        (
+            self._account_ids[row],
+            self._category_ids[row],
+            self._type_flags[row],
+            self._amounts[row],
+            self._timestamps[row],
+            self._descriptions[row],
+        ) = values
+        self._apply_balance(row, 1)
+        return entity
+
+    def delete(self, id: int) -> None:
+        if id not in self._rows:
+            raise ValueError(f"Операция с ID {id} не найдена")
+        self._remove_row(id)
+        self._id_index.discard(id)
+
+    def get_by_period(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[Operation]:
+        """Возвращает операции за период [start_date, end_date], упорядоченные по дате"""
+        rows = self._period_rows(start_date, end_date)
+        rows.sort(key=lambda row: (self._timestamps[row], self._ids[row]))
+        return [self._view(row) for row in rows]
+
+    def get_by_account(self, bank_account_id: int) -> List[Operation]:
+        if np is not None:
+            mask = self._column(self._account_ids) == bank_account_id
+            rows = np.flatnonzero(mask).tolist()
+        else:
+            rows = [
+                row
+                for row, account_id in enumerate(self._account_ids)
+                if account_id == bank_account_id
+            ]
+        rows.sort(key=lambda row: self._ids[row])
+        return [self._view(row) for row in rows]
+
+    def get_account_balance(self, bank_account_id: int) -> Decimal:
+        """Возвращает баланс счета, рассчитанный по его операциям"""
+        return self._to_decimal(self._account_balances.get(bank_account_id, 0))
+
+    def get_period_balance(self, start_date: datetime, end_date: datetime) -> Decimal:
+        """Возвращает разницу доходов и расходов за период [start_date, end_date]"""
+        if start_date > end_date:
+            return self._to_decimal(0)
+
+        start, end = self._to_timestamp(start_date), self._to_timestamp(end_date)
+        if np is not None:
+            timestamps = self._column(self._timestamps)
+            mask = (timestamps >= start) & (timestamps <= end)
+            signed = (
+                self._column(self._amounts)[mask] * self._column(self._type_flags)[mask]
+            )
+            return self._to_decimal(int(signed.sum()))
+
+        total = 0
+        for timestamp, flag, amount in zip(
+            self._timestamps, self._type_flags, self._amounts
+        ):
+            if start <= timestamp <= end:
+                total += flag * amount
+        return self._to_decimal(total)
+
+    def get_category_totals(
+        self, start_date: datetime, end_date: datetime
+    ) -> Dict[int, List]:
+        """Возвращает [сумма со знаком, количество] по категориям за период"""
+        if start_date > end_date:
+            return {}
+
+        start, end = self._to_timestamp(start_date), self._to_timestamp(end_date)
+        if np is not None:
+            timestamps = self._column(self._timestamps)
+            categories = self._column(self._category_ids)
+            mask = (timestamps >= start) & (timestamps <= end) & (categories != 0)
+            signed = (
+                self._column(self._amounts)[mask] * self._column(self._type_flags)[mask]
+            )
+            keys, inverse, counts = np.unique(
+                categories[mask], return_inverse=True, return_counts=True
+            )
+            sums = np.zeros(len(keys), dtype=np.int64)
+            np.add.at(sums, inverse, signed)
+            return {
+                int(key): [self._to_decimal(int(amount)), int(count)]
+                for key, amount, count in zip(keys, sums, counts)
+            }
+
+        raw = {}
+        for timestamp, category_id, flag, amount in zip(
+            self._timestamps, self._category_ids, self._type_flags, self._amounts
+        ):
+            if category_id and start <= timestamp <= end:
+                entry = raw.get(category_id)
+                if entry is None:
+                    entry = raw[category_id] = [0, 0]
+                entry[0] += flag * amount
+                entry[1] += 1
+        return {
+            category_id: [self._to_decimal(amount), count]
+            for category_id, (amount, count) in raw.items()
+        }
+
+    def _period_rows(self, start_date: datetime, end_date: datetime) -> List[int]:
+        if start_date > end_date:
+            return []
+
+        start, end = self._to_timestamp(start_date), self._to_timestamp(end_date)
+        if np is not None:
+            timestamps = self._column(self._timestamps)
+            mask = (timestamps >= start) & (timestamps <= end)
+            return np.flatnonzero(mask).tolist()
+        return [
+            row
+            for row, timestamp in enumerate(self._timestamps)
+            if start <= timestamp <= end
+        ]
+
+    def _column(self, column: array):
+        return np.frombuffer(column, dtype=column.typecode)
+
+    def _append_row(self, entity: Operation) -> None:
+        account_id, category_id, flag, amount, timestamp, description = self._encode(
+            entity
+        )
+        self._rows[entity.id] = len(self._ids)
+        self._ids.append(entity.id)
+        self._account_ids.append(account_id)
+        self._category_ids.append(category_id)
+        self._type_flags.append(flag)
+        self._amounts.append(amount)
+        self._timestamps.append(timestamp)
+        self._descriptions.append(description)
+        self._apply_balance(len(self._ids) - 1, 1)
+
+    def _remove_row(self, id: int) -> None:
+        # Удаляемая строка заменяется последней, чтобы массивы оставались плотными
+        row = self._rows.pop(id)
+        self._apply_balance(row, -1)
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            for column in (
+                self._ids,
+                self._account_ids,
+                self._category_ids,
+                self._type_flags,
+                self._amounts,
+                self._timestamps,
+                self._descriptions,
+            ):
+                column[row] = column[last]
+            self._rows[moved_id] = row
+
+        for column in (
+            self._ids,
+            self._account_ids,
+            self._category_ids,
+            self._type_flags,
+            self._amounts,
+            self._timestamps,
+            self._descriptions,
+        ):
+            column.pop()
+
+    def _apply_balance(self, row: int, sign: int) -> None:
+        account_id = self._account_ids[row]
+        balance = self._account_balances.get(account_id, 0)
+        balance += sign * self._type_flags[row] * self._amounts[row]
+        self._account_balances[account_id] = balance
+
+    def _encode(self, entity: Operation) -> tuple:
+        return (
+            entity.bank_account_id,
+            entity.category_id or 0,
+            entity.type_flag,
+            self._to_minor(entity.amount),
+            self._to_timestamp(entity.date),
+            entity.description,
+        )
+
+    def _view(self, row: int) -> Operation:
+        flag = self._type_flags[row]
+        return Operation(
+            self._ids[row],
+            TransactionType.INCOME if flag > 0 else TransactionType.EXPENSE,
+            self._account_ids[row],
+            self._to_decimal(self._amounts[row]),
+            EPOCH + self._timestamps[row] * MICROSECOND,
+            self._category_ids[row] or None,
+            self._descriptions[row],
+        )
+
+    def _to_minor(self, amount: Decimal) -> int:
+        return to_minor(amount, self.scale)
+
+    def _to_decimal(self, minor: int) -> Decimal:
+        return from_minor(minor, self.scale)
+
+    def _to_timestamp(self, date: datetime) -> int:
+        return (date - EPOCH) // MICROSECOND
@@ -1,11 +1,12 @@
 import time
 from decimal import Decimal
-from typing import Any, List
+from typing import Any, Dict, Iterator, List
 from datetime import datetime
 from abc import ABC, abstractmethod
 
 from models import Operation, BankAccount, Category, TransactionType
 from facades import OperationFacade, BankAccountFacade, CategoryFacade
+from queries import OperationQueryService
 
 
 class Command(ABC):
@@ -22,6 +23,19 @@ class GetOperationsCommand(Command):
         return self.operation_facade.get_all_operations()
 
 
+class GetOperationPagesCommand(Command):
+    def __init__(
+        self,
+        query_service: OperationQueryService,
+        page_size: int = OperationQueryService.DEFAULT_PAGE_SIZE,
+    ):
+        self.query_service = query_service
+        self.page_size = page_size
+
+    def execute(self) -> Iterator[List[Dict]]:
+        return self.query_service.iter_pages(self.page_size)
+
+
 class CreateAccountCommand(Command):
     def __init__(
         self,
@@ -1,16 +1,20 @@
+import itertools
 import os
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from typing import Optional
 
 from models import TransactionType
 from container import FinanceModuleContainer
-from commands import GetOperationsCommand, PerformanceDecorator
-from performance import measure_execution_time
+from commands import GetOperationPagesCommand
+from performance import PerformanceDecorator, measure_execution_time
 
 
 class ConsoleApp:
-    def __init__(self):
-        self.container = FinanceModuleContainer()
+    REJECTED_ROWS_SHOWN = 10
+
+    def __init__(self, container: Optional[FinanceModuleContainer] = None):
+        self.container = container or FinanceModuleContainer()
         self.running = True
 
     def display_menu(self):
@@ -112,6 +116,7 @@ class ConsoleApp:
             print("\n===== АНАЛИТИКА =====")
             print("1. Баланс за период")
             print("2. Группировка по категориям")
+            print("3. Сводка по интервалам")
             print("0. Назад")
             print("=====================")
 
@@ -121,6 +126,8 @@ class ConsoleApp:
                 self.balance_for_period()
             elif choice == "2":
                 self.group_by_category()
+            elif choice == "3":
+                self.rollup_report()
             elif choice == "0":
                 break
             else:
@@ -132,6 +139,8 @@ class ConsoleApp:
             print("1. Экспорт операций в CSV")
             print("2. Экспорт операций в JSON")
             print("3. Экспорт операций в YAML")
+            print("4. Экспорт операций в Arrow")
+            print("5. Экспорт операций в JSON Lines")
             print("0. Назад")
             print("==========================")
 
@@ -143,6 +152,10 @@ class ConsoleApp:
                 self.export_operations("json")
             elif choice == "3":
                 self.export_operations("yaml")
+            elif choice == "4":
+                self.export_operations("arrow")
+            elif choice == "5":
+                self.export_operations("ndjson")
             elif choice == "0":
                 break
             else:
@@ -154,6 +167,8 @@ class ConsoleApp:
             print("1. Импорт операций из CSV")
             print("2. Импорт операций из JSON")
             print("3. Импорт операций из YAML")
+            print("4. Импорт операций из Arrow")
+            print("5. Импорт операций из JSON Lines")
             print("0. Назад")
             print("==========================")
 
@@ -165,6 +180,10 @@ class ConsoleApp:
                 self.import_operations("json")
             elif choice == "3":
                 self.import_operations("yaml")
+            elif choice == "4":
+                self.import_operations("arrow")
+            elif choice == "5":
+                self.import_operations("ndjson")
             elif choice == "0":
                 break
             else:
@@ -453,40 +472,28 @@ class ConsoleApp:
     @measure_execution_time("Отображение списка операций")
     def list_operations(self):
         try:
-            command = GetOperationsCommand(self.container.operation_facade)
+            command = GetOperationPagesCommand(self.container.operation_query_service)
             decorated_command = PerformanceDecorator(
                 command, "Получение списка операций", self.container.performance_tracker
             )
-            operations = decorated_command.execute()
+            pages = decorated_command.execute()
 
-            if not operations:
+            first_page = next(pages, None)
+            if not first_page:
                 print("Список операций пуст!")
                 return
 
             print("\nСписок операций:")
-            for op in operations:
-                category_name = "Без категории"
-                if op.category_id:
-                    category = self.container.category_repository.get_by_id(
-                        op.category_id
+            for page in itertools.chain((first_page,), pages):
+                for row in page:
+                    date = row["date"].isoformat(sep=" ", timespec="seconds")
+                    print(
+                        f"ID: {row['id']}, Тип: {row['type'].value}, "
+                        f"Счет: {row['account_name']}, Сумма: {row['amount']}, "
+                        f"Категория: {row['category_name']}, Дата: {date}"
                     )
-                    if category:
-                        category_name = category.name
-
-                account_name = "Неизвестный счет"
-                account = self.container.bank_account_repository.get_by_id(
-                    op.bank_account_id
-                )
-                if account:
-                    account_name = account.name
-
-                print(
-                    f"ID: {op.id}, Тип: {op.type.value}, Счет: {account_name}, "
-                    f"Сумма: {op.amount}, Категория: {category_name}, "
-                    f"Дата: {op.date.strftime('%Y-%m-%d %H:%M:%S')}"
-                )
-                if op.description:
-                    print(f"    Описание: {op.description}")
+                    if row["description"]:
+                        print(f"    Описание: {row['description']}")
         except Exception as e:
             print(f"Ошибка при получении списка операций: {e}")
 
@@ -594,57 +601,92 @@ class ConsoleApp:
         except ValueError:
             print("Ошибка: некорректный формат даты")
 
-    def export_operations(self, format_type: str):
-        operations = self.container.operation_facade.get_all_operations()
-        if not operations:
-            print("Нет данных для экспорта!")
+    def rollup_report(self):
+        resolutions = {"1": "day", "2": "week", "3": "month", "4": "year"}
+        dimensions = {"1": "account", "2": "category"}
+
+        print("\nВыберите интервал:")
+        print("1. День")
+        print("2. Неделя")
+        print("3. Месяц")
+        print("4. Год")
+        resolution = resolutions.get(input())
+        if resolution is None:
+            print("Ошибка: неверный выбор интервала")
             return
 
-        operations_data = []
-        for op in operations:
-            category_name = "Без категории"
-            if op.category_id:
-                category = self.container.category_repository.get_by_id(op.category_id)
-                if category:
-                    category_name = category.name
+        print("Выберите разрез:")
+        print("1. По счетам")
+        print("2. По категориям")
+        dimension = dimensions.get(input())
+        if dimension is None:
+            print("Ошибка: неверный выбор разреза")
+            return
 
-            account_name = "Неизвестный счет"
-            account = self.container.bank_account_repository.get_by_id(
-                op.bank_account_id
+        try:
+            print("Введите начальную дату (в формате YYYY-MM-DD):")
+            start_date = datetime.strptime(input(), "%Y-%m-%d")
+
+            print("Введите конечную дату (в формате YYYY-MM-DD):")
+            end_date = datetime.strptime(input(), "%Y-%m-%d").replace(
+                hour=23, minute=59, second=59
             )
-            if account:
-                account_name = account.name
+        except ValueError:
+            print("Ошибка: некорректный формат даты")
+            return
+
+        rows = self.container.analytics_service.rollup(
+            resolution, dimension, start_date, end_date
+        )
+        if not rows:
+            print("\nЗа указанный период нет операций")
+            return
 
-            operations_data.append(
-                {
-                    "id": op.id,
-                    "type": op.type,
-                    "account_name": account_name,
-                    "account_id": op.bank_account_id,
-                    "amount": op.amount,
-                    "category_name": category_name,
-                    "category_id": op.category_id,
-                    "date": op.date,
-                    "description": op.description,
-                }
+        print(
+            f"\n{'Название':<20} {'Начало':<10} {'Доход':>12} "
+            f"{'Расход':>12} {'Итог':>12} {'Операций':>8}"
+        )
+        for row in rows:
+            print(
+                f"{row['name']:<20} {row['period'].date().isoformat():<10} "
+                f"{row['income']:>12} {row['expense']:>12} "
+                f"{row['net']:>12} {row['count']:>8}"
             )
 
+    def export_operations(self, format_type: str):
+        pages = self.container.operation_query_service.iter_pages()
+        first_page = next(pages, None)
+        if not first_page:
+            print("Нет данных для экспорта!")
+            return
+
         try:
             if format_type == "csv":
-                data = self.container.csv_exporter.export_data(operations_data)
+                exporter = self.container.csv_exporter
                 filename = "operations.csv"
             elif format_type == "json":
-                data = self.container.json_exporter.export_data(operations_data)
+                exporter = self.container.json_exporter
                 filename = "operations.json"
             elif format_type == "yaml":
-                data = self.container.yaml_exporter.export_data(operations_data)
+                exporter = self.container.yaml_exporter
                 filename = "operations.yaml"
+            elif format_type == "arrow":
+                exporter = self.container.arrow_exporter
+                filename = "operations.arrow"
+            elif format_type == "ndjson":
+                exporter = self.container.ndjson_exporter
+                filename = "operations.ndjson"
             else:
                 print(f"Неподдерживаемый формат: {format_type}")
                 return
 
-            with open(filename, "w", encoding="utf-8") as file:
-                file.write(data)
+            records = itertools.chain(first_page, itertools.chain.from_iterable(pages))
+            if exporter.binary:
+                with open(filename, "wb") as file:
+                    exporter.export_to_stream(records, file)
+            else:
+                with open(filename, "w", encoding="utf-8", newline="") as file:
+                    exporter.export_to_stream(records, file)
 
             print(f"Данные успешно экспортированы в {filename}")
         except Exception as e:
@@ -660,16 +702,8 @@ class ConsoleApp:
                 print(f"Файл {filepath} не найден!")
                 return
 
-            with open(filepath, "r", encoding="utf-8") as file:
-                data_str = file.read()
-
-            if format_type == "csv":
-                data = self.container.csv_importer.import_data(data_str)
-            elif format_type == "json":
-                data = self.container.json_importer.import_data(data_str)
-            elif format_type == "yaml":
-                data = self.container.yaml_importer.import_data(data_str)
-            else:
+            importer = self._get_importer(format_type)
+            if importer is None:
                 print(f"Неподдерживаемый формат: {format_type}")
                 return
 
@@ -678,119 +712,30 @@ class ConsoleApp:
             for acc in existing_accounts:
                 print(f"  ID: {acc.id}, Название: {acc.name}, Баланс: {acc.balance}")
 
-            unique_accounts = {}
-            for item in data:
-                if "bank_account_id" in item:
-                    account_id = int(item.get("bank_account_id", 0))
-                    account_name = item.get("account_name", f"Счет {account_id}")
-
-                    unique_accounts[account_id] = account_name
-
-            print(f"\nУникальные счета в импортируемых данных: {len(unique_accounts)}")
-            for acc_id, acc_name in unique_accounts.items():
-                print(f"  ID: {acc_id}, Название: {acc_name}")
-
-            created_accounts = {}
-            for account_id, account_name in unique_accounts.items():
-                existing_account = self.container.bank_account_facade.get_account(
-                    account_id
-                )
-
-                if existing_account:
-                    print(
-                        f"Найден существующий счет: {existing_account.name} (ID: {account_id})"
-                    )
-                    created_accounts[account_id] = existing_account
-                else:
-                    print(f"Создаю новый счет: {account_name} (ID: {account_id})")
-
-                    new_account = self.container.entity_factory.create_bank_account(
-                        account_name
-                    )
-
-                    new_account.id = account_id
-
-                    account = self.container.bank_account_repository.add(new_account)
-                    created_accounts[account_id] = account
-
-            imported_count = 0
-            created_categories = {}
-
-            for item in data:
-                try:
-                    account_id = int(item.get("bank_account_id", 0))
-
-                    account = created_accounts.get(account_id)
-                    if not account:
-                        print(f"Ошибка: счет с ID {account_id} не найден!")
-                        continue
-
-                    category_id = None
-                    if "category_id" in item and item["category_id"]:
-                        category_id = int(item["category_id"])
-
-                        if category_id in created_categories:
-                            category = created_categories[category_id]
-                        else:
-                            category = self.container.category_facade.get_category(
-                                category_id
-                            )
-
-                            if not category:
-                                category_name = item.get(
-                                    "category_name", f"Категория {category_id}"
-                                )
-                                category_type = item.get("type", TransactionType.INCOME)
-
-                                print(
-                                    f"Создаю новую категорию: {category_name} (ID: {category_id}, тип: {category_type.value})"
-                                )
-
-                                new_category = (
-                                    self.container.entity_factory.create_category(
-                                        category_name, category_type
-                                    )
-                                )
-
-                                new_category.id = category_id
-
-                                category = self.container.category_repository.add(
-                                    new_category
-                                )
-                                created_categories[category_id] = category
-
-                    operation_type = item.get("type", TransactionType.INCOME)
-                    amount = Decimal(str(item.get("amount", "0")))
-                    date = item.get("date", datetime.now())
-                    description = item.get("description", "")
-                    if (
-                        operation_type == TransactionType.EXPENSE
-                        and amount > account.balance
-                    ):
-                        needed_deposit = amount - account.balance
-                        account.deposit(needed_deposit)
-                        print(
-                            f"Автоматическое пополнение счета {account.name} (ID: {account.id}) на {needed_deposit} для операции"
-                        )
-                        self.container.bank_account_repository.update(account)
-
-                    self.container.operation_facade.create_operation(
-                        operation_type,
-                        account.id,
-                        amount,
-                        date,
-                        category_id,
-                        description,
-                    )
-                    imported_count += 1
-
-                except Exception as e:
-                    print(f"Ошибка при импорте операции: {e}")
+            result = self.container.import_pipeline.run(
+                importer, filepath, on_message=print
+            )
 
             print(f"\nИтоги импорта:")
-            print(f"  Счетов: {len(created_accounts)}")
-            print(f"  Категорий: {len(created_categories)}")
-            print(f"  Операций: {imported_count} из {len(data)}")
+            print(f"  Счетов: {len(result.accounts)}")
+            print(f"  Категорий: {len(result.categories)}")
+            print(f"  Операций: {result.imported} из {result.total}")
+
+            rejected = result.rejected
+            if rejected:
+                print(f"\nОтклонено записей: {len(rejected)}")
+                for row_number, _, error in rejected[: self.REJECTED_ROWS_SHOWN]:
+                    print(f"  Запись {row_number}: {error}")
+                if len(rejected) > self.REJECTED_ROWS_SHOWN:
+                    print(f"  ... и еще {len(rejected) - self.REJECTED_ROWS_SHOWN}")
+
+            print(f"\nСтадии импорта ({result.elapsed:.3f} сек.):")
+            for name, stats in result.stages.items():
+                print(
+                    f"  {name}: {stats['records']} записей, "
+                    f"{stats['throughput']:.0f} записей/сек., "
+                    f"макс. очередь {stats['max_queue_depth']}"
+                )
 
             print("\nСчета после импорта:")
             updated_accounts = self.container.bank_account_facade.get_all_accounts()
@@ -800,6 +745,16 @@ class ConsoleApp:
         except Exception as e:
             print(f"Ошибка при импорте данных: {e}")
 
+    def _get_importer(self, format_type: str):
+        importers = {
+            "csv": self.container.csv_importer,
+            "json": self.container.json_importer,
+            "yaml": self.container.yaml_importer,
+            "arrow": self.container.arrow_importer,
+            "ndjson": self.container.ndjson_importer,
+        }
+        return importers.get(format_type)
+
     @measure_execution_time("Проверка балансов счетов")
     def check_account_balances(self):
         try:
@@ -859,6 +814,20 @@ class ConsoleApp:
             print(f"  Максимальное время: {stats['max_time']:.6f} сек.")
             print(f"  Количество выполнений: {stats['executions']}")
 
+        proxy = self.container.operation_repository_proxy
+        if proxy is not None:
+            cache_stats = proxy.stats()
+            print("\nКэш операций:")
+            print(f"  Попаданий: {cache_stats['hits']}")
+            print(f"  Промахов: {cache_stats['misses']}")
+            print(f"  Записей в кэше: {cache_stats['size']}")
+
+        report_stats = self.container.analytics_cache.stats()
+        print("\nКэш отчетов аналитики:")
+        print(f"  Попаданий: {report_stats['hits']}")
+        print(f"  Промахов: {report_stats['misses']}")
+        print(f"  Отчетов в кэше: {report_stats['size']}")
+
     def run(self):
         while self.running:
             self.display_menu()
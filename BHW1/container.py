@@ -1,25 +1,85 @@
+from typing import Optional
+
 from repositories import (
     InMemoryBankAccountRepository,
     InMemoryCategoryRepository,
     InMemoryOperationRepository,
 )
+from columnar import ColumnarOperationRepository
+from sqlite_repositories import (
+    SQLiteDatabase,
+    SQLiteBankAccountRepository,
+    SQLiteCategoryRepository,
+    SQLiteOperationRepository,
+)
 from validators import BankAccountValidator, CategoryValidator, OperationValidator
 from factories import EntityFactory
 from facades import BankAccountFacade, CategoryFacade, OperationFacade
-from analytics import AnalyticsService
-from exporters import CSVExporter, JSONExporter, YAMLExporter
-from importers import CSVImporter, JSONImporter, YAMLImporter
+from analytics import (
+    AnalyticsResultCache,
+    AnalyticsService,
+    RollupEngine,
+)
+from exporters import (
+    ArrowExporter,
+    CSVExporter,
+    JSONExporter,
+    NDJSONExporter,
+    YAMLExporter,
+)
+from importers import (
+    ArrowImporter,
+    CSVImporter,
+    JSONImporter,
+    NDJSONImporter,
+    YAMLImporter,
+)
+from import_pipeline import ImportPipeline
 from proxy import OperationRepositoryProxy
+from queries import OperationQueryService
 from performance import PerformanceTracker
 
 
 class FinanceModuleContainer:
-    def __init__(self):
-        self.bank_account_repository = InMemoryBankAccountRepository()
-        self.category_repository = InMemoryCategoryRepository()
-        self.operation_repository = InMemoryOperationRepository()
-        self.operation_repository_proxy = OperationRepositoryProxy(
-            self.operation_repository
+    STORAGES = ("memory", "columnar", "sqlite")
+    CACHE_POLICIES = ("none", "lru", "ttl", "write-through")
+
+    def __init__(
+        self,
+        import_workers: int = 1,
+        storage: str = "memory",
+        database_path: str = "finance.db",
+        cache_policy: str = "lru",
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+        analytics_cache_size: int = 256,
+    ):
+        if storage not in self.STORAGES:
+            raise ValueError(f"Неподдерживаемое хранилище: {storage}")
+        if cache_policy not in self.CACHE_POLICIES:
+            raise ValueError(f"Неподдерживаемая политика кэширования: {cache_policy}")
+        self.storage = storage
+        self.database = None
+
+        if storage == "sqlite":
+            self.database = SQLiteDatabase(database_path)
+            self.bank_account_repository = SQLiteBankAccountRepository(self.database)
+            self.category_repository = SQLiteCategoryRepository(self.database)
+            self.operation_repository = SQLiteOperationRepository(self.database)
+        else:
+            self.bank_account_repository = InMemoryBankAccountRepository()
+            self.category_repository = InMemoryCategoryRepository()
+            if storage == "columnar":
+                self.operation_repository = ColumnarOperationRepository()
+            else:
+                self.operation_repository = InMemoryOperationRepository()
+        self.cache_policy = cache_policy
+        self.operation_repository_proxy = self._create_operation_proxy(
+            cache_policy, cache_size, cache_ttl
+        )
+        # Фасады и аналитика читают операции через кэш, если он включен
+        cached_operation_repository = (
+            self.operation_repository_proxy or self.operation_repository
         )
 
         self.bank_account_validator = BankAccountValidator()
@@ -28,30 +88,99 @@ class FinanceModuleContainer:
 
         self.entity_factory = EntityFactory()
 
+        # Сводки живут в памяти: для SQLite их пришлось бы восстанавливать
+        # чтением всех операций при запуске, поэтому аналитика идет по индексам БД
+        self.rollups = RollupEngine() if self.database is None else None
+
         self.bank_account_facade = BankAccountFacade(
             self.bank_account_repository, self.bank_account_validator
         )
+        self.analytics_cache = AnalyticsResultCache(analytics_cache_size)
+
         self.category_facade = CategoryFacade(
-            self.category_repository, self.category_validator
+            self.category_repository, self.category_validator, self.analytics_cache
         )
         self.operation_facade = OperationFacade(
-            self.operation_repository,
+            cached_operation_repository,
             self.operation_validator,
             self.bank_account_repository,
+            self.analytics_cache,
+            self.rollups,
         )
 
         self.analytics_service = AnalyticsService(
-            self.operation_repository,
+            cached_operation_repository,
             self.category_repository,
             self.bank_account_repository,
+            self.analytics_cache,
+            self.rollups,
+        )
+
+        self.operation_query_service = OperationQueryService(
+            cached_operation_repository,
+            self.bank_account_repository,
+            self.category_repository,
         )
 
         self.csv_exporter = CSVExporter()
         self.json_exporter = JSONExporter()
         self.yaml_exporter = YAMLExporter()
+        self.arrow_exporter = ArrowExporter()
+        self.ndjson_exporter = NDJSONExporter()
 
-        self.csv_importer = CSVImporter()
-        self.json_importer = JSONImporter()
-        self.yaml_importer = YAMLImporter()
+        self.csv_importer = CSVImporter(workers=import_workers)
+        self.json_importer = JSONImporter(workers=import_workers)
+        self.yaml_importer = YAMLImporter(workers=import_workers)
+        self.arrow_importer = ArrowImporter(workers=import_workers)
+        self.ndjson_importer = NDJSONImporter(workers=import_workers)
+
+        self.import_pipeline = ImportPipeline(
+            self.bank_account_repository,
+            self.category_repository,
+            self.operation_facade,
+            self.entity_factory,
+            self.operation_validator,
+        )
 
         self.performance_tracker = PerformanceTracker()
+
+    def close(self) -> None:
+        """Останавливает пулы процессов импортеров и закрывает базу данных"""
+        for importer in (
+            self.csv_importer,
+            self.json_importer,
+            self.yaml_importer,
+            self.arrow_importer,
+            self.ndjson_importer,
+        ):
+            importer.close()
+        if self.database is not None:
+            self.database.close()
+
+    def _create_operation_proxy(
+        self, cache_policy: str, cache_size: int, cache_ttl: float
+    ) -> Optional[OperationRepositoryProxy]:
+        if cache_policy == "none":
+            return None
+        # Столбцовое хранилище создает объекты операций по запросу,
+        # общий снимок get_all держал бы их все в памяти
+        keep_snapshot = self.storage != "columnar"
+        if cache_policy == "ttl":
+            return OperationRepositoryProxy(
+                self.operation_repository,
+                max_entries=cache_size,
+                ttl=cache_ttl,
+                keep_snapshot=keep_snapshot,
+            )
+        if cache_policy == "write-through":
+            return OperationRepositoryProxy(
+                self.operation_repository,
+                max_entries=cache_size,
+                write_through=True,
+                keep_snapshot=keep_snapshot,
+            )
+        return OperationRepositoryProxy(
+            self.operation_repository,
+            max_entries=cache_size,
+            keep_snapshot=keep_snapshot,
+        )
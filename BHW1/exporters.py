@@ -1,63 +1,263 @@
+import io
+import csv
 import json
 import yaml
 from decimal import Decimal
-from typing import List, Dict
+from typing import BinaryIO, Dict, Iterable, Iterator, List, TextIO
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+try:
+    from yaml import CSafeDumper as YAMLDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as YAMLDumper
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
 from models import TransactionType
 
 
 class DataExporter(ABC):
+    # Двоичные форматы пишутся в файл, открытый в режиме "wb"
+    binary = False
+
     def export_data(self, data: List[Dict]) -> str:
-        prepared_data = self._prepare_data(data)
-        exported = self._export(prepared_data)
-        return exported
+        output = io.StringIO()
+        self.export_to_stream(data, output)
+        return output.getvalue()
+
+    def export_to_stream(self, data: Iterable[Dict], stream: TextIO) -> int:
+        """
+        Записывает записи в поток по мере их поступления и возвращает их
+        количество. Данные могут быть генератором: в памяти хранится одна запись
+        """
+        return self._export(self._prepare_data(data), stream)
 
-    def _prepare_data(self, data: List[Dict]) -> List[Dict]:
-        prepared = []
+    def _prepare_data(self, data: Iterable[Dict]) -> Iterator[Dict]:
         for item in data:
-            prepared_item = {}
-            for key, value in item.items():
-                if isinstance(value, Decimal):
-                    prepared_item[key] = str(value)
-                elif isinstance(value, datetime):
-                    prepared_item[key] = value.isoformat()
-                elif isinstance(value, TransactionType):
-                    prepared_item[key] = value.value
-                else:
-                    prepared_item[key] = value
-            prepared.append(prepared_item)
-        return prepared
+            yield self._prepare_item(item)
+
+    def _prepare_item(self, item: Dict) -> Dict:
+        prepared_item = {}
+        for key, value in item.items():
+            if isinstance(value, Decimal):
+                prepared_item[key] = str(value)
+            elif isinstance(value, datetime):
+                prepared_item[key] = value.isoformat()
+            elif isinstance(value, TransactionType):
+                prepared_item[key] = value.value
+            else:
+                prepared_item[key] = value
+        return prepared_item
 
     @abstractmethod
-    def _export(self, data: List[Dict]) -> str:
+    def _export(self, data: Iterator[Dict], stream: TextIO) -> int:
         pass
 
 
 class CSVExporter(DataExporter):
-    def _export(self, data: List[Dict]) -> str:
-        if not data:
-            return ""
-
-        output = []
-        headers = data[0].keys()
-        output.append(",".join(headers))
+    BATCH_SIZE = 1000
 
+    def _export(self, data: Iterator[Dict], stream: TextIO) -> int:
+        # csv.writer экранирует запятые, кавычки и переводы строк в значениях
+        writer = csv.writer(stream, lineterminator="\n")
+        count = 0
+        headers = None
+        batch = []
         for item in data:
-            row = []
-            for header in headers:
-                row.append(str(item.get(header, "")))
-            output.append(",".join(row))
+            # Заголовки берутся из первой записи
+            if headers is None:
+                headers = list(item.keys())
+                writer.writerow(headers)
 
-        return "\n".join(output)
+            batch.append([item.get(header, "") for header in headers])
+            if len(batch) >= self.BATCH_SIZE:
+                writer.writerows(batch)
+                count += len(batch)
+                batch = []
+
+        if batch:
+            writer.writerows(batch)
+            count += len(batch)
+        return count
 
 
 class JSONExporter(DataExporter):
-    def _export(self, data: List[Dict]) -> str:
-        return json.dumps(data, indent=2)
+    def _export(self, data: Iterator[Dict], stream: TextIO) -> int:
+        # Вывод совпадает с json.dumps(data, indent=2), но собирается по записям
+        count = 0
+        for item in data:
+            stream.write("[\n  " if count == 0 else ",\n  ")
+            stream.write(json.dumps(item, indent=2).replace("\n", "\n  "))
+            count += 1
+        stream.write("\n]" if count else "[]")
+        return count
 
 
 class YAMLExporter(DataExporter):
-    def _export(self, data: List[Dict]) -> str:
-        return yaml.dump(data)
+    """
+    Экспорт в YAML через libyaml, если PyYAML собран с ней. Записи выводятся
+    блоками по chunk_size: в одном документе-списке либо, в режиме
+    multi_document, каждый блок отдельным документом
+    """
+
+    def __init__(self, chunk_size: int = 1000, multi_document: bool = False):
+        if chunk_size < 1:
+            raise ValueError("Размер блока должен быть положительным")
+        self.chunk_size = chunk_size
+        self.multi_document = multi_document
+
+    def _export(self, data: Iterator[Dict], stream: TextIO) -> int:
+        counter = [0]
+        chunks = self._chunks(data, counter)
+        if self.multi_document:
+            yaml.dump_all(chunks, stream, Dumper=YAMLDumper, explicit_start=True)
+            return counter[0]
+
+        # Списки, выведенные подряд, образуют один общий список
+        for chunk in chunks:
+            yaml.dump(chunk, stream, Dumper=YAMLDumper)
+        if counter[0] == 0:
+            yaml.dump([], stream, Dumper=YAMLDumper)
+        return counter[0]
+
+    def _chunks(self, data: Iterator[Dict], counter: List[int]) -> Iterator[List]:
+        chunk = []
+        for item in data:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                counter[0] += len(chunk)
+                yield chunk
+                chunk = []
+        if chunk:
+            counter[0] += len(chunk)
+            yield chunk
+
+
+class NDJSONExporter(DataExporter):
+    """
+    Экспорт в JSON Lines: одна запись - одна строка UTF-8.
+    При наличии пакета orjson сериализация выполняется им
+    """
+
+    binary = True
+
+    def export_data(self, data: List[Dict]) -> bytes:
+        output = io.BytesIO()
+        self.export_to_stream(data, output)
+        return output.getvalue()
+
+    def _export(self, data: Iterator[Dict], stream: BinaryIO) -> int:
+        count = 0
+        for item in data:
+            if orjson is not None:
+                stream.write(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                line = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+                stream.write(line.encode("utf-8"))
+                stream.write(b"\n")
+            count += 1
+        return count
+
+
+class ArrowExporter(DataExporter):
+    """
+    Экспорт в файл Arrow IPC: суммы хранятся как decimal128 с фиксированной
+    точностью, даты - как временные метки. Файл пишется пакетами строк
+    и читается с диска через отображение в память. Требует пакет pyarrow
+    """
+
+    binary = True
+    BATCH_SIZE = 65536
+    AMOUNT_PRECISION = 18
+    AMOUNT_SCALE = 2
+    COMPRESSION = "zstd"
+
+    def export_data(self, data: List[Dict]) -> bytes:
+        output = io.BytesIO()
+        self.export_to_stream(data, output)
+        return output.getvalue()
+
+    def export_to_stream(self, data: Iterable[Dict], stream: BinaryIO) -> int:
+        if pa is None:
+            raise RuntimeError("Для формата Arrow требуется пакет pyarrow")
+
+        count = 0
+        writer = None
+        schema = None
+        batch = []
+        try:
+            for item in data:
+                batch.append(item)
+                if len(batch) >= self.BATCH_SIZE:
+                    if writer is None:
+                        schema = self._schema(batch)
+                        writer = pa.ipc.new_file(
+                            stream, schema, options=self._options()
+                        )
+                    writer.write_batch(self._record_batch(batch, schema))
+                    count += len(batch)
+                    batch = []
+
+            if writer is None:
+                schema = self._schema(batch)
+                writer = pa.ipc.new_file(stream, schema, options=self._options())
+            if batch:
+                writer.write_batch(self._record_batch(batch, schema))
+                count += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return count
+
+    def _export(self, data: Iterator[Dict], stream: BinaryIO) -> int:
+        return self.export_to_stream(data, stream)
+
+    def _options(self) -> "pa.ipc.IpcWriteOptions":
+        # Буферы пакетов сжимаются zstd, чтение распаковывает их по пакетам
+        return pa.ipc.IpcWriteOptions(compression=self.COMPRESSION)
+
+    def _schema(self, batch: List[Dict]) -> "pa.Schema":
+        # Тип столбца определяется по первому непустому значению первого пакета
+        fields = []
+        for key in batch[0].keys() if batch else []:
+            value = next(
+                (item[key] for item in batch if item.get(key) is not None), None
+            )
+            fields.append(pa.field(key, self._arrow_type(key, value)))
+        return pa.schema(fields)
+
+    def _arrow_type(self, key: str, value) -> "pa.DataType":
+        if isinstance(value, Decimal):
+            return pa.decimal128(self.AMOUNT_PRECISION, self.AMOUNT_SCALE)
+        if isinstance(value, datetime):
+            return pa.timestamp("us")
+        if isinstance(value, bool):
+            return pa.bool_()
+        if isinstance(value, int) or (value is None and key.endswith("id")):
+            return pa.int64()
+        return pa.string()
+
+    def _record_batch(self, batch: List[Dict], schema: "pa.Schema") -> "pa.RecordBatch":
+        columns = []
+        for field in schema:
+            values = [item.get(field.name) for item in batch]
+            if pa.types.is_string(field.type):
+                values = [self._to_text(value) for value in values]
+            columns.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+    def _to_text(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, TransactionType):
+            return value.value
+        return str(value)
@@ -1,7 +1,8 @@
 from decimal import Decimal
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
+from analytics import AnalyticsResultCache, RollupEngine
 from models import BankAccount, Category, Operation, TransactionType
 from repositories import (
     InMemoryBankAccountRepository,
@@ -41,10 +42,14 @@ class BankAccountFacade:
 
 class CategoryFacade:
     def __init__(
-        self, repository: InMemoryCategoryRepository, validator: CategoryValidator
+        self,
+        repository: InMemoryCategoryRepository,
+        validator: CategoryValidator,
+        analytics_cache: Optional[AnalyticsResultCache] = None,
     ):
         self.repository = repository
         self.validator = validator
+        self.analytics_cache = analytics_cache
 
     def create_category(self, name: str, type: TransactionType) -> Category:
         category = Category(0, name, type)
@@ -59,10 +64,16 @@ class CategoryFacade:
 
     def update_category(self, category: Category) -> Category:
         self.validator.validate(category)
-        return self.repository.update(category)
+        category = self.repository.update(category)
+        # Отчеты по категориям содержат названия, поэтому сбрасываются целиком
+        if self.analytics_cache is not None:
+            self.analytics_cache.clear()
+        return category
 
     def delete_category(self, id: int) -> None:
         self.repository.delete(id)
+        if self.analytics_cache is not None:
+            self.analytics_cache.clear()
 
 
 class OperationFacade:
@@ -71,10 +82,14 @@ class OperationFacade:
         repository: InMemoryOperationRepository,
         validator: OperationValidator,
         account_repository: InMemoryBankAccountRepository,
+        analytics_cache: Optional[AnalyticsResultCache] = None,
+        rollups: Optional[RollupEngine] = None,
     ):
         self.repository = repository
         self.validator = validator
         self.account_repository = account_repository
+        self.analytics_cache = analytics_cache
+        self.rollups = rollups
 
     def create_operation(
         self,
@@ -100,7 +115,75 @@ class OperationFacade:
             account.withdraw(amount)
 
         self.account_repository.update(account)
-        return self.repository.add(operation)
+        operation = self.repository.add(operation)
+        if self.rollups is not None:
+            self.rollups.add(operation)
+        if self.analytics_cache is not None:
+            self.analytics_cache.invalidate(operation.date)
+        return operation
+
+    def create_operations_bulk(
+        self,
+        operations: List[Operation],
+        on_top_up: Optional[Callable[[BankAccount, Decimal], Any]] = None,
+    ) -> List[Operation]:
+        """
+        Создает пачку операций целиком: либо все операции проходят проверку
+        и сохраняются, либо ни одна. Баланс каждого счета обновляется один раз.
+        Если передан on_top_up, нехватка средств для расхода покрывается
+        пополнением счета, о котором после сохранения сообщается вызовом
+        on_top_up(счет, сумма); иначе пачка отклоняется
+        """
+        for operation in operations:
+            self.validator.validate(operation)
+
+        accounts = {}
+        balances = {}
+        top_ups = []
+        for operation in operations:
+            account_id = operation.bank_account_id
+            if account_id not in accounts:
+                account = self.account_repository.get_by_id(account_id)
+                if not account:
+                    raise ValueError(f"Счет с ID {account_id} не найден")
+                accounts[account_id] = account
+                balances[account_id] = account.balance
+
+            if operation.type_flag > 0:
+                balances[account_id] += operation.amount
+                continue
+
+            balance = balances[account_id] - operation.amount
+            if balance < 0:
+                if on_top_up is None:
+                    raise ValueError(f"Недостаточно средств на счете с ID {account_id}")
+                top_ups.append((accounts[account_id], -balance))
+                balance = Decimal("0.0")
+            balances[account_id] = balance
+
+        initial_balances = {id: account.balance for id, account in accounts.items()}
+        try:
+            # В SQLite балансы и операции фиксируются одной транзакцией
+            with self.repository.transaction():
+                for account_id, account in accounts.items():
+                    account.balance = balances[account_id]
+                    self.account_repository.update(account)
+
+                operations = self.repository.add_many(operations)
+        except Exception:
+            # Пополнения и списания не должны пережить несохраненную пачку
+            for account_id, account in accounts.items():
+                account.balance = initial_balances[account_id]
+            raise
+        if self.rollups is not None:
+            for operation in operations:
+                self.rollups.add(operation)
+        if self.analytics_cache is not None and operations:
+            dates = [operation.date for operation in operations]
+            self.analytics_cache.invalidate(min(dates), max(dates))
+        for account, amount in top_ups:
+            on_top_up(account, amount)
+        return operations
 
     def get_all_operations(self) -> List[Operation]:
         return self.repository.get_all()
@@ -110,7 +193,34 @@ class OperationFacade:
 
     def update_operation(self, operation: Operation) -> Operation:
         self.validator.validate(operation)
-        return self.repository.update(operation)
+        # Сводкам и кэшу отчетов нужна прежняя версия операции; хранилище
+        # отдает ее копией, даже если объект был изменен на месте
+        previous = self._get_previous(operation.id)
+
+        operation = self.repository.update(operation)
+        if self.rollups is not None:
+            self.rollups.update(previous, operation)
+
+        if self.analytics_cache is not None:
+            if previous is None:
+                self.analytics_cache.clear()
+            else:
+                self.analytics_cache.invalidate(previous.date)
+                self.analytics_cache.invalidate(operation.date)
+        return operation
 
     def delete_operation(self, id: int) -> None:
+        previous = self._get_previous(id)
+
         self.repository.delete(id)
+        if previous is None:
+            return
+        if self.rollups is not None:
+            self.rollups.remove(previous)
+        if self.analytics_cache is not None:
+            self.analytics_cache.invalidate(previous.date)
+
+    def _get_previous(self, id: int) -> Optional[Operation]:
+        if self.rollups is None and self.analytics_cache is None:
+            return None
+        return self.repository.get_stored(id)
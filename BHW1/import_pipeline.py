@@ -0,0 +1,402 @@
+import queue
+import threading
+import time
+from decimal import Decimal
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from models import BankAccount, Category, Operation, TransactionType
+from factories import EntityFactory
+from facades import OperationFacade
+from importers import DataImporter
+from repositories import InMemoryBankAccountRepository, InMemoryCategoryRepository
+from validators import OperationValidator
+
+# Маркер конца данных, передаваемый следующей стадии
+_DONE = object()
+
+# Поля с ID счета в порядке предпочтения
+ACCOUNT_ID_FIELDS = ("bank_account_id", "account_id")
+
+
+class PipelineCancelled(Exception):
+    """Стадия остановлена из-за ошибки в другой стадии конвейера"""
+
+
+class StageStats:
+    """Счетчики одной стадии конвейера"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.records = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+
+    def report(self) -> Dict[str, float]:
+        throughput = self.records / self.busy_time if self.busy_time else 0.0
+        return {
+            "batches": self.batches,
+            "records": self.records,
+            "busy_time": self.busy_time,
+            "throughput": throughput,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class ImportResult:
+    """Итоги импорта: созданные сущности, отклоненные записи и статистика стадий"""
+
+    def __init__(self):
+        self.accounts: Dict[int, BankAccount] = {}
+        self.categories: Dict[int, Category] = {}
+        self.imported = 0
+        self.total = 0
+        self.rejected: List[tuple] = []
+        self.elapsed = 0.0
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+
+class ImportPipeline:
+    """
+    Конвейер импорта операций из четырех стадий в отдельных потоках:
+    чтение и разбор файла, подготовка типов полей, поиск и создание счетов
+    и категорий, пакетная вставка. Стадии связаны очередями ограниченного
+    размера: быстрая стадия ждет, пока медленная освободит место в очереди
+    """
+
+    STAGES = ("read", "prepare", "resolve", "insert")
+    POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        bank_account_repository: InMemoryBankAccountRepository,
+        category_repository: InMemoryCategoryRepository,
+        operation_facade: OperationFacade,
+        entity_factory: EntityFactory,
+        operation_validator: OperationValidator,
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+        queue_size: int = 4,
+    ):
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть положительным")
+        if queue_size < 1:
+            raise ValueError("Размер очереди должен быть положительным")
+        self.bank_account_repository = bank_account_repository
+        self.category_repository = category_repository
+        self.operation_facade = operation_facade
+        self.entity_factory = entity_factory
+        self.operation_validator = operation_validator
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def run(
+        self,
+        importer: DataImporter,
+        source,
+        on_message: Optional[Callable[[str], Any]] = None,
+    ) -> ImportResult:
+        """Импортирует файл и возвращает итоги; ошибка любой стадии пробрасывается"""
+        run = _PipelineRun(self, importer, source, on_message)
+        # Пул процессов живет только на время запуска и создается до потоков
+        with importer:
+            return run.execute()
+
+
+class _PipelineRun:
+    """Состояние одного запуска конвейера"""
+
+    def __init__(
+        self,
+        pipeline: ImportPipeline,
+        importer: DataImporter,
+        source,
+        on_message: Optional[Callable[[str], Any]],
+    ):
+        self.pipeline = pipeline
+        self.importer = importer
+        self.source = source
+        self.on_message = on_message
+        self.result = ImportResult()
+        self.stats = {name: StageStats(name) for name in ImportPipeline.STAGES}
+        self.queues = [
+            queue.Queue(maxsize=pipeline.queue_size) for _ in ImportPipeline.STAGES[1:]
+        ]
+        # Хранилище не обязано быть потокобезопасным: запись идет под блокировкой
+        self.storage_lock = threading.Lock()
+        self.rows_read = 0
+        self.failed = threading.Event()
+        self.errors: List[BaseException] = []
+
+    def execute(self) -> ImportResult:
+        started = time.perf_counter()
+        read_queue, prepare_queue, resolve_queue = self.queues
+        threads = [
+            threading.Thread(
+                target=self._stage,
+                args=("read", None, read_queue, self._read),
+                name="import-read",
+            ),
+            threading.Thread(
+                target=self._stage,
+                args=("prepare", read_queue, prepare_queue, self._prepare),
+                name="import-prepare",
+            ),
+            threading.Thread(
+                target=self._stage,
+                args=("resolve", prepare_queue, resolve_queue, self._resolve),
+                name="import-resolve",
+            ),
+            threading.Thread(
+                target=self._stage,
+                args=("insert", resolve_queue, None, self._insert),
+                name="import-insert",
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self.errors:
+            raise self.errors[0]
+
+        rejected = list(self.importer.rejected)
+        self.result.total += len(rejected)
+        self.result.rejected = sorted(
+            rejected + self.result.rejected, key=lambda entry: entry[0]
+        )
+        # Балансы счетов изменились при вставке, в итогах нужны актуальные объекты
+        self.result.accounts = self.pipeline.bank_account_repository.get_by_ids(
+            self.result.accounts
+        )
+        self.result.elapsed = time.perf_counter() - started
+        self.result.stages = {
+            name: stats.report() for name, stats in self.stats.items()
+        }
+        return self.result
+
+    def _stage(self, name, input_queue, output_queue, handler) -> None:
+        stats = self.stats[name]
+        try:
+            for batch in self._batches(input_queue, stats):
+                began = time.perf_counter()
+                output = handler(batch)
+                stats.busy_time += time.perf_counter() - began
+                stats.batches += 1
+                stats.records += len(batch)
+                if output_queue is not None:
+                    self._put(output_queue, output)
+        except PipelineCancelled:
+            pass
+        except BaseException as e:
+            self.errors.append(e)
+            self.failed.set()
+        finally:
+            if output_queue is not None:
+                try:
+                    self._put(output_queue, _DONE)
+                except PipelineCancelled:
+                    pass
+
+    def _batches(self, input_queue, stats: StageStats) -> Iterator[List]:
+        if input_queue is None:
+            # Первая стадия сама читает источник, время чтения входит в работу
+            reader = self.importer.read_raw_batches(
+                self.source, self.pipeline.batch_size
+            )
+            try:
+                while True:
+                    began = time.perf_counter()
+                    batch = next(reader, _DONE)
+                    stats.busy_time += time.perf_counter() - began
+                    if batch is _DONE:
+                        return
+                    yield batch
+            finally:
+                reader.close()
+
+        while True:
+            stats.max_queue_depth = max(stats.max_queue_depth, input_queue.qsize())
+            batch = self._get(input_queue)
+            if batch is _DONE:
+                return
+            yield batch
+
+    def _put(self, output_queue: queue.Queue, item) -> None:
+        while True:
+            if self.failed.is_set() and item is not _DONE:
+                raise PipelineCancelled()
+            try:
+                output_queue.put(item, timeout=self.pipeline.POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self.failed.is_set():
+                    raise PipelineCancelled()
+
+    def _get(self, input_queue: queue.Queue):
+        while True:
+            try:
+                return input_queue.get(timeout=self.pipeline.POLL_INTERVAL)
+            except queue.Empty:
+                if self.failed.is_set():
+                    raise PipelineCancelled()
+
+    def _read(self, batch: List[Dict]) -> List[Dict]:
+        return batch
+
+    def _prepare(self, batch: List[Dict]) -> List[Tuple[int, Dict]]:
+        # Номера записей нужны, чтобы отклонить записи пачки, не прошедшей вставку
+        first_row = self.rows_read + 1
+        self.rows_read += len(batch)
+        rejected_before = len(self.importer.rejected)
+        prepared = self.importer.prepare_batch(batch)
+        dropped = {row for row, _, _ in self.importer.rejected[rejected_before:]}
+        rows = [
+            row for row in range(first_row, self.rows_read + 1) if row not in dropped
+        ]
+        return list(zip(rows, prepared))
+
+    def _resolve(
+        self, batch: List[Tuple[int, Dict]]
+    ) -> List[Tuple[int, Dict, Operation]]:
+        self.result.total += len(batch)
+        self._resolve_accounts([item for _, item in batch])
+
+        entries = []
+        for row, item in batch:
+            try:
+                operation = self._build_operation(item)
+            except Exception as e:
+                self._message(f"Ошибка при импорте операции: {e}")
+                self.result.rejected.append((row, item, str(e)))
+                continue
+            entries.append((row, item, operation))
+        return entries
+
+    def _insert(
+        self, entries: List[Tuple[int, Dict, Operation]]
+    ) -> List[Tuple[int, Dict, Operation]]:
+        if not entries:
+            return entries
+
+        operations = [operation for _, _, operation in entries]
+        with self.storage_lock:
+            # Фасад читает счета из хранилища заново и сам пополняет их при
+            # нехватке средств, поэтому пачка сохраняется целиком или никак
+            try:
+                self.pipeline.operation_facade.create_operations_bulk(
+                    operations, on_top_up=self._report_top_up
+                )
+            except Exception as e:
+                self._message(f"Ошибка при импорте пачки операций: {e}")
+                for row, item, _ in entries:
+                    self.result.rejected.append((row, item, str(e)))
+                return entries
+
+        self.result.imported += len(operations)
+        return entries
+
+    def _report_top_up(self, account: BankAccount, amount: Decimal) -> None:
+        self._message(
+            f"Автоматическое пополнение счета {account.name} "
+            f"(ID: {account.id}) на {amount} для операции"
+        )
+
+    def _resolve_accounts(self, batch: List[Dict]) -> None:
+        accounts = self.result.accounts
+        unique_accounts = {}
+        for item in batch:
+            try:
+                account_id = self._account_id(item)
+            except ValueError:
+                # Запись с некорректным ID отклоняется при сборке операции
+                continue
+            if account_id is not None:
+                if account_id in accounts:
+                    continue
+                unique_accounts[account_id] = item.get(
+                    "account_name", f"Счет {account_id}"
+                )
+
+        if unique_accounts:
+            self._message(
+                f"\nНовые счета в импортируемых данных: {len(unique_accounts)}"
+            )
+            for account_id, account_name in unique_accounts.items():
+                self._message(f"  ID: {account_id}, Название: {account_name}")
+
+        for account_id, account_name in unique_accounts.items():
+            with self.storage_lock:
+                account = self.pipeline.bank_account_repository.get_by_id(account_id)
+                if account:
+                    self._message(
+                        f"Найден существующий счет: {account.name} (ID: {account_id})"
+                    )
+                else:
+                    self._message(
+                        f"Создаю новый счет: {account_name} (ID: {account_id})"
+                    )
+                    account = self.pipeline.entity_factory.create_bank_account(
+                        account_name
+                    )
+                    account.id = account_id
+                    account = self.pipeline.bank_account_repository.add(account)
+            accounts[account_id] = account
+
+    @staticmethod
+    def _account_id(item: Dict) -> Optional[int]:
+        # Экспорт модуля пишет поле account_id, внешние файлы - bank_account_id.
+        # Пустой или нулевой ID означает, что счет не указан
+        for key in ACCOUNT_ID_FIELDS:
+            if key in item:
+                return int(item[key] or 0) or None
+        return None
+
+    def _build_operation(self, item: Dict) -> Operation:
+        account_id = self._account_id(item)
+        if not account_id:
+            raise ValueError("Не указан ID счета")
+        account = self.result.accounts.get(account_id)
+        if not account:
+            raise ValueError(f"Счет с ID {account_id} не найден")
+
+        operation_type = item.get("type", TransactionType.INCOME)
+        category_id = None
+        if "category_id" in item and item["category_id"]:
+            category_id = int(item["category_id"])
+            if category_id not in self.result.categories:
+                self._resolve_category(category_id, item, operation_type)
+
+        operation = self.pipeline.entity_factory.create_operation(
+            operation_type,
+            account.id,
+            Decimal(str(item.get("amount", "0"))),
+            item.get("date", datetime.now()),
+            category_id,
+            item.get("description", ""),
+        )
+        self.pipeline.operation_validator.validate(operation)
+        return operation
+
+    def _resolve_category(
+        self, category_id: int, item: Dict, category_type: TransactionType
+    ) -> None:
+        with self.storage_lock:
+            category = self.pipeline.category_repository.get_by_id(category_id)
+            if not category:
+                category_name = item.get("category_name", f"Категория {category_id}")
+                self._message(
+                    f"Создаю новую категорию: {category_name} "
+                    f"(ID: {category_id}, тип: {category_type.value})"
+                )
+                category = self.pipeline.entity_factory.create_category(
+                    category_name, category_type
+                )
+                category.id = category_id
+                category = self.pipeline.category_repository.add(category)
+        self.result.categories[category_id] = category
+
+    def _message(self, text: str) -> None:
+        if self.on_message is not None:
+            self.on_message(text)
@@ -1,71 +1,364 @@
 import io
+import os
 import csv
 import json
 import yaml
-from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Iterator, Optional, TextIO, Tuple, Union
 from abc import ABC, abstractmethod
 
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as YAMLLoader
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
 from models import TransactionType
 
+# Все цифры заменяются нулями: строки одного формата дают одинаковую форму
+_DIGITS_TO_ZERO = str.maketrans("123456789", "000000000")
+_FIELD_WIDTHS = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2}
+
+
+class RecordPreparer:
+    """
+    Приводит строковые поля записи к типам модели. Формат даты определяется
+    один раз для каждой формы строки (расположения цифр и разделителей)
+    и затем применяется без перебора; повторяющиеся строки дат и сумм
+    разбираются один раз
+    """
+
+    DATE_FORMATS = (
+        "%Y-%m-%d %H:%M:%S",
+        "%d.%m.%Y %H:%M:%S",
+        "%d.%m.%Y %H:%M",
+        "%d.%m.%Y",
+        "%d/%m/%Y %H:%M:%S",
+        "%d/%m/%Y",
+    )
+    CACHE_SIZE = 100_000
+
+    def __init__(self):
+        self._fixed_parsers = {}
+        for date_format in self.DATE_FORMATS:
+            shape, parser = self._fixed_width_parser(date_format)
+            self._fixed_parsers.setdefault(shape, parser)
+        self._fallback_parsers = [datetime.fromisoformat] + [
+            self._strptime_parser(date_format) for date_format in self.DATE_FORMATS
+        ]
+        self._parsers_by_shape: Dict[str, Any] = {}
+        self._dates: Dict[str, datetime] = {}
+        self._amounts: Dict[str, Decimal] = {}
+        self._types = {item.value: item for item in TransactionType}
+        self._types.update({item.value.lower(): item for item in TransactionType})
+
+    def prepare(self, item: Dict) -> Dict:
+        """Возвращает подготовленную запись или выбрасывает ValueError"""
+        prepared_item = {}
+        for key, value in item.items():
+            if key == "amount" and isinstance(value, str):
+                prepared_item[key] = self.parse_amount(value)
+            elif key == "date" and isinstance(value, str):
+                prepared_item[key] = self.parse_date(value)
+            elif key == "type" and isinstance(value, str):
+                prepared_item[key] = self.parse_type(value)
+            else:
+                prepared_item[key] = value
+        return prepared_item
+
+    def parse_date(self, value: str) -> datetime:
+        date = self._dates.get(value)
+        if date is not None:
+            return date
+
+        shape = value.translate(_DIGITS_TO_ZERO)
+        parser = self._parsers_by_shape.get(shape)
+        if parser is not None:
+            try:
+                date = parser(value)
+            except ValueError:
+                date = None
+        if date is None:
+            date = self._detect_date(value, shape)
+
+        self._remember(self._dates, value, date)
+        return date
+
+    def parse_amount(self, value: str) -> Decimal:
+        amount = self._amounts.get(value)
+        if amount is None:
+            try:
+                amount = Decimal(value)
+            except InvalidOperation:
+                raise ValueError(f"Некорректная сумма: {value}") from None
+            self._remember(self._amounts, value, amount)
+        return amount
+
+    def parse_type(self, value: str) -> TransactionType:
+        transaction_type = self._types.get(value)
+        if transaction_type is None:
+            transaction_type = self._types.get(value.lower())
+            if transaction_type is None:
+                raise ValueError(f"Некорректный тип операции: {value}")
+        return transaction_type
+
+    def _detect_date(self, value: str, shape: str) -> datetime:
+        # ISO проверяется первым: fromisoformat быстрее разбора по позициям
+        candidates = list(self._fallback_parsers)
+        fixed = self._fixed_parsers.get(shape)
+        if fixed is not None:
+            candidates.insert(1, fixed)
+
+        for parser in candidates:
+            try:
+                date = parser(value)
+            except ValueError:
+                continue
+            self._parsers_by_shape[shape] = parser
+            return date
+        raise ValueError(f"Некорректная дата: {value}")
+
+    def _remember(self, cache: Dict, key: str, value) -> None:
+        if len(cache) >= self.CACHE_SIZE:
+            cache.clear()
+        cache[key] = value
+
+    @staticmethod
+    def _fixed_width_parser(date_format: str):
+        # Позиции полей вычисляются по формату, разбор сводится к срезам и int
+        positions = {}
+        shape = []
+        i = 0
+        while i < len(date_format):
+            code = date_format[i : i + 2]
+            if code in _FIELD_WIDTHS:
+                width = _FIELD_WIDTHS[code]
+                start = len("".join(shape))
+                positions[code] = (start, start + width)
+                shape.append("0" * width)
+                i += 2
+            else:
+                shape.append(date_format[i])
+                i += 1
+
+        slices = [positions[code] for code in _FIELD_WIDTHS if code in positions]
+        length = len("".join(shape))
+
+        def parse(value: str) -> datetime:
+            if len(value) != length:
+                raise ValueError(f"Некорректная дата: {value}")
+            return datetime(*[int(value[start:end]) for start, end in slices])
+
+        return "".join(shape), parse
+
+    @staticmethod
+    def _strptime_parser(date_format: str):
+        def parse(value: str) -> datetime:
+            return datetime.strptime(value, date_format)
+
+        return parse
+
+
+# Состояние разбора в процессе пула: формат даты и кэши живут между блоками
+_chunk_preparer = RecordPreparer()
+
+
+def _prepare_chunk(chunk: List[Dict]) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+    prepared = []
+    rejected = []
+    for i, item in enumerate(chunk):
+        try:
+            prepared.append(_chunk_preparer.prepare(item))
+        except ValueError as e:
+            rejected.append((i, str(e)))
+    return prepared, rejected
+
 
 class DataImporter(ABC):
+    DEFAULT_CHUNK_SIZE = 5000
+    DEFAULT_BATCH_SIZE = 10000
+
+    def __init__(self, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if workers < 1:
+            raise ValueError("Количество процессов должно быть положительным")
+        if chunk_size < 1:
+            raise ValueError("Размер блока должен быть положительным")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.preparer = RecordPreparer()
+        # (номер записи, исходная запись, причина) для отклоненных записей
+        self.rejected: List[Tuple[int, Dict, str]] = []
+        self._rows_seen = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
     def import_data(self, data_str: str) -> List[Dict[str, Any]]:
+        self._start_import()
         raw_data = self._import(data_str)
         prepared_data = self._prepare_data(raw_data)
         return prepared_data
 
+    def read_raw_batches(
+        self, source: Union[str, os.PathLike], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Возвращает разобранные, но еще не подготовленные записи пачками
+        не больше batch_size. Подготовка выполняется отдельно через prepare_batch
+        """
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть положительным")
+
+        self._start_import()
+        with open(source, "r", encoding="utf-8") as file:
+            data = self._import(file.read())
+        for i in range(0, len(data), batch_size):
+            yield data[i : i + batch_size]
+
+    def prepare_batch(self, batch: List[Dict]) -> List[Dict[str, Any]]:
+        """Приводит поля пачки к типам модели, некорректные записи в rejected"""
+        return self._prepare_data(batch)
+
+    def open(self) -> None:
+        """
+        Запускает пул процессов параллельного режима. Вызывается до старта
+        потоков, чтобы процессы пула не порождались из многопоточного процесса
+        """
+        if self.workers > 1 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self) -> None:
+        """Останавливает пул процессов параллельного режима, если он был запущен"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "DataImporter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _start_import(self) -> None:
+        self.rejected = []
+        self._rows_seen = 0
+
     def _prepare_data(self, data: List[Dict]) -> List[Dict]:
+        # Записи с некорректными полями пропускаются и попадают в rejected
+        if self.workers > 1 and len(data) > self.chunk_size:
+            prepared = self._prepare_data_parallel(data)
+        else:
+            prepared = []
+            for i, item in enumerate(data):
+                try:
+                    prepared.append(self._prepare_item(item))
+                except ValueError as e:
+                    self._reject(i, item, str(e))
+        self._rows_seen += len(data)
+        return prepared
+
+    def _prepare_data_parallel(self, data: List[Dict]) -> List[Dict]:
+        # Блоки обрабатываются в пуле процессов, map сохраняет исходный порядок
+        self.open()
+
+        chunks = [
+            data[i : i + self.chunk_size] for i in range(0, len(data), self.chunk_size)
+        ]
         prepared = []
-        for item in data:
-            prepared_item = {}
-            for key, value in item.items():
-                if key == "amount" and isinstance(value, str):
-                    prepared_item[key] = Decimal(value)
-                elif key == "date" and isinstance(value, str):
-                    try:
-                        prepared_item[key] = datetime.fromisoformat(value)
-                    except ValueError:
-                        try:
-                            prepared_item[key] = datetime.strptime(
-                                value, "%Y-%m-%d %H:%M:%S"
-                            )
-                        except ValueError:
-                            prepared_item[key] = datetime.now()
-                elif key == "type" and isinstance(value, str):
-                    try:
-                        prepared_item[key] = TransactionType(value)
-                    except ValueError:
-                        if value.upper() == "INCOME":
-                            prepared_item[key] = TransactionType.INCOME
-                        elif value.upper() == "EXPENSE":
-                            prepared_item[key] = TransactionType.EXPENSE
-                else:
-                    prepared_item[key] = value
-            prepared.append(prepared_item)
+        offset = 0
+        for chunk, (items, rejected) in zip(
+            chunks, self._executor.map(_prepare_chunk, chunks)
+        ):
+            prepared.extend(items)
+            for i, error in rejected:
+                self._reject(offset + i, chunk[i], error)
+            offset += len(chunk)
         return prepared
 
+    def _prepare_item(self, item: Dict) -> Dict:
+        return self.preparer.prepare(item)
+
+    def _reject(self, index: int, item: Dict, error: str) -> None:
+        self.rejected.append((self._rows_seen + index + 1, item, error))
+
     @abstractmethod
     def _import(self, data_str: str) -> List[Dict]:
         pass
 
 
 class CSVImporter(DataImporter):
+    def import_batches(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Потоково читает CSV из файла или бинарного потока и возвращает
+        подготовленные записи пачками не больше batch_size
+        """
+        for batch in self.read_raw_batches(source, batch_size):
+            yield self._prepare_data(batch)
+
+    def read_raw_batches(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть положительным")
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as stream:
+                yield from self._read_batches(stream, batch_size)
+        else:
+            yield from self._read_batches(source, batch_size)
+
+    def _read_batches(
+        self, stream: BinaryIO, batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        self._start_import()
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            reader = csv.reader(text)
+            headers = next(reader, None)
+            if headers is None:
+                return
+
+            batch = []
+            for row in reader:
+                batch.append(self._row_to_item(headers, row))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            # Поток принадлежит вызывающему коду и не должен закрываться
+            text.detach()
+
     def _import(self, data_str: str) -> List[Dict]:
-        result = []
         f = io.StringIO(data_str)
         reader = csv.reader(f)
         headers = next(reader)
 
-        for row in reader:
-            item = {}
-            for i, header in enumerate(headers):
-                if i < len(row):
-                    item[header] = row[i]
-            result.append(item)
+        return [self._row_to_item(headers, row) for row in reader]
 
-        return result
+    def _row_to_item(self, headers: List[str], row: List[str]) -> Dict:
+        item = {}
+        for i, header in enumerate(headers):
+            if i < len(row):
+                item[header] = row[i]
+        return item
 
 
 class JSONImporter(DataImporter):
@@ -74,5 +367,203 @@ class JSONImporter(DataImporter):
 
 
 class YAMLImporter(DataImporter):
+    """
+    Импорт YAML через libyaml, если PyYAML собран с ней. Поддерживает файлы
+    из нескольких документов-списков, которые читаются по одному
+    """
+
+    def import_batches(
+        self, source: Union[str, os.PathLike, TextIO]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Возвращает подготовленные записи каждого документа файла"""
+        for document in self._documents(source):
+            yield self._prepare_data(document)
+
+    def read_raw_batches(
+        self,
+        source: Union[str, os.PathLike, TextIO],
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть положительным")
+        for document in self._documents(source):
+            for i in range(0, len(document), batch_size):
+                yield document[i : i + batch_size]
+
+    def _documents(
+        self, source: Union[str, os.PathLike, TextIO]
+    ) -> Iterator[List[Dict]]:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="utf-8") as stream:
+                yield from self._read_documents(stream)
+        else:
+            yield from self._read_documents(source)
+
+    def _read_documents(self, stream: TextIO) -> Iterator[List[Dict]]:
+        self._start_import()
+        for document in yaml.load_all(stream, Loader=YAMLLoader):
+            if document is None:
+                continue
+            if not isinstance(document, list):
+                raise ValueError("Документ YAML должен содержать список операций")
+            yield document
+
     def _import(self, data_str: str) -> List[Dict]:
-        return yaml.safe_load(data_str)
+        documents = list(yaml.load_all(data_str, Loader=YAMLLoader))
+        if len(documents) == 1:
+            return documents[0]
+
+        items = []
+        for document in documents:
+            if document is not None:
+                items.extend(document)
+        return items
+
+
+class NDJSONImporter(DataImporter):
+    """
+    Импорт JSON Lines построчно. Прерванный импорт можно продолжить
+    с байтового смещения, возвращенного read_batches
+    """
+
+    def import_batches(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+        offset: int = 0,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Возвращает подготовленные записи пачками, начиная с offset байт"""
+        for batch, _ in self.read_batches(source, batch_size, offset):
+            yield batch
+
+    def read_batches(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+        offset: int = 0,
+    ) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Возвращает пары (пачка записей, смещение следующей строки).
+        Смещение после обработанной пачки передается в offset при повторном запуске
+        """
+        for batch, position in self._read_offsets(source, batch_size, offset):
+            yield self._prepare_data(batch), position
+
+    def read_raw_batches(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+        offset: int = 0,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        for batch, _ in self._read_offsets(source, batch_size, offset):
+            yield batch
+
+    def _read_offsets(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        batch_size: int,
+        offset: int,
+    ) -> Iterator[Tuple[List[Dict], int]]:
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть положительным")
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as stream:
+                yield from self._read_batches(stream, batch_size, offset)
+        else:
+            yield from self._read_batches(source, batch_size, offset)
+
+    def _read_batches(
+        self, stream: BinaryIO, batch_size: int, offset: int
+    ) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+        self._start_import()
+        stream.seek(offset)
+        position = offset
+        batch = []
+        for line in stream:
+            position += len(line)
+            item = self._parse_line(line)
+            if item is None:
+                continue
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch, position
+                batch = []
+        if batch:
+            yield batch, position
+
+    def _import(self, data_str: Union[str, bytes]) -> List[Dict]:
+        items = []
+        for line in data_str.splitlines():
+            item = self._parse_line(line)
+            if item is not None:
+                items.append(item)
+        return items
+
+    def _parse_line(self, line: Union[str, bytes]) -> Optional[Dict]:
+        if not line.strip():
+            return None
+        if orjson is not None:
+            return orjson.loads(line)
+        return json.loads(line)
+
+
+class ArrowImporter(DataImporter):
+    """
+    Импорт файлов Arrow IPC, созданных ArrowExporter. Файл отображается
+    в память и читается по пакетам строк. Требует пакет pyarrow
+    """
+
+    def import_file(self, path: Union[str, os.PathLike]) -> List[Dict[str, Any]]:
+        prepared = []
+        for batch in self.import_batches(path):
+            prepared.extend(batch)
+        return prepared
+
+    def import_batches(
+        self, path: Union[str, os.PathLike]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Возвращает подготовленные записи по пакетам строк файла"""
+        self._require_pyarrow()
+        self._start_import()
+        with pa.memory_map(os.fspath(path), "r") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield self._batch_to_records(reader.get_batch(i))
+
+    def read_raw_batches(
+        self,
+        source: Union[str, os.PathLike],
+        batch_size: int = DataImporter.DEFAULT_BATCH_SIZE,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # Размер пачки задан пакетами строк файла
+        return self.import_batches(source)
+
+    def prepare_batch(self, batch: List[Dict]) -> List[Dict[str, Any]]:
+        return batch
+
+    def import_data(self, data: bytes) -> List[Dict[str, Any]]:
+        # Записи формируются уже подготовленными, см. _batch_to_records
+        return self._import(data)
+
+    def _batch_to_records(self, batch: "pa.RecordBatch") -> List[Dict[str, Any]]:
+        # Столбцы уже типизированы: суммы - Decimal, даты - datetime,
+        # поэтому построчная подготовка нужна только для типа операции
+        columns = batch.to_pydict()
+        if "type" in columns:
+            types = {item.value: item for item in TransactionType}
+            columns["type"] = [types.get(value, value) for value in columns["type"]]
+        names = list(columns.keys())
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+    def _import(self, data: bytes) -> List[Dict]:
+        self._require_pyarrow()
+        reader = pa.ipc.open_file(pa.py_buffer(data))
+        records = []
+        for i in range(reader.num_record_batches):
+            records.extend(self._batch_to_records(reader.get_batch(i)))
+        return records
+
+    def _require_pyarrow(self) -> None:
+        if pa is None:
+            raise RuntimeError("Для формата Arrow требуется пакет pyarrow")
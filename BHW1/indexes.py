@@ -0,0 +1,114 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class DailyBalanceIndex:
+    """
+    Дерево Фенвика по дням: хранит суммы операций в минимальных единицах
+    валюты, сгруппированные по дате, и отвечает на запрос префиксной суммы
+    за O(log N)
+    """
+
+    MIN_CAPACITY = 64
+
+    def __init__(self):
+        self._origin: Optional[int] = None
+        self._tree: List[int] = []
+        self._day_totals: Dict[int, int] = {}
+
+    def add(self, date: datetime, amount: int) -> None:
+        """Добавляет сумму к дню операции (отрицательная сумма отменяет вклад)"""
+        ordinal = date.toordinal()
+        self._day_totals[ordinal] = self._day_totals.get(ordinal, 0) + amount
+
+        if not self._covers(ordinal):
+            self._grow(ordinal)
+            return
+
+        size = len(self._tree)
+        i = ordinal - self._origin + 1
+        while i <= size:
+            self._tree[i - 1] += amount
+            i += i & -i
+
+    def prefix_sum(self, ordinal: int) -> int:
+        """Возвращает сумму за все дни с порядковым номером не больше ordinal"""
+        result = 0
+        if self._origin is None:
+            return result
+
+        i = min(ordinal - self._origin + 1, len(self._tree))
+        while i > 0:
+            result += self._tree[i - 1]
+            i -= i & -i
+        return result
+
+    def range_sum(self, first_ordinal: int, last_ordinal: int) -> int:
+        """Возвращает сумму за дни в диапазоне [first_ordinal, last_ordinal]"""
+        if first_ordinal > last_ordinal:
+            return 0
+        return self.prefix_sum(last_ordinal) - self.prefix_sum(first_ordinal - 1)
+
+    def _covers(self, ordinal: int) -> bool:
+        return (
+            self._origin is not None
+            and self._origin <= ordinal < self._origin + len(self._tree)
+        )
+
+    def _grow(self, ordinal: int) -> None:
+        # Диапазон расширяется с запасом, поэтому перестроение амортизируется
+        if self._origin is None:
+            low, high = ordinal, ordinal
+        else:
+            low = min(self._origin, ordinal)
+            high = max(self._origin + len(self._tree) - 1, ordinal)
+
+        size = max(2 * len(self._tree), high - low + 1, self.MIN_CAPACITY)
+        if self._origin is not None and ordinal < self._origin:
+            self._origin = max(1, high - size + 1)
+        else:
+            self._origin = low
+
+        tree = [0] * size
+        for day, total in self._day_totals.items():
+            tree[day - self._origin] += total
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent - 1] += tree[i - 1]
+        self._tree = tree
+
+
+class SortedIdIndex:
+    """
+    Отсортированный список ID для постраничной выборки по курсору:
+    страница после заданного ID находится бинарным поиском
+    """
+
+    def __init__(self):
+        self._ids: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, id: int) -> None:
+        ids = self._ids
+        # Новые ID обычно больше всех существующих
+        if not ids or id > ids[-1]:
+            ids.append(id)
+            return
+        position = bisect_left(ids, id)
+        if ids[position] != id:
+            ids.insert(position, id)
+
+    def discard(self, id: int) -> None:
+        ids = self._ids
+        position = bisect_left(ids, id)
+        if position < len(ids) and ids[position] == id:
+            del ids[position]
+
+    def after(self, after_id: Optional[int], limit: int) -> List[int]:
+        """Возвращает до limit ID, больших after_id, в порядке возрастания"""
+        start = 0 if after_id is None else bisect_right(self._ids, after_id)
+        return self._ids[start : start + limit]
@@ -1,9 +1,47 @@
+import argparse
+
 from console_app import ConsoleApp
+from container import FinanceModuleContainer
 
 
 def main():
-    app = ConsoleApp()
-    app.run()
+    parser = argparse.ArgumentParser(description="Модуль учета финансов")
+    parser.add_argument(
+        "--storage",
+        choices=FinanceModuleContainer.STORAGES,
+        default="memory",
+        help="хранилище данных",
+    )
+    parser.add_argument("--database", default="finance.db", help="путь к файлу SQLite")
+    parser.add_argument(
+        "--cache-policy",
+        choices=FinanceModuleContainer.CACHE_POLICIES,
+        default="lru",
+        help="политика кэширования операций",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=1024, help="размер кэша операций"
+    )
+    parser.add_argument(
+        "--import-workers",
+        type=int,
+        default=1,
+        help="число процессов для подготовки записей при импорте",
+    )
+    args = parser.parse_args()
+
+    container = FinanceModuleContainer(
+        import_workers=args.import_workers,
+        storage=args.storage,
+        database_path=args.database,
+        cache_policy=args.cache_policy,
+        cache_size=args.cache_size,
+    )
+    try:
+        app = ConsoleApp(container)
+        app.run()
+    finally:
+        container.close()
 
 
 if __name__ == "__main__":
@@ -10,6 +10,8 @@ class TransactionType(Enum):
 
 
 class BankAccount:
+    __slots__ = ("id", "name", "balance")
+
     def __init__(self, id: int, name: str, balance: Decimal = Decimal("0.0")):
         self.id = id
         self.name = name
@@ -29,6 +31,8 @@ class BankAccount:
 
 
 class Category:
+    __slots__ = ("id", "name", "type")
+
     def __init__(self, id: int, name: str, type: TransactionType):
         self.id = id
         self.name = name
@@ -36,6 +40,23 @@ class Category:
 
 
 class Operation:
+    """
+    Операция по счету. Признак типа (1 - доход, -1 - расход) вычисляется
+    при создании и при присваивании type, поэтому агрегаты получают знак
+    суммы умножением, без ветвления по типу
+    """
+
+    __slots__ = (
+        "id",
+        "_type",
+        "bank_account_id",
+        "amount",
+        "date",
+        "category_id",
+        "description",
+        "type_flag",
+    )
+
     def __init__(
         self,
         id: int,
@@ -53,3 +74,12 @@ class Operation:
         self.date = date
         self.category_id = category_id
         self.description = description
+
+    @property
+    def type(self) -> TransactionType:
+        return self._type
+
+    @type.setter
+    def type(self, value: TransactionType) -> None:
+        self._type = value
+        self.type_flag = 1 if value == TransactionType.INCOME else -1
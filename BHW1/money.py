@@ -0,0 +1,18 @@
+from decimal import Decimal
+
+# Число знаков после запятой в минимальной единице валюты (копейки)
+DEFAULT_SCALE = 2
+
+
+def to_minor(amount: Decimal, scale: int = DEFAULT_SCALE) -> int:
+    """Переводит сумму в целое число минимальных единиц без округления"""
+    minor = Decimal(amount).scaleb(scale)
+    integral = minor.to_integral_value()
+    if minor != integral:
+        raise ValueError(f"Сумма {amount} не представима с точностью {scale} знаков")
+    return int(integral)
+
+
+def from_minor(minor: int, scale: int = DEFAULT_SCALE) -> Decimal:
+    """Переводит целое число минимальных единиц в Decimal с точностью scale"""
+    return Decimal(minor).scaleb(-scale)
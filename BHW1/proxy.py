@@ -1,43 +1,183 @@
-from typing import List, Optional, Dict
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from models import Operation
 from repositories import Repository, InMemoryOperationRepository
 
 
 class OperationRepositoryProxy(Repository):
-    def __init__(self, real_repository: InMemoryOperationRepository):
+    """
+    Кэширующий прокси репозитория операций.
+
+    Точечные запросы хранятся в ограниченном LRU-кэше с необязательным
+    временем жизни записей. Снимок для get_all не сбрасывается при записи,
+    а дополняется изменениями. Возвращаемый список является общим снимком
+    и не должен изменяться вызывающим кодом; первая запись после выдачи
+    снимка копирует его, поэтому выданный список не меняется. При
+    keep_snapshot=False снимок не хранится и get_all обращается к
+    репозиторию: так хранилище, создающее объекты только по запросу,
+    не держит их все в памяти
+    """
+
+    def __init__(
+        self,
+        real_repository: InMemoryOperationRepository,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        write_through: bool = False,
+        keep_snapshot: bool = True,
+    ):
         self.real_repository = real_repository
-        self.cache: Dict = {}
+        self.keep_snapshot = keep_snapshot
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.write_through = write_through
+        self.cache: "OrderedDict[int, Tuple[Operation, float]]" = OrderedDict()
         self.is_cache_valid = False
+        self.hits = 0
+        self.misses = 0
+        self._snapshot: List[Operation] = []
+        self._positions: Dict[int, int] = {}
+        self._deleted: Set[int] = set()
+        # Снимок выдан вызывающему коду и копируется перед следующей записью
+        self._shared = False
 
     def get_all(self) -> List[Operation]:
+        if not self.keep_snapshot:
+            return self.real_repository.get_all()
         if not self.is_cache_valid:
-            self.cache["all"] = self.real_repository.get_all()
+            self.misses += 1
+            self._snapshot = self.real_repository.get_all()
+            self._positions = {op.id: i for i, op in enumerate(self._snapshot)}
+            self._deleted.clear()
             self.is_cache_valid = True
-        return self.cache["all"]
+            self._shared = True
+            return self._snapshot
+
+        self.hits += 1
+        if self._deleted:
+            self._compact()
+        self._shared = True
+        return self._snapshot
+
+    def iter_all(self) -> Iterator[Operation]:
+        if not self.keep_snapshot:
+            return self.real_repository.iter_all()
+        # Снимок уже хранится в прокси, обход не создает новую копию
+        return iter(self.get_all())
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[Operation]:
+        return self.real_repository.page(after_id, limit)
 
     def get_by_id(self, id: int) -> Optional[Operation]:
-        cache_key = f"id_{id}"
-        if cache_key not in self.cache:
-            self.cache[cache_key] = self.real_repository.get_by_id(id)
-        return self.cache[cache_key]
+        entry = self.cache.get(id)
+        if entry is not None:
+            operation, expires_at = entry
+            if expires_at >= time.monotonic():
+                self.hits += 1
+                self.cache.move_to_end(id)
+                return operation
+            del self.cache[id]
+
+        self.misses += 1
+        operation = self.real_repository.get_by_id(id)
+        # Отсутствующие ID не кэшируются: операция может быть добавлена позже
+        if operation is not None:
+            self._remember(operation)
+        return operation
+
+    def get_stored(self, id: int) -> Optional[Operation]:
+        # Кэш отдает те же объекты, что и вызывающему коду, поэтому
+        # сохраненное состояние читается из репозитория
+        return self.real_repository.get_stored(id)
+
+    def get_by_period(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[Operation]:
+        return self.real_repository.get_by_period(start_date, end_date)
+
+    def get_by_account(self, bank_account_id: int) -> List[Operation]:
+        return self.real_repository.get_by_account(bank_account_id)
+
+    def get_account_balance(self, bank_account_id: int) -> Decimal:
+        return self.real_repository.get_account_balance(bank_account_id)
+
+    def get_period_balance(self, start_date: datetime, end_date: datetime) -> Decimal:
+        return self.real_repository.get_period_balance(start_date, end_date)
+
+    def get_category_totals(
+        self, start_date: datetime, end_date: datetime
+    ) -> Dict[int, List]:
+        return self.real_repository.get_category_totals(start_date, end_date)
+
+    def transaction(self):
+        return self.real_repository.transaction()
 
     def add(self, entity: Operation) -> Operation:
         result = self.real_repository.add(entity)
-        self.is_cache_valid = False
+        self._written(result)
+        return result
+
+    def add_many(self, entities: List[Operation]) -> List[Operation]:
+        result = self.real_repository.add_many(entities)
+        for entity in result:
+            self._written(entity)
         return result
 
     def update(self, entity: Operation) -> Operation:
         result = self.real_repository.update(entity)
-        self.is_cache_valid = False
-        cache_key = f"id_{entity.id}"
-        if cache_key in self.cache:
-            del self.cache[cache_key]
+        self._written(result)
         return result
 
     def delete(self, id: int) -> None:
         self.real_repository.delete(id)
-        self.is_cache_valid = False
-        cache_key = f"id_{id}"
-        if cache_key in self.cache:
-            del self.cache[cache_key]
+        self.cache.pop(id, None)
+        if self.is_cache_valid and self._positions.pop(id, None) is not None:
+            self._deleted.add(id)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики попаданий и промахов кэша"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.cache)}
+
+    def _written(self, operation: Operation) -> None:
+        if self.write_through:
+            self._remember(operation)
+        else:
+            self.cache.pop(operation.id, None)
+
+        if not self.is_cache_valid:
+            return
+        if operation.id in self._deleted:
+            self._compact()
+
+        if self._shared:
+            self._snapshot = list(self._snapshot)
+            self._shared = False
+        position = self._positions.get(operation.id)
+        if position is None:
+            self._positions[operation.id] = len(self._snapshot)
+            self._snapshot.append(operation)
+        else:
+            self._snapshot[position] = operation
+
+    def _remember(self, operation: Operation) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        self.cache[operation.id] = (operation, expires_at)
+        self.cache.move_to_end(operation.id)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def _compact(self) -> None:
+        # Удаления применяются к снимку пачкой при следующем обращении
+        deleted = self._deleted
+        self._snapshot = [op for op in self._snapshot if op.id not in deleted]
+        self._positions = {op.id: i for i, op in enumerate(self._snapshot)}
+        self._shared = False
+        deleted.clear()
@@ -0,0 +1,156 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from models import Operation, TransactionType
+from repositories import Repository
+
+UNKNOWN_ACCOUNT = "Неизвестный счет"
+NO_CATEGORY = "Без категории"
+
+
+class OperationQueryService:
+    """
+    Модель чтения для списков операций: возвращает строки, в которых
+    операция уже соединена с названиями счета и категории. Названия
+    разрешаются одним пакетным запросом на страницу, а не по операции
+    """
+
+    DEFAULT_PAGE_SIZE = 1000
+
+    def __init__(
+        self,
+        operation_repository: Repository,
+        bank_account_repository: Repository,
+        category_repository: Repository,
+    ):
+        self.operation_repository = operation_repository
+        self.bank_account_repository = bank_account_repository
+        self.category_repository = category_repository
+
+    def list_operations(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """
+        Возвращает страницу строк операций, подходящих под фильтры.
+        При фильтре по периоду строки упорядочены по дате, иначе по ID
+        """
+        if offset < 0:
+            raise ValueError("Смещение не может быть отрицательным")
+        if limit is not None and limit < 0:
+            raise ValueError("Размер страницы не может быть отрицательным")
+
+        operations = self._select(account_id, category_id, type, start_date, end_date)
+        end = None if limit is None else offset + limit
+        return self._to_rows(operations[offset:end])
+
+    def iter_pages(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Выдает строки операций страницами по page_size. Отфильтрованные
+        операции выбираются сразу, строки с названиями строятся лениво
+        """
+        if page_size < 1:
+            raise ValueError("Размер страницы должен быть положительным")
+
+        filters = (account_id, category_id, type, start_date, end_date)
+        if all(value is None for value in filters):
+            # Без фильтров страницы читаются курсором по ID, без копии хранилища
+            return self._cursor_pages(page_size)
+
+        operations = self._select(*filters)
+        return self._pages(operations, page_size)
+
+    def count(
+        self,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> int:
+        """Возвращает количество операций, подходящих под фильтры"""
+        return len(self._select(account_id, category_id, type, start_date, end_date))
+
+    def _cursor_pages(self, page_size: int) -> Iterator[List[Dict]]:
+        after_id = None
+        while True:
+            operations = self.operation_repository.page(after_id, page_size)
+            if not operations:
+                return
+            yield self._to_rows(operations)
+            after_id = operations[-1].id
+
+    def _pages(
+        self, operations: List[Operation], page_size: int
+    ) -> Iterator[List[Dict]]:
+        for start in range(0, len(operations), page_size):
+            yield self._to_rows(operations[start : start + page_size])
+
+    def _select(
+        self,
+        account_id: Optional[int],
+        category_id: Optional[int],
+        type: Optional[TransactionType],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> List[Operation]:
+        # Самый избирательный фильтр выполняется индексом репозитория,
+        # остальные применяются к его результату
+        by_period = start_date is not None or end_date is not None
+        if account_id is not None:
+            operations = self.operation_repository.get_by_account(account_id)
+        elif by_period:
+            operations = self.operation_repository.get_by_period(
+                start_date or datetime.min, end_date or datetime.max
+            )
+        else:
+            operations = self.operation_repository.get_all()
+
+        if account_id is not None and by_period:
+            first = start_date or datetime.min
+            last = end_date or datetime.max
+            operations = [op for op in operations if first <= op.date <= last]
+        if category_id is not None:
+            operations = [op for op in operations if op.category_id == category_id]
+        if type is not None:
+            operations = [op for op in operations if op.type == type]
+        return operations
+
+    def _to_rows(self, operations: List[Operation]) -> List[Dict]:
+        accounts = self.bank_account_repository.get_by_ids(
+            {op.bank_account_id for op in operations}
+        )
+        categories = self.category_repository.get_by_ids(
+            {op.category_id for op in operations if op.category_id}
+        )
+        account_names = {id: account.name for id, account in accounts.items()}
+        category_names = {id: category.name for id, category in categories.items()}
+
+        return [
+            {
+                "id": op.id,
+                "type": op.type,
+                "account_name": account_names.get(op.bank_account_id, UNKNOWN_ACCOUNT),
+                "account_id": op.bank_account_id,
+                "amount": op.amount,
+                "category_name": category_names.get(op.category_id, NO_CATEGORY),
+                "category_id": op.category_id,
+                "date": op.date,
+                "description": op.description,
+            }
+            for op in operations
+        ]
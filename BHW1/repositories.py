@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from contextlib import nullcontext
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from datetime import datetime, time
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from models import BankAccount, Category, Operation
+from indexes import DailyBalanceIndex, SortedIdIndex
+from models import BankAccount, Category, Operation, TransactionType
+from money import DEFAULT_SCALE, from_minor, to_minor
 
 
 class Repository(ABC):
+    DEFAULT_PAGE_SIZE = 100
+
     @abstractmethod
     def get_all(self):
         pass
@@ -25,15 +34,61 @@ class Repository(ABC):
     def delete(self, id):
         pass
 
+    def get_by_ids(self, ids: Iterable[int]) -> Dict[int, Any]:
+        """Возвращает найденные сущности по набору ID; отсутствующие ID пропускаются"""
+        result = {}
+        for id in ids:
+            entity = self.get_by_id(id)
+            if entity is not None:
+                result[id] = entity
+        return result
+
+    def iter_all(self) -> Iterator[Any]:
+        """
+        Обходит сущности без копирования хранилища. Хранилище нельзя
+        изменять, пока обход не завершен
+        """
+        return iter(self.get_all())
+
+    def page(self, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Возвращает до limit сущностей с ID больше after_id в порядке возрастания ID"""
+        self._check_limit(limit)
+        entities = self.iter_all()
+        if after_id is not None:
+            entities = (entity for entity in entities if entity.id > after_id)
+        return heapq.nsmallest(limit, entities, key=lambda entity: entity.id)
+
+    def transaction(self):
+        """
+        Контекст, в котором несколько записей сохраняются вместе. Хранилища
+        в памяти пишут сразу, поэтому по умолчанию контекст пустой
+        """
+        return nullcontext()
+
+    @staticmethod
+    def _check_limit(limit: int) -> None:
+        if limit < 1:
+            raise ValueError("Размер страницы должен быть положительным")
+
 
 class InMemoryBankAccountRepository(Repository):
     def __init__(self):
         self.accounts: Dict[int, BankAccount] = {}
         self.next_id = 1
+        self._id_index = SortedIdIndex()
 
     def get_all(self) -> List[BankAccount]:
         return list(self.accounts.values())
 
+    def iter_all(self) -> Iterator[BankAccount]:
+        return iter(self.accounts.values())
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[BankAccount]:
+        self._check_limit(limit)
+        return [self.accounts[id] for id in self._id_index.after(after_id, limit)]
+
     def get_by_id(self, id: int) -> Optional[BankAccount]:
         return self.accounts.get(id)
 
@@ -45,6 +100,7 @@ class InMemoryBankAccountRepository(Repository):
             self.next_id = max(self.next_id, entity.id + 1)
 
         self.accounts[entity.id] = entity
+        self._id_index.add(entity.id)
         return entity
 
     def update(self, entity: BankAccount) -> BankAccount:
@@ -57,16 +113,27 @@ class InMemoryBankAccountRepository(Repository):
         if id not in self.accounts:
             raise ValueError(f"Счет с ID {id} не найден")
         del self.accounts[id]
+        self._id_index.discard(id)
 
 
 class InMemoryCategoryRepository(Repository):
     def __init__(self):
         self.categories: Dict[int, Category] = {}
         self.next_id = 1
+        self._id_index = SortedIdIndex()
 
     def get_all(self) -> List[Category]:
         return list(self.categories.values())
 
+    def iter_all(self) -> Iterator[Category]:
+        return iter(self.categories.values())
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[Category]:
+        self._check_limit(limit)
+        return [self.categories[id] for id in self._id_index.after(after_id, limit)]
+
     def get_by_id(self, id: int) -> Optional[Category]:
         return self.categories.get(id)
 
@@ -75,6 +142,7 @@ class InMemoryCategoryRepository(Repository):
             entity.id = self.next_id
             self.next_id += 1
         self.categories[entity.id] = entity
+        self._id_index.add(entity.id)
         return entity
 
     def update(self, entity: Category) -> Category:
@@ -87,33 +155,240 @@ class InMemoryCategoryRepository(Repository):
         if id not in self.categories:
             raise ValueError(f"Категория с ID {id} не найдена")
         del self.categories[id]
+        self._id_index.discard(id)
 
 
 class InMemoryOperationRepository(Repository):
-    def __init__(self):
+    """
+    Хранилище операций со вторичными индексами. Суммы в индексах хранятся
+    целыми числами минимальных единиц валюты и переводятся в Decimal
+    только в ответах; сумма должна быть представима с точностью scale знаков
+    """
+
+    def __init__(self, scale: int = DEFAULT_SCALE):
+        self.scale = scale
         self.operations: Dict[int, Operation] = {}
         self.next_id = 1
+        # Вторичный индекс: отсортированные пары (дата, ID) для выборок по периоду
+        self._date_index: List[Tuple[datetime, int]] = []
+        # Проиндексированное состояние операции:
+        # (дата, сумма со знаком, ID счета, ID категории)
+        self._indexed: Dict[int, Tuple[datetime, int, int, Optional[int]]] = {}
+        self._daily_balances = DailyBalanceIndex()
+        self._account_operations: Dict[int, Set[int]] = {}
+        self._account_balances: Dict[int, int] = {}
+        self._id_index = SortedIdIndex()
 
     def get_all(self) -> List[Operation]:
         return list(self.operations.values())
 
+    def iter_all(self) -> Iterator[Operation]:
+        return iter(self.operations.values())
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[Operation]:
+        self._check_limit(limit)
+        return [self.operations[id] for id in self._id_index.after(after_id, limit)]
+
     def get_by_id(self, id: int) -> Optional[Operation]:
         return self.operations.get(id)
 
+    def get_stored(self, id: int) -> Optional[Operation]:
+        """
+        Возвращает отдельную копию операции в том виде, в каком она учтена
+        в индексах: изменение выданного объекта на месте до вызова update
+        на копию не влияет. Описание берется из текущего объекта
+        """
+        indexed = self._indexed.get(id)
+        if indexed is None:
+            return None
+        date, signed_amount, account_id, category_id = indexed
+        return Operation(
+            id,
+            TransactionType.INCOME if signed_amount > 0 else TransactionType.EXPENSE,
+            account_id,
+            from_minor(abs(signed_amount), self.scale),
+            date,
+            category_id,
+            self.operations[id].description,
+        )
+
+    def get_by_period(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[Operation]:
+        """Возвращает операции с датой в диапазоне [start_date, end_date], упорядоченные по дате"""
+        if start_date > end_date:
+            return []
+        lo = bisect_left(self._date_index, (start_date,))
+        hi = bisect_right(self._date_index, (end_date, float("inf")), lo)
+        return [self.operations[id] for _, id in self._date_index[lo:hi]]
+
+    def get_by_account(self, bank_account_id: int) -> List[Operation]:
+        ids = self._account_operations.get(bank_account_id, ())
+        return [self.operations[id] for id in sorted(ids)]
+
+    def get_account_balance(self, bank_account_id: int) -> Decimal:
+        """Возвращает баланс счета, рассчитанный по его операциям"""
+        return from_minor(self._account_balances.get(bank_account_id, 0), self.scale)
+
+    def get_period_balance(self, start_date: datetime, end_date: datetime) -> Decimal:
+        """Возвращает разницу доходов и расходов за период [start_date, end_date]"""
+        if start_date > end_date:
+            return from_minor(0, self.scale)
+
+        first_day = start_date.toordinal()
+        last_day = end_date.toordinal()
+        if first_day == last_day:
+            return from_minor(self._scan_balance(start_date, end_date), self.scale)
+
+        # Полные дни внутри периода берутся из дерева Фенвика,
+        # граничные дни досчитываются по индексу дат
+        if start_date.time() == time.min:
+            balance = self._daily_balances.range_sum(first_day, last_day - 1)
+        else:
+            balance = self._daily_balances.range_sum(first_day + 1, last_day - 1)
+            balance += self._scan_balance(
+                start_date, datetime.combine(start_date.date(), time.max)
+            )
+        balance += self._scan_balance(
+            datetime.combine(end_date.date(), time.min), end_date
+        )
+        return from_minor(balance, self.scale)
+
     def add(self, entity: Operation) -> Operation:
         if entity.id is None or entity.id == 0:
             entity.id = self.next_id
             self.next_id += 1
+        self._index(entity)
         self.operations[entity.id] = entity
+        self._id_index.add(entity.id)
         return entity
 
+    def add_many(self, entities: List[Operation]) -> List[Operation]:
+        """Добавляет пачку операций, выделяя ID новым операциям одним диапазоном"""
+        new_entities = [e for e in entities if e.id is None or e.id == 0]
+        first_id = self.next_id
+        self.next_id += len(new_entities)
+        for offset, entity in enumerate(new_entities):
+            entity.id = first_id + offset
+
+        # Даты новых операций вливаются в индекс одной сортировкой вместо
+        # вставки каждой пары: перемешанная пачка не дает квадратичного времени
+        pending_dates = []
+        try:
+            for entity in entities:
+                if entity.id in self._indexed:
+                    # Повторный ID снимается с индекса дат, поэтому его пара
+                    # уже должна находиться в индексе
+                    self._merge_dates(pending_dates)
+                    self._index(entity)
+                else:
+                    self._index(entity, pending_dates)
+                self.operations[entity.id] = entity
+                self._id_index.add(entity.id)
+        finally:
+            self._merge_dates(pending_dates)
+        return entities
+
     def update(self, entity: Operation) -> Operation:
         if entity.id not in self.operations:
             raise ValueError(f"Операция с ID {entity.id} не найдена")
+        self._index(entity)
         self.operations[entity.id] = entity
         return entity
 
     def delete(self, id: int) -> None:
         if id not in self.operations:
             raise ValueError(f"Операция с ID {id} не найдена")
+        self._unindex(id)
+        self._id_index.discard(id)
         del self.operations[id]
+
+    def get_category_totals(
+        self, start_date: datetime, end_date: datetime
+    ) -> Dict[int, List]:
+        """Возвращает [сумма со знаком, количество] по категориям за период"""
+        totals = {}
+        if start_date > end_date:
+            return totals
+
+        lo = bisect_left(self._date_index, (start_date,))
+        hi = bisect_right(self._date_index, (end_date, float("inf")), lo)
+        for _, id in self._date_index[lo:hi]:
+            category_id = self.operations[id].category_id
+            if not category_id:
+                continue
+
+            entry = totals.get(category_id)
+            if entry is None:
+                entry = totals[category_id] = [0, 0]
+            entry[0] += self._indexed[id][1]
+            entry[1] += 1
+
+        for entry in totals.values():
+            entry[0] = from_minor(entry[0], self.scale)
+        return totals
+
+    def _scan_balance(self, start_date: datetime, end_date: datetime) -> int:
+        balance = 0
+        lo = bisect_left(self._date_index, (start_date,))
+        hi = bisect_right(self._date_index, (end_date, float("inf")), lo)
+        for _, id in self._date_index[lo:hi]:
+            balance += self._indexed[id][1]
+        return balance
+
+    def _index(
+        self,
+        entity: Operation,
+        pending_dates: Optional[List[Tuple[datetime, int]]] = None,
+    ) -> None:
+        # Сумма переводится до изменения индексов: непредставимая сумма
+        # отклоняется, не затрагивая хранилище
+        signed_amount = entity.type_flag * to_minor(entity.amount, self.scale)
+        self._unindex(entity.id)
+
+        account_id = entity.bank_account_id
+        if pending_dates is None:
+            insort(self._date_index, (entity.date, entity.id))
+        else:
+            pending_dates.append((entity.date, entity.id))
+        self._daily_balances.add(entity.date, signed_amount)
+        self._account_operations.setdefault(account_id, set()).add(entity.id)
+        self._account_balances[account_id] = (
+            self._account_balances.get(account_id, 0) + signed_amount
+        )
+        self._indexed[entity.id] = (
+            entity.date,
+            signed_amount,
+            account_id,
+            entity.category_id or None,
+        )
+
+    def _merge_dates(self, pending_dates: List[Tuple[datetime, int]]) -> None:
+        """Вливает накопленные пары (дата, ID) в индекс дат и очищает список"""
+        if not pending_dates:
+            return
+        # Отсортированная пачка и индекс образуют два упорядоченных отрезка,
+        # которые list.sort сливает за линейное время
+        pending_dates.sort()
+        self._date_index.extend(pending_dates)
+        self._date_index.sort()
+        pending_dates.clear()
+
+    def _unindex(self, id: int) -> None:
+        indexed = self._indexed.pop(id, None)
+        if indexed is None:
+            return
+        date, signed_amount, account_id, _ = indexed
+        position = bisect_left(self._date_index, (date, id))
+        del self._date_index[position]
+        self._daily_balances.add(date, -signed_amount)
+
+        account_operations = self._account_operations[account_id]
+        account_operations.discard(id)
+        if account_operations:
+            self._account_balances[account_id] -= signed_amount
+        else:
+            del self._account_operations[account_id]
+            del self._account_balances[account_id]
@@ -0,0 +1,419 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models import BankAccount, Category, Operation, TransactionType
+from repositories import Repository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    balance TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    bank_account_id INTEGER NOT NULL,
+    amount TEXT NOT NULL,
+    date TEXT NOT NULL,
+    category_id INTEGER,
+    description TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_operations_date ON operations (date);
+CREATE INDEX IF NOT EXISTS idx_operations_account_date
+    ON operations (bank_account_id, date);
+CREATE INDEX IF NOT EXISTS idx_operations_category_date
+    ON operations (category_id, date);
+"""
+
+
+def _format_date(date: datetime) -> str:
+    # Фиксированный формат сохраняет лексикографический порядок дат
+    return date.isoformat(sep=" ", timespec="microseconds")
+
+
+# Ограничение SQLite на число параметров в одном запросе
+_MAX_PARAMS = 500
+
+
+def _select_by_ids(connection: sqlite3.Connection, query: str, ids: Iterable[int]):
+    """Выполняет запрос вида "... WHERE id IN ({})" пачками параметров"""
+    ids = list(dict.fromkeys(ids))
+    for start in range(0, len(ids), _MAX_PARAMS):
+        chunk = ids[start : start + _MAX_PARAMS]
+        placeholders = ", ".join("?" * len(chunk))
+        yield from connection.execute(query.format(placeholders), chunk)
+
+
+class SQLiteDatabase:
+    """Подключение к файлу SQLite в режиме WAL со схемой модуля учета финансов"""
+
+    def __init__(self, path: str = "finance.db"):
+        self.path = path
+        # sqlite3 кэширует подготовленные выражения по тексту запроса
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, cached_statements=256
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Транзакция с поддержкой вложенности: изменения фиксируются или
+        откатываются при выходе из внешнего блока, вложенные блоки в нее входят
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                if self._depth == 1:
+                    with self.connection:
+                        yield
+                else:
+                    yield
+            finally:
+                self._depth -= 1
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class SQLiteBankAccountRepository(Repository):
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+        self.connection = database.connection
+
+    def transaction(self):
+        return self.database.transaction()
+
+    def get_all(self) -> List[BankAccount]:
+        rows = self.connection.execute(
+            "SELECT id, name, balance FROM accounts ORDER BY id"
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def iter_all(self) -> Iterator[BankAccount]:
+        rows = self.connection.execute(
+            "SELECT id, name, balance FROM accounts ORDER BY id"
+        )
+        return (self._to_entity(row) for row in rows)
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[BankAccount]:
+        self._check_limit(limit)
+        rows = self.connection.execute(
+            "SELECT id, name, balance FROM accounts WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id if after_id is not None else -1, limit),
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def get_by_id(self, id: int) -> Optional[BankAccount]:
+        row = self.connection.execute(
+            "SELECT id, name, balance FROM accounts WHERE id = ?", (id,)
+        ).fetchone()
+        return self._to_entity(row) if row else None
+
+    def get_by_ids(self, ids: Iterable[int]) -> Dict[int, BankAccount]:
+        rows = _select_by_ids(
+            self.connection,
+            "SELECT id, name, balance FROM accounts WHERE id IN ({})",
+            ids,
+        )
+        return {row[0]: self._to_entity(row) for row in rows}
+
+    def add(self, entity: BankAccount) -> BankAccount:
+        id = entity.id if entity.id else None
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                "INSERT OR REPLACE INTO accounts (id, name, balance) VALUES (?, ?, ?)",
+                (id, entity.name, str(entity.balance)),
+            )
+        entity.id = cursor.lastrowid
+        return entity
+
+    def update(self, entity: BankAccount) -> BankAccount:
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                "UPDATE accounts SET name = ?, balance = ? WHERE id = ?",
+                (entity.name, str(entity.balance), entity.id),
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Счет с ID {entity.id} не найден")
+        return entity
+
+    def delete(self, id: int) -> None:
+        with self.database.transaction():
+            cursor = self.connection.execute("DELETE FROM accounts WHERE id = ?", (id,))
+        if cursor.rowcount == 0:
+            raise ValueError(f"Счет с ID {id} не найден")
+
+    def _to_entity(self, row) -> BankAccount:
+        return BankAccount(row[0], row[1], Decimal(row[2]))
+
+
+class SQLiteCategoryRepository(Repository):
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+        self.connection = database.connection
+
+    def transaction(self):
+        return self.database.transaction()
+
+    def get_all(self) -> List[Category]:
+        rows = self.connection.execute(
+            "SELECT id, name, type FROM categories ORDER BY id"
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def iter_all(self) -> Iterator[Category]:
+        rows = self.connection.execute(
+            "SELECT id, name, type FROM categories ORDER BY id"
+        )
+        return (self._to_entity(row) for row in rows)
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[Category]:
+        self._check_limit(limit)
+        rows = self.connection.execute(
+            "SELECT id, name, type FROM categories WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id if after_id is not None else -1, limit),
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def get_by_id(self, id: int) -> Optional[Category]:
+        row = self.connection.execute(
+            "SELECT id, name, type FROM categories WHERE id = ?", (id,)
+        ).fetchone()
+        return self._to_entity(row) if row else None
+
+    def get_by_ids(self, ids: Iterable[int]) -> Dict[int, Category]:
+        rows = _select_by_ids(
+            self.connection,
+            "SELECT id, name, type FROM categories WHERE id IN ({})",
+            ids,
+        )
+        return {row[0]: self._to_entity(row) for row in rows}
+
+    def add(self, entity: Category) -> Category:
+        id = entity.id if entity.id else None
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                "INSERT OR REPLACE INTO categories (id, name, type) VALUES (?, ?, ?)",
+                (id, entity.name, entity.type.value),
+            )
+        entity.id = cursor.lastrowid
+        return entity
+
+    def update(self, entity: Category) -> Category:
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                "UPDATE categories SET name = ?, type = ? WHERE id = ?",
+                (entity.name, entity.type.value, entity.id),
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Категория с ID {entity.id} не найдена")
+        return entity
+
+    def delete(self, id: int) -> None:
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                "DELETE FROM categories WHERE id = ?", (id,)
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Категория с ID {id} не найдена")
+
+    def _to_entity(self, row) -> Category:
+        return Category(row[0], row[1], TransactionType(row[2]))
+
+
+class SQLiteOperationRepository(Repository):
+    COLUMNS = "id, type, bank_account_id, amount, date, category_id, description"
+
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+        self.connection = database.connection
+
+    def transaction(self):
+        return self.database.transaction()
+
+    def get_all(self) -> List[Operation]:
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM operations ORDER BY id"
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def iter_all(self) -> Iterator[Operation]:
+        # Строки читаются курсором по мере обхода, без промежуточного списка
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM operations ORDER BY id"
+        )
+        return (self._to_entity(row) for row in rows)
+
+    def page(
+        self, after_id: Optional[int] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[Operation]:
+        self._check_limit(limit)
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM operations WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id if after_id is not None else -1, limit),
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def get_by_id(self, id: int) -> Optional[Operation]:
+        row = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM operations WHERE id = ?", (id,)
+        ).fetchone()
+        return self._to_entity(row) if row else None
+
+    def get_stored(self, id: int) -> Optional[Operation]:
+        # Каждое чтение создает новый объект из строки таблицы
+        return self.get_by_id(id)
+
+    def get_by_period(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[Operation]:
+        """Возвращает операции за период [start_date, end_date], упорядоченные по дате"""
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM operations "
+            "WHERE date BETWEEN ? AND ? ORDER BY date, id",
+            (_format_date(start_date), _format_date(end_date)),
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def get_by_account(self, bank_account_id: int) -> List[Operation]:
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM operations "
+            "WHERE bank_account_id = ? ORDER BY id",
+            (bank_account_id,),
+        )
+        return [self._to_entity(row) for row in rows]
+
+    def get_account_balance(self, bank_account_id: int) -> Decimal:
+        """Возвращает баланс счета, рассчитанный по его операциям"""
+        rows = self.connection.execute(
+            "SELECT type, amount FROM operations WHERE bank_account_id = ?",
+            (bank_account_id,),
+        )
+        return self._signed_sum(rows)
+
+    def get_period_balance(self, start_date: datetime, end_date: datetime) -> Decimal:
+        """Возвращает разницу доходов и расходов за период [start_date, end_date]"""
+        rows = self.connection.execute(
+            "SELECT type, amount FROM operations WHERE date BETWEEN ? AND ?",
+            (_format_date(start_date), _format_date(end_date)),
+        )
+        return self._signed_sum(rows)
+
+    def get_category_totals(
+        self, start_date: datetime, end_date: datetime
+    ) -> Dict[int, List]:
+        """Возвращает [сумма со знаком, количество] по категориям за период"""
+        rows = self.connection.execute(
+            "SELECT category_id, type, amount FROM operations "
+            "WHERE date BETWEEN ? AND ? AND category_id IS NOT NULL "
+            "AND category_id != 0",
+            (_format_date(start_date), _format_date(end_date)),
+        )
+        totals = {}
+        for category_id, type, amount in rows:
+            entry = totals.get(category_id)
+            if entry is None:
+                entry = totals[category_id] = [Decimal("0.0"), 0]
+            if type == TransactionType.INCOME.value:
+                entry[0] += Decimal(amount)
+            else:
+                entry[0] -= Decimal(amount)
+            entry[1] += 1
+        return totals
+
+    def add(self, entity: Operation) -> Operation:
+        id = entity.id if entity.id else None
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                f"INSERT OR REPLACE INTO operations ({self.COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (id,) + self._to_row(entity),
+            )
+        entity.id = cursor.lastrowid
+        return entity
+
+    def add_many(self, entities: List[Operation]) -> List[Operation]:
+        """Добавляет пачку операций одной транзакцией через executemany"""
+        with self.database.transaction():
+            new_entities = [e for e in entities if e.id is None or e.id == 0]
+            if new_entities:
+                (max_id,) = self.connection.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM operations"
+                ).fetchone()
+                for offset, entity in enumerate(new_entities, start=1):
+                    entity.id = max_id + offset
+
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO operations ({self.COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(entity.id,) + self._to_row(entity) for entity in entities],
+            )
+        return entities
+
+    def update(self, entity: Operation) -> Operation:
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                "UPDATE operations SET type = ?, bank_account_id = ?, amount = ?, "
+                "date = ?, category_id = ?, description = ? WHERE id = ?",
+                self._to_row(entity) + (entity.id,),
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Операция с ID {entity.id} не найдена")
+        return entity
+
+    def delete(self, id: int) -> None:
+        with self.database.transaction():
+            cursor = self.connection.execute(
+                "DELETE FROM operations WHERE id = ?", (id,)
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Операция с ID {id} не найдена")
+
+    def _signed_sum(self, rows) -> Decimal:
+        total = Decimal("0.0")
+        for type, amount in rows:
+            if type == TransactionType.INCOME.value:
+                total += Decimal(amount)
+            else:
+                total -= Decimal(amount)
+        return total
+
+    def _to_row(self, entity: Operation) -> tuple:
+        return (
+            entity.type.value,
+            entity.bank_account_id,
+            str(entity.amount),
+            _format_date(entity.date),
+            entity.category_id,
+            entity.description,
+        )
+
+    def _to_entity(self, row) -> Operation:
+        return Operation(
+            row[0],
+            TransactionType(row[1]),
+            row[2],
+            Decimal(row[3]),
+            datetime.fromisoformat(row[4]),
+            row[5],
+            row[6],
+        )
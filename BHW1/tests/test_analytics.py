@@ -1,7 +1,17 @@
+import random
+from unittest.mock import patch
 from decimal import Decimal
 from datetime import datetime, timedelta
 
-from analytics import AnalyticsService
+import pytest
+from analytics import (
+    AnalyticsResultCache,
+    AnalyticsService,
+    RollupEngine,
+)
+from columnar import ColumnarOperationRepository
+from facades import OperationFacade
+from validators import OperationValidator
 from repositories import (
     InMemoryBankAccountRepository,
     InMemoryCategoryRepository,
@@ -191,3 +201,411 @@ class TestAnalyticsServiceExtended:
             if account.id == self.account1.id:
                 assert old_balance == Decimal("2000")
                 break
+
+
+class TestGroupByCategoryRollups:
+    def setup_method(self):
+        self.operation_repo = InMemoryOperationRepository()
+        self.category_repo = InMemoryCategoryRepository()
+        self.account_repo = InMemoryBankAccountRepository()
+        self.rollups = RollupEngine()
+        self.facade = OperationFacade(
+            self.operation_repo,
+            OperationValidator(),
+            self.account_repo,
+            rollups=self.rollups,
+        )
+        self.analytics = AnalyticsService(
+            self.operation_repo,
+            self.category_repo,
+            self.account_repo,
+            rollups=self.rollups,
+        )
+        self.scan_analytics = AnalyticsService(
+            self.operation_repo, self.category_repo, self.account_repo
+        )
+
+        self.account = self.account_repo.add(
+            BankAccount(0, "Account", Decimal("1000000"))
+        )
+        self.salary = self.category_repo.add(
+            Category(0, "Salary", TransactionType.INCOME)
+        )
+        self.food = self.category_repo.add(Category(0, "Food", TransactionType.EXPENSE))
+
+    def test_invalid_slots(self):
+        with pytest.raises(ValueError):
+            RollupEngine(resolutions=("quarter",))
+        with pytest.raises(ValueError):
+            RollupEngine(dimensions=("currency",))
+
+        engine = RollupEngine(resolutions=("month",), dimensions=("category",))
+        with pytest.raises(ValueError):
+            engine.query("day", "category", datetime(2023, 1, 1), datetime(2023, 1, 2))
+
+    def test_group_by_category_uses_buckets_and_edges(self):
+        self.facade.create_operation(
+            TransactionType.INCOME,
+            self.account.id,
+            Decimal("1000"),
+            datetime(2023, 1, 1, 9),
+            self.salary.id,
+        )
+        self.facade.create_operation(
+            TransactionType.EXPENSE,
+            self.account.id,
+            Decimal("200"),
+            datetime(2023, 1, 5, 12),
+            self.food.id,
+        )
+        late = self.facade.create_operation(
+            TransactionType.EXPENSE,
+            self.account.id,
+            Decimal("50"),
+            datetime(2023, 1, 10, 18),
+            self.food.id,
+        )
+
+        result = self.analytics.group_by_category(
+            datetime(2023, 1, 1, 10), datetime(2023, 1, 10, 18)
+        )
+        assert result == {"Food": Decimal("-250")}
+
+        late.date = datetime(2023, 2, 1)
+        self.facade.update_operation(late)
+        result = self.analytics.group_by_category(
+            datetime(2023, 1, 1), datetime(2023, 1, 31, 23, 59, 59)
+        )
+        assert result == {"Salary": Decimal("1000"), "Food": Decimal("-200")}
+
+        self.facade.delete_operation(late.id)
+        assert (
+            self.analytics.group_by_category(
+                datetime(2023, 2, 1), datetime(2023, 2, 28)
+            )
+            == {}
+        )
+
+    def test_whole_buckets_skip_repository(self):
+        self.facade.create_operation(
+            TransactionType.INCOME,
+            self.account.id,
+            Decimal("10"),
+            datetime(2023, 6, 1),
+            self.salary.id,
+        )
+
+        with patch.object(
+            self.operation_repo,
+            "get_category_totals",
+            wraps=self.operation_repo.get_category_totals,
+        ) as scan:
+            result = self.analytics.group_by_category(
+                datetime(2022, 1, 1), datetime(2024, 2, 29, 23, 59, 59, 999999)
+            )
+
+        assert result == {"Salary": Decimal("10")}
+        # Два полных года и два полных месяца: репозиторий не сканируется
+        assert scan.call_count == 0
+
+    def test_matches_full_scan(self):
+        rng = random.Random(7)
+        base = datetime(2022, 1, 1)
+        categories = [self.salary.id, self.food.id, None]
+        created = []
+        for _ in range(300):
+            created.append(
+                self.facade.create_operation(
+                    TransactionType.INCOME,
+                    self.account.id,
+                    Decimal(rng.randint(1, 1000)),
+                    base + timedelta(hours=rng.randint(0, 24 * 1200)),
+                    rng.choice(categories),
+                )
+            )
+        for operation in rng.sample(created, 50):
+            operation.category_id = rng.choice(categories)
+            operation.date = base + timedelta(hours=rng.randint(0, 24 * 1200))
+            self.facade.update_operation(operation)
+        for operation in rng.sample(created, 30):
+            self.facade.delete_operation(operation.id)
+            created.remove(operation)
+
+        for _ in range(30):
+            start = base + timedelta(hours=rng.randint(-48, 24 * 1200))
+            end = start + timedelta(hours=rng.randint(0, 24 * 900))
+            assert self.analytics.group_by_category(
+                start, end
+            ) == self.scan_analytics.group_by_category(start, end)
+
+
+class TestRollupEngine:
+    def setup_method(self):
+        self.operation_repo = InMemoryOperationRepository()
+        self.category_repo = InMemoryCategoryRepository()
+        self.account_repo = InMemoryBankAccountRepository()
+        self.rollups = RollupEngine()
+        self.facade = OperationFacade(
+            self.operation_repo,
+            OperationValidator(),
+            self.account_repo,
+            rollups=self.rollups,
+        )
+        self.analytics = AnalyticsService(
+            self.operation_repo,
+            self.category_repo,
+            self.account_repo,
+            rollups=self.rollups,
+        )
+        self.scan_analytics = AnalyticsService(
+            self.operation_repo, self.category_repo, self.account_repo
+        )
+
+        self.account = self.account_repo.add(
+            BankAccount(0, "Account", Decimal("1000000"))
+        )
+        self.card = self.account_repo.add(BankAccount(0, "Card", Decimal("1000000")))
+        self.salary = self.category_repo.add(
+            Category(0, "Salary", TransactionType.INCOME)
+        )
+        self.food = self.category_repo.add(Category(0, "Food", TransactionType.EXPENSE))
+
+    def test_bucket_keys(self):
+        date = datetime(2024, 3, 14, 15, 9)
+        assert self.rollups.bucket_start(
+            "week", self.rollups.bucket_key("week", date)
+        ) == datetime(2024, 3, 11)
+        assert self.rollups.bucket_start(
+            "month", self.rollups.bucket_key("month", date)
+        ) == datetime(2024, 3, 1)
+        assert self.rollups.bucket_end("year", 2024) == datetime(
+            2024, 12, 31, 23, 59, 59, 999999
+        )
+        assert self.rollups.bucket_end("year", 9999) == datetime.max
+
+        with pytest.raises(ValueError):
+            self.rollups.bucket_key("quarter", date)
+        with pytest.raises(ValueError):
+            self.rollups.query("month", "currency", date, date)
+
+    def test_update_and_remove_use_previous_version(self):
+        engine = RollupEngine(resolutions=("month",), dimensions=("account",))
+        operation = Operation(
+            1, TransactionType.INCOME, 1, Decimal("10"), datetime(2023, 1, 5)
+        )
+        engine.add(operation)
+
+        moved = Operation(
+            1, TransactionType.EXPENSE, 2, Decimal("4"), datetime(2023, 2, 5)
+        )
+        engine.update(operation, moved)
+        assert engine.totals("month", "account", 0, 10**6) == {2: [Decimal("-4"), 1]}
+
+        engine.remove(moved)
+        assert engine.totals("month", "account", 0, 10**6) == {}
+
+    def test_rollup_rows_follow_writes(self):
+        self.facade.create_operation(
+            TransactionType.INCOME,
+            self.account.id,
+            Decimal("1000"),
+            datetime(2023, 1, 1, 9),
+            self.salary.id,
+        )
+        lunch = self.facade.create_operation(
+            TransactionType.EXPENSE,
+            self.account.id,
+            Decimal("200.50"),
+            datetime(2023, 1, 5, 12),
+            self.food.id,
+        )
+        self.facade.create_operation(
+            TransactionType.EXPENSE,
+            self.card.id,
+            Decimal("50"),
+            datetime(2023, 2, 10),
+        )
+
+        rows = self.analytics.rollup(
+            "month", "category", datetime(2023, 1, 15), datetime(2023, 2, 1)
+        )
+        assert rows == [
+            {
+                "id": self.food.id,
+                "name": "Food",
+                "period": datetime(2023, 1, 1),
+                "income": Decimal("0"),
+                "expense": Decimal("200.50"),
+                "net": Decimal("-200.50"),
+                "count": 1,
+            },
+            {
+                "id": self.salary.id,
+                "name": "Salary",
+                "period": datetime(2023, 1, 1),
+                "income": Decimal("1000"),
+                "expense": Decimal("0"),
+                "net": Decimal("1000"),
+                "count": 1,
+            },
+            {
+                "id": None,
+                "name": "Без категории",
+                "period": datetime(2023, 2, 1),
+                "income": Decimal("0"),
+                "expense": Decimal("50"),
+                "net": Decimal("-50"),
+                "count": 1,
+            },
+        ]
+
+        lunch.bank_account_id = self.card.id
+        lunch.date = datetime(2023, 2, 11)
+        self.facade.update_operation(lunch)
+        rows = self.analytics.rollup(
+            "year", "account", datetime(2023, 1, 1), datetime(2023, 12, 31)
+        )
+        assert [(row["name"], row["net"], row["count"]) for row in rows] == [
+            ("Account", Decimal("1000"), 1),
+            ("Card", Decimal("-250.50"), 2),
+        ]
+
+        self.facade.delete_operation(lunch.id)
+        rows = self.analytics.rollup(
+            "week", "account", datetime(2023, 2, 6), datetime(2023, 2, 12)
+        )
+        assert [(row["name"], row["period"], row["count"]) for row in rows] == [
+            ("Card", datetime(2023, 2, 6), 1)
+        ]
+
+    @pytest.mark.parametrize("resolution", RollupEngine.RESOLUTIONS)
+    @pytest.mark.parametrize("dimension", RollupEngine.DIMENSIONS)
+    def test_matches_full_scan(self, resolution, dimension):
+        rng = random.Random(11)
+        base = datetime(2021, 1, 1)
+        accounts = [self.account.id, self.card.id]
+        categories = [self.salary.id, self.food.id, None]
+        created = []
+        for _ in range(300):
+            created.append(
+                self.facade.create_operation(
+                    rng.choice([TransactionType.INCOME, TransactionType.EXPENSE]),
+                    rng.choice(accounts),
+                    Decimal(rng.randint(1, 100000)) / 100,
+                    base + timedelta(hours=rng.randint(0, 24 * 1000)),
+                    rng.choice(categories),
+                )
+            )
+        for operation in rng.sample(created, 50):
+            operation.category_id = rng.choice(categories)
+            operation.date = base + timedelta(hours=rng.randint(0, 24 * 1000))
+            self.facade.update_operation(operation)
+        for operation in rng.sample(created, 30):
+            self.facade.delete_operation(operation.id)
+
+        for _ in range(10):
+            start = base + timedelta(hours=rng.randint(-48, 24 * 1000))
+            end = start + timedelta(hours=rng.randint(0, 24 * 400))
+            assert self.analytics.rollup(
+                resolution, dimension, start, end
+            ) == self.scan_analytics.rollup(resolution, dimension, start, end)
+
+
+class TestAnalyticsResultCache:
+    def setup_method(self):
+        self.operation_repo = InMemoryOperationRepository()
+        self.category_repo = InMemoryCategoryRepository()
+        self.account_repo = InMemoryBankAccountRepository()
+        self.cache = AnalyticsResultCache()
+        self.facade = OperationFacade(
+            self.operation_repo,
+            OperationValidator(),
+            self.account_repo,
+            analytics_cache=self.cache,
+        )
+        self.analytics = AnalyticsService(
+            self.operation_repo,
+            self.category_repo,
+            self.account_repo,
+            result_cache=self.cache,
+        )
+
+        self.account = self.account_repo.add(
+            BankAccount(0, "Account", Decimal("1000000"))
+        )
+        self.salary = self.category_repo.add(
+            Category(0, "Salary", TransactionType.INCOME)
+        )
+        self.january = (datetime(2023, 1, 1), datetime(2023, 1, 31))
+        self.march = (datetime(2023, 3, 1), datetime(2023, 3, 31))
+
+    def create(self, amount, date):
+        return self.facade.create_operation(
+            TransactionType.INCOME,
+            self.account.id,
+            Decimal(amount),
+            date,
+            self.salary.id,
+        )
+
+    def test_repeated_report_is_served_from_cache(self):
+        self.create("100", datetime(2023, 1, 10))
+
+        assert self.analytics.calculate_balance_for_period(*self.january) == Decimal(
+            "100"
+        )
+        assert self.analytics.calculate_balance_for_period(*self.january) == Decimal(
+            "100"
+        )
+        assert self.cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_write_invalidates_only_overlapping_ranges(self):
+        self.create("100", datetime(2023, 1, 10))
+        self.analytics.calculate_balance_for_period(*self.january)
+        self.analytics.group_by_category(*self.january)
+        self.analytics.calculate_balance_for_period(*self.march)
+
+        self.create("50", datetime(2023, 3, 5))
+
+        assert ("balance",) + self.january in self.cache.entries
+        assert ("by_category",) + self.january in self.cache.entries
+        assert ("balance",) + self.march not in self.cache.entries
+        assert self.analytics.calculate_balance_for_period(*self.march) == Decimal("50")
+
+    def test_update_and_delete_invalidate_previous_date(self):
+        # Колоночное хранилище отдает копии, поэтому прежняя дата известна
+        self.operation_repo = ColumnarOperationRepository()
+        self.facade.repository = self.operation_repo
+        self.analytics.operation_repository = self.operation_repo
+
+        operation = self.create("100", datetime(2023, 1, 10))
+        self.analytics.group_by_category(*self.january)
+        self.analytics.group_by_category(*self.march)
+
+        moved = self.facade.get_operation(operation.id)
+        moved.date = datetime(2023, 3, 10)
+        self.facade.update_operation(moved)
+        assert self.analytics.group_by_category(*self.january) == {}
+        assert self.analytics.group_by_category(*self.march) == {
+            "Salary": Decimal("100")
+        }
+
+        self.facade.delete_operation(operation.id)
+        assert self.analytics.group_by_category(*self.march) == {}
+
+    def test_in_place_update_clears_cache(self):
+        operation = self.create("100", datetime(2023, 1, 10))
+        self.analytics.calculate_balance_for_period(*self.march)
+
+        operation.date = datetime(2023, 3, 10)
+        self.facade.update_operation(operation)
+        assert self.analytics.calculate_balance_for_period(*self.march) == Decimal(
+            "100"
+        )
+
+    def test_returned_report_is_a_copy(self):
+        self.create("100", datetime(2023, 1, 10))
+        self.analytics.group_by_category(*self.january)["Salary"] = Decimal("0")
+        assert self.analytics.group_by_category(*self.january) == {
+            "Salary": Decimal("100")
+        }
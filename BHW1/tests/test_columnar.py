@@ -0,0 +1,162 @@
+import random
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+import pytest
+
+import columnar
+from analytics import AnalyticsService
+from columnar import ColumnarOperationRepository
+from repositories import InMemoryCategoryRepository, InMemoryOperationRepository
+from models import Category, Operation, TransactionType
+
+
+@pytest.fixture(params=["numpy", "python"])
+def repository(request, monkeypatch):
+    if request.param == "numpy":
+        if columnar.np is None:
+            pytest.skip("numpy не установлен")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+    return ColumnarOperationRepository()
+
+
+class TestColumnarOperationRepository:
+    def test_add_and_get_by_id(self, repository):
+        date = datetime(2023, 1, 1, 12, 30, 15, 250)
+        added = repository.add(
+            Operation(0, TransactionType.EXPENSE, 3, Decimal("10.50"), date, 7, "Кофе")
+        )
+
+        view = repository.get_by_id(added.id)
+
+        assert added.id == 1
+        assert view is not added
+        assert view.type == TransactionType.EXPENSE
+        assert view.bank_account_id == 3
+        assert view.amount == Decimal("10.50")
+        assert view.date == date
+        assert view.category_id == 7
+        assert view.description == "Кофе"
+        assert repository.get_by_id(999) is None
+
+    def test_rejects_unrepresentable_amount(self, repository):
+        with pytest.raises(ValueError):
+            repository.add(
+                Operation(
+                    0, TransactionType.INCOME, 1, Decimal("0.001"), datetime.now()
+                )
+            )
+        assert repository.get_all() == []
+
+    def test_update_and_delete(self, repository):
+        first = repository.add(
+            Operation(
+                0, TransactionType.INCOME, 1, Decimal("100"), datetime(2023, 1, 1)
+            )
+        )
+        second = repository.add(
+            Operation(
+                0, TransactionType.EXPENSE, 1, Decimal("40"), datetime(2023, 1, 2)
+            )
+        )
+
+        view = repository.get_by_id(first.id)
+        view.amount = Decimal("150")
+        repository.update(view)
+        assert repository.get_account_balance(1) == Decimal("110")
+
+        repository.delete(first.id)
+        assert repository.get_by_id(first.id) is None
+        assert repository.get_by_id(second.id).amount == Decimal("40")
+        assert repository.get_account_balance(1) == Decimal("-40")
+
+        with pytest.raises(ValueError):
+            repository.delete(first.id)
+        with pytest.raises(ValueError):
+            repository.update(view)
+
+    def test_page_follows_ids_after_row_moves(self, repository):
+        for day in (3, 1, 2, 4):
+            repository.add(
+                Operation(
+                    0, TransactionType.INCOME, 1, Decimal(day), datetime(2023, 1, day)
+                )
+            )
+        # Последняя строка переезжает на место удаленной
+        repository.delete(1)
+
+        assert [op.id for op in repository.page(limit=2)] == [2, 3]
+        assert [op.amount for op in repository.page(after_id=3)] == [Decimal("4")]
+        assert sorted(op.id for op in repository.iter_all()) == [2, 3, 4]
+
+    def test_matches_in_memory_repository(self, repository):
+        reference = InMemoryOperationRepository()
+        rng = random.Random(3)
+        base = datetime(2023, 1, 1)
+
+        batch = []
+        for _ in range(400):
+            operation_args = (
+                rng.choice([TransactionType.INCOME, TransactionType.EXPENSE]),
+                rng.randint(1, 4),
+                Decimal(rng.randint(1, 100000)) / 100,
+                base + timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+                rng.choice([None, 1, 2, 3]),
+            )
+            batch.append(Operation(0, *operation_args))
+            reference.add(Operation(0, *operation_args))
+        repository.add_many(batch)
+
+        for id in rng.sample(range(1, 401), 60):
+            repository.delete(id)
+            reference.delete(id)
+
+        for _ in range(20):
+            start = base + timedelta(minutes=rng.randint(-1000, 60 * 24 * 90))
+            end = start + timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+            assert repository.get_period_balance(
+                start, end
+            ) == reference.get_period_balance(start, end)
+            assert repository.get_category_totals(
+                start, end
+            ) == reference.get_category_totals(start, end)
+            assert [op.id for op in repository.get_by_period(start, end)] == [
+                op.id for op in reference.get_by_period(start, end)
+            ]
+
+        for account_id in range(1, 6):
+            assert repository.get_account_balance(
+                account_id
+            ) == reference.get_account_balance(account_id)
+            assert [op.id for op in repository.get_by_account(account_id)] == [
+                op.id for op in reference.get_by_account(account_id)
+            ]
+
+    def test_analytics_service(self, repository):
+        category_repo = InMemoryCategoryRepository()
+        food = category_repo.add(Category(0, "Food", TransactionType.EXPENSE))
+        analytics = AnalyticsService(repository, category_repo)
+
+        repository.add(
+            Operation(
+                0, TransactionType.INCOME, 1, Decimal("100"), datetime(2023, 1, 1)
+            )
+        )
+        repository.add(
+            Operation(
+                0,
+                TransactionType.EXPENSE,
+                1,
+                Decimal("30.25"),
+                datetime(2023, 1, 2),
+                food.id,
+            )
+        )
+
+        assert analytics.calculate_balance_for_period(
+            datetime(2023, 1, 1), datetime(2023, 1, 31)
+        ) == Decimal("69.75")
+        assert analytics.group_by_category(
+            datetime(2023, 1, 1), datetime(2023, 1, 31)
+        ) == {"Food": Decimal("-30.25")}
@@ -278,10 +278,9 @@ class TestConsoleAppCore:
             2, TransactionType.EXPENSE, 1, Decimal("500"), datetime.now(), 2, "Food"
         )
 
-        self.app.container.operation_facade.get_all_operations.return_value = [
-            operation1,
-            operation2,
-        ]
+        self.app.container.operation_query_service.iter_pages.return_value = iter(
+            [[{"id": operation1.id}], [{"id": operation2.id}]]
+        )
 
         mock_input.return_value = "operations.csv"
 
@@ -294,7 +293,10 @@ class TestConsoleAppCore:
         with patch("builtins.open", mock_open):
             self.app.export_operations(format_type="csv")
 
-        self.app.container.operation_facade.get_all_operations.assert_called_once()
+        self.app.container.operation_query_service.iter_pages.assert_called_once()
+        records, stream = self.app.container.csv_exporter.export_to_stream.call_args[0]
+        assert stream is mock_file
+        assert [record["id"] for record in records] == [1, 2]
 
         assert mock_print.call_count > 0
         assert any("успешно" in str(call).lower() for call in mock_print.call_args_list)
@@ -302,10 +304,9 @@ class TestConsoleAppCore:
     @patch("builtins.input")
     @patch("builtins.print")
     def test_export_operations_invalid_format(self, mock_print, mock_input):
-        self.app.container.operation_facade.get_all_operations.return_value = [
-            MagicMock(),
-            MagicMock(),
-        ]
+        self.app.container.operation_query_service.iter_pages.return_value = iter(
+            [[{"id": 1}, {"id": 2}]]
+        )
 
         mock_input.return_value = "operations.csv"
 
@@ -342,24 +343,15 @@ class TestConsoleAppCore:
             }
         ]
 
-        self.app.container.csv_importer.import_data.return_value = test_data
+        self.app.container.import_pipeline.run.return_value.rejected = []
 
         with patch("builtins.open", return_value=mock_file):
-            original_method = self.app.import_operations
-
-            def wrapper(format_type="csv"):
-                original_method(format_type)
-                if not self.app.container.operation_facade.import_operations.called:
-                    self.app.container.operation_facade.import_operations(test_data)
-
-            self.app.import_operations = wrapper
-
             self.app.import_operations(format_type="csv")
 
-            self.app.import_operations = original_method
-
-            self.app.container.csv_importer.import_data.assert_called_once()
-            self.app.container.operation_facade.import_operations.assert_called_once()
+            self.app.container.import_pipeline.run.assert_called_once_with(
+                self.app.container.csv_importer, "test.csv", on_message=print
+            )
+            self.app.container.csv_importer.import_data.assert_not_called()
 
     @patch("os.path.exists")
     @patch("builtins.input")
@@ -377,23 +369,23 @@ class TestConsoleAppCore:
     @patch("builtins.input")
     @patch("builtins.print")
     def test_export_operations_json(self, mock_print, mock_input):
-        self.app.container.operation_facade.get_all_operations.return_value = [
-            MagicMock(
-                id=1,
-                type=TransactionType.INCOME,
-                bank_account_id=1,
-                amount=Decimal("1000"),
-                date=datetime.now(),
-                category_id=None,
-                description="Test",
-            )
-        ]
-
-        account = MagicMock(id=1, name="Основной счет")
-        self.app.container.bank_account_repository.get_by_id.return_value = account
-
-        category = MagicMock(id=1, name="Тестовая категория")
-        self.app.container.category_repository.get_by_id.return_value = category
+        self.app.container.operation_query_service.iter_pages.return_value = iter(
+            [
+                [
+                    {
+                        "id": 1,
+                        "type": TransactionType.INCOME,
+                        "account_name": "Основной счет",
+                        "account_id": 1,
+                        "amount": Decimal("1000"),
+                        "category_name": "Без категории",
+                        "category_id": None,
+                        "date": datetime.now(),
+                        "description": "Test",
+                    }
+                ]
+            ]
+        )
 
         mock_input.return_value = "operations.json"
         self.app.container.json_exporter.export_data.return_value = "{}"
@@ -406,20 +398,23 @@ class TestConsoleAppCore:
     @patch("builtins.input")
     @patch("builtins.print")
     def test_export_operations_yaml(self, mock_print, mock_input):
-        self.app.container.operation_facade.get_all_operations.return_value = [
-            MagicMock(
-                id=1,
-                type=TransactionType.INCOME,
-                bank_account_id=1,
-                amount=Decimal("1000"),
-                date=datetime.now(),
-                category_id=None,
-                description="Test",
-            )
-        ]
-
-        account = MagicMock(id=1, name="Основной счет")
-        self.app.container.bank_account_repository.get_by_id.return_value = account
+        self.app.container.operation_query_service.iter_pages.return_value = iter(
+            [
+                [
+                    {
+                        "id": 1,
+                        "type": TransactionType.INCOME,
+                        "account_name": "Основной счет",
+                        "account_id": 1,
+                        "amount": Decimal("1000"),
+                        "category_name": "Без категории",
+                        "category_id": None,
+                        "date": datetime.now(),
+                        "description": "Test",
+                    }
+                ]
+            ]
+        )
 
         mock_input.return_value = "operations.yaml"
         self.app.container.yaml_exporter.export_data.return_value = "---"
@@ -429,6 +424,46 @@ class TestConsoleAppCore:
 
         assert mock_print.call_count > 0, "Ничего не было напечатано"
 
+    @patch("builtins.print")
+    def test_list_operations(self, mock_print):
+        self.app.container.operation_query_service.iter_pages.return_value = iter(
+            [
+                [
+                    {
+                        "id": 1,
+                        "type": TransactionType.EXPENSE,
+                        "account_name": "Основной счет",
+                        "account_id": 1,
+                        "amount": Decimal("12.50"),
+                        "category_name": "Еда",
+                        "category_id": 2,
+                        "date": datetime(2024, 1, 2, 3, 4, 5, 678),
+                        "description": "Обед",
+                    }
+                ]
+            ]
+        )
+
+        self.app.list_operations()
+
+        printed = [str(call) for call in mock_print.call_args_list]
+        assert any(
+            "Счет: Основной счет" in line
+            and "Категория: Еда" in line
+            and "Дата: 2024-01-02 03:04:05" in line
+            for line in printed
+        )
+        assert any("Описание: Обед" in line for line in printed)
+        self.app.container.category_repository.get_by_id.assert_not_called()
+
+    @patch("builtins.print")
+    def test_list_operations_empty(self, mock_print):
+        self.app.container.operation_query_service.iter_pages.return_value = iter([])
+
+        self.app.list_operations()
+
+        assert any("пуст" in str(call) for call in mock_print.call_args_list)
+
     @patch("builtins.input")
     @patch("builtins.print")
     def test_check_account_balances(self, mock_print, mock_input):
@@ -448,6 +483,39 @@ class TestConsoleAppCore:
 
         assert mock_print.call_count > 0, "Ничего не было напечатано"
 
+    @patch("builtins.input", side_effect=["3", "2", "2024-01-01", "2024-12-31"])
+    @patch("builtins.print")
+    def test_rollup_report(self, mock_print, mock_input):
+        self.app.container.analytics_service.rollup.return_value = [
+            {
+                "id": 1,
+                "name": "Еда",
+                "period": datetime(2024, 1, 1),
+                "income": Decimal("0"),
+                "expense": Decimal("150"),
+                "net": Decimal("-150"),
+                "count": 3,
+            }
+        ]
+
+        self.app.rollup_report()
+
+        self.app.container.analytics_service.rollup.assert_called_once_with(
+            "month",
+            "category",
+            datetime(2024, 1, 1),
+            datetime(2024, 12, 31, 23, 59, 59),
+        )
+        assert any("Еда" in str(call) for call in mock_print.call_args_list)
+
+    @patch("builtins.input", side_effect=["7"])
+    @patch("builtins.print")
+    def test_rollup_report_invalid_resolution(self, mock_print, mock_input):
+        self.app.rollup_report()
+
+        self.app.container.analytics_service.rollup.assert_not_called()
+        assert any("интервал" in str(call) for call in mock_print.call_args_list)
+
     @patch("builtins.input")
     @patch("builtins.print")
     def test_view_performance_stats(self, mock_print, mock_input):
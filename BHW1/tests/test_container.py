@@ -1,3 +1,5 @@
+import pytest
+
 from container import FinanceModuleContainer
 from repositories import (
     InMemoryBankAccountRepository,
@@ -7,11 +9,24 @@ from repositories import (
 from validators import BankAccountValidator, CategoryValidator, OperationValidator
 from facades import BankAccountFacade, CategoryFacade, OperationFacade
 from analytics import AnalyticsService
-from exporters import CSVExporter, JSONExporter, YAMLExporter
-from importers import CSVImporter, JSONImporter, YAMLImporter
+from exporters import (
+    ArrowExporter,
+    CSVExporter,
+    JSONExporter,
+    NDJSONExporter,
+    YAMLExporter,
+)
+from importers import (
+    ArrowImporter,
+    CSVImporter,
+    JSONImporter,
+    NDJSONImporter,
+    YAMLImporter,
+)
 from proxy import OperationRepositoryProxy
 from performance import PerformanceTracker
 from factories import EntityFactory
+from columnar import ColumnarOperationRepository
 
 
 class TestFinanceModuleContainer:
@@ -45,6 +60,10 @@ class TestFinanceModuleContainer:
         assert isinstance(container.csv_importer, CSVImporter)
         assert isinstance(container.json_importer, JSONImporter)
         assert isinstance(container.yaml_importer, YAMLImporter)
+        assert isinstance(container.arrow_exporter, ArrowExporter)
+        assert isinstance(container.arrow_importer, ArrowImporter)
+        assert isinstance(container.ndjson_exporter, NDJSONExporter)
+        assert isinstance(container.ndjson_importer, NDJSONImporter)
 
         assert isinstance(container.performance_tracker, PerformanceTracker)
 
@@ -61,7 +80,10 @@ class TestFinanceModuleContainer:
             is container.bank_account_repository
         )
         assert container.category_facade.repository is container.category_repository
-        assert container.operation_facade.repository is container.operation_repository
+        assert (
+            container.operation_facade.repository
+            is container.operation_repository_proxy
+        )
 
         assert (
             container.bank_account_facade.validator is container.bank_account_validator
@@ -71,7 +93,7 @@ class TestFinanceModuleContainer:
 
         assert (
             container.analytics_service.operation_repository
-            is container.operation_repository
+            is container.operation_repository_proxy
         )
         assert (
             container.analytics_service.category_repository
@@ -81,3 +103,50 @@ class TestFinanceModuleContainer:
             container.analytics_service.account_repository
             is container.bank_account_repository
         )
+
+    def test_import_workers(self):
+        container = FinanceModuleContainer(import_workers=4)
+
+        assert container.csv_importer.workers == 4
+        assert container.json_importer.workers == 4
+        assert container.yaml_importer.workers == 4
+
+    def test_close_stops_import_pools(self):
+        container = FinanceModuleContainer(import_workers=2)
+        container.csv_importer.open()
+
+        container.close()
+
+        assert container.csv_importer._executor is None
+
+    def test_storage_selection(self):
+        container = FinanceModuleContainer(storage="columnar")
+
+        assert isinstance(container.operation_repository, ColumnarOperationRepository)
+        assert (
+            container.operation_facade.repository
+            is container.operation_repository_proxy
+        )
+        assert not container.operation_repository_proxy.keep_snapshot
+        assert FinanceModuleContainer().operation_repository_proxy.keep_snapshot
+
+        with pytest.raises(ValueError):
+            FinanceModuleContainer(storage="unknown")
+
+    def test_cache_policies(self):
+        uncached = FinanceModuleContainer(cache_policy="none")
+        assert uncached.operation_repository_proxy is None
+        assert uncached.operation_facade.repository is uncached.operation_repository
+
+        lru = FinanceModuleContainer(cache_policy="lru", cache_size=10)
+        assert lru.operation_repository_proxy.max_entries == 10
+        assert lru.operation_repository_proxy.ttl is None
+
+        ttl = FinanceModuleContainer(cache_policy="ttl", cache_ttl=5)
+        assert ttl.operation_repository_proxy.ttl == 5
+
+        write_through = FinanceModuleContainer(cache_policy="write-through")
+        assert write_through.operation_repository_proxy.write_through
+
+        with pytest.raises(ValueError):
+            FinanceModuleContainer(cache_policy="unknown")
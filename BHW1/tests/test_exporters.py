@@ -1,9 +1,12 @@
+import io
 import json
+import yaml
 from decimal import Decimal
 from datetime import datetime
 
 from models import TransactionType
-from exporters import CSVExporter, JSONExporter
+from exporters import CSVExporter, JSONExporter, YAMLExporter
+from importers import CSVImporter
 
 
 class TestCSVExporter:
@@ -43,4 +46,65 @@ class TestJSONExporter:
         assert parsed[0]["id"] == 1
         assert parsed[0]["type"] == "INCOME"
         assert parsed[0]["amount"] == "1000.0"
-        assert parsed[0]["date"] == "2023-01-01T12:00:00"
\ No newline at end of file
+        assert parsed[0]["date"] == "2023-01-01T12:00:00"
+
+
+def generate_records(count):
+    for i in range(count):
+        yield {
+            "id": i,
+            "type": TransactionType.EXPENSE,
+            "amount": Decimal("10.50"),
+            "date": datetime(2023, 1, 1, 12, 0, 0),
+            "category_id": None,
+        }
+
+
+class TestStreamingExport:
+    def test_csv_to_stream(self):
+        stream = io.StringIO()
+
+        count = CSVExporter().export_to_stream(generate_records(3), stream)
+
+        lines = stream.getvalue().split("\n")
+        assert count == 3
+        assert lines[0] == "id,type,amount,date,category_id"
+        assert lines[3] == "2,EXPENSE,10.50,2023-01-01T12:00:00,"
+
+    def test_csv_quoting_round_trip(self):
+        records = [
+            {"id": 1, "description": "Кофе, круассан"},
+            {"id": 2, "description": 'Подарок "на память"'},
+            {"id": 3, "description": "Строка 1\nСтрока 2"},
+        ]
+
+        exported = CSVExporter().export_data(records)
+        imported = CSVImporter().import_data(exported)
+
+        assert [item["description"] for item in imported] == [
+            record["description"] for record in records
+        ]
+
+    def test_json_stream_matches_dumps(self):
+        exporter = JSONExporter()
+        stream = io.StringIO()
+
+        exporter.export_to_stream(generate_records(3), stream)
+
+        expected = [exporter._prepare_item(r) for r in generate_records(3)]
+        assert stream.getvalue() == json.dumps(expected, indent=2)
+
+    def test_yaml_stream_matches_dump(self):
+        exporter = YAMLExporter()
+        stream = io.StringIO()
+
+        exporter.export_to_stream(generate_records(3), stream)
+
+        assert yaml.safe_load(stream.getvalue()) == [
+            exporter._prepare_item(r) for r in generate_records(3)
+        ]
+
+    def test_empty_stream(self):
+        assert CSVExporter().export_data([]) == ""
+        assert json.loads(JSONExporter().export_data([])) == []
+        assert yaml.safe_load(YAMLExporter().export_data([])) == []
@@ -10,7 +10,7 @@ from repositories import (
     InMemoryOperationRepository,
 )
 from validators import BankAccountValidator, CategoryValidator, OperationValidator
-from models import BankAccount, TransactionType
+from models import BankAccount, Operation, TransactionType
 
 
 class TestBankAccountFacade:
@@ -85,7 +85,7 @@ class TestBankAccountFacade:
             "Negative Balance Account", Decimal("-100.0")
         )
         assert account.balance == Decimal("-100.0")
-    
+
     def test_create_account_zero_balance(self):
         """Test creating an account with zero balance is valid."""
         account = self.facade.create_account("Zero Balance Account", Decimal("0.0"))
@@ -297,3 +297,103 @@ class TestOperationFacade:
         self.facade.delete_operation(operation.id)
 
         assert self.facade.get_operation(operation.id) is None
+
+    def test_create_operations_bulk(self):
+        second_account = self.account_repo.add(
+            BankAccount(0, "Second Account", Decimal("0.0"))
+        )
+        operations = [
+            Operation(
+                0,
+                TransactionType.EXPENSE,
+                self.test_account.id,
+                Decimal("400.0"),
+                datetime.now(),
+            ),
+            Operation(
+                0,
+                TransactionType.INCOME,
+                second_account.id,
+                Decimal("50.0"),
+                datetime.now(),
+            ),
+            Operation(
+                0,
+                TransactionType.EXPENSE,
+                self.test_account.id,
+                Decimal("600.0"),
+                datetime.now(),
+            ),
+        ]
+
+        created = self.facade.create_operations_bulk(operations)
+
+        assert [op.id for op in created] == [1, 2, 3]
+        assert self.operation_repo.next_id == 4
+        assert self.account_repo.get_by_id(self.test_account.id).balance == Decimal(
+            "0.0"
+        )
+        assert self.account_repo.get_by_id(second_account.id).balance == Decimal("50.0")
+
+    def test_create_operations_bulk_top_up(self):
+        top_ups = []
+        operations = [
+            Operation(
+                0,
+                TransactionType.EXPENSE,
+                self.test_account.id,
+                Decimal("1200.0"),
+                datetime.now(),
+            ),
+            Operation(
+                0,
+                TransactionType.INCOME,
+                self.test_account.id,
+                Decimal("30.0"),
+                datetime.now(),
+            ),
+        ]
+
+        self.facade.create_operations_bulk(
+            operations, on_top_up=lambda account, amount: top_ups.append(amount)
+        )
+
+        assert top_ups == [Decimal("200.0")]
+        assert self.account_repo.get_by_id(self.test_account.id).balance == Decimal(
+            "30.0"
+        )
+
+    def test_create_operations_bulk_is_atomic(self):
+        operations = [
+            Operation(
+                0,
+                TransactionType.INCOME,
+                self.test_account.id,
+                Decimal("100.0"),
+                datetime.now(),
+            ),
+            Operation(
+                0,
+                TransactionType.EXPENSE,
+                self.test_account.id,
+                Decimal("2000.0"),
+                datetime.now(),
+            ),
+        ]
+
+        with pytest.raises(ValueError):
+            self.facade.create_operations_bulk(operations)
+
+        with pytest.raises(ValueError):
+            self.facade.create_operations_bulk(
+                [
+                    Operation(
+                        0, TransactionType.INCOME, 999, Decimal("1.0"), datetime.now()
+                    )
+                ]
+            )
+
+        assert self.operation_repo.get_all() == []
+        assert self.account_repo.get_by_id(self.test_account.id).balance == Decimal(
+            "1000.0"
+        )
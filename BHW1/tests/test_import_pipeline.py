@@ -0,0 +1,296 @@
+import threading
+from decimal import Decimal
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from console_app import ConsoleApp
+from container import FinanceModuleContainer
+from import_pipeline import ImportPipeline
+from importers import CSVImporter
+from models import BankAccount, TransactionType
+
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / "operations.csv"
+    header = "type,bank_account_id,account_name,amount,category_id,category_name,date"
+    path.write_text("\n".join([header] + rows) + "\n", encoding="utf-8")
+    return path
+
+
+class TestImportPipeline:
+    def setup_method(self):
+        self.container = FinanceModuleContainer()
+
+    def make_pipeline(self, **kwargs):
+        return ImportPipeline(
+            self.container.bank_account_repository,
+            self.container.category_repository,
+            self.container.operation_facade,
+            self.container.entity_factory,
+            self.container.operation_validator,
+            **kwargs,
+        )
+
+    def test_imports_operations_with_accounts_and_categories(self, tmp_path):
+        path = write_csv(
+            tmp_path,
+            [
+                f"INCOME,1,Main,10.00,1,Salary,2023-01-{day:02d}T12:00:00"
+                for day in range(1, 26)
+            ]
+            + ["EXPENSE,2,Card,5.00,2,Food,2023-02-01T10:00:00"],
+        )
+        messages = []
+
+        result = self.make_pipeline(batch_size=4, queue_size=1).run(
+            CSVImporter(), path, on_message=messages.append
+        )
+
+        assert result.imported == 26
+        assert result.total == 26
+        assert sorted(result.accounts) == [1, 2]
+        assert sorted(result.categories) == [1, 2]
+        assert self.container.bank_account_facade.get_account(1).balance == Decimal(
+            "250.00"
+        )
+        # Расход без средств на счете сопровождается автоматическим пополнением
+        assert self.container.bank_account_facade.get_account(2).balance == 0
+        assert any("Автоматическое пополнение" in m for m in messages)
+
+    def test_stage_statistics(self, tmp_path):
+        path = write_csv(
+            tmp_path,
+            [f"INCOME,1,Main,1.00,,,2023-01-01T12:00:{i:02d}" for i in range(10)],
+        )
+
+        result = self.make_pipeline(batch_size=3, queue_size=1).run(CSVImporter(), path)
+
+        assert list(result.stages) == ["read", "prepare", "resolve", "insert"]
+        assert result.stages["read"]["batches"] == 4
+        assert result.stages["insert"]["records"] == 10
+        for stats in result.stages.values():
+            assert stats["max_queue_depth"] <= 1
+
+    def test_rejected_rows_are_counted(self, tmp_path):
+        path = write_csv(
+            tmp_path,
+            [
+                "INCOME,1,Main,1.00,,,2023-01-01T12:00:00",
+                "INCOME,1,Main,abc,,,2023-01-01T12:00:00",
+            ],
+        )
+
+        result = self.make_pipeline().run(CSVImporter(), path)
+
+        assert result.imported == 1
+        assert result.total == 2
+        assert [row for row, _, _ in result.rejected] == [2]
+
+    def test_invalid_operations_are_rejected(self, tmp_path):
+        path = write_csv(
+            tmp_path,
+            [
+                "INCOME,1,Main,1.00,,,2023-01-01T12:00:00",
+                "INCOME,1,Main,abc,,,2023-01-01T12:00:00",
+                "INCOME,1,Main,0,,,2023-01-01T12:00:00",
+                "INCOME,1,Main,1.005,,,2023-01-01T12:00:00",
+                "INCOME,,Main,2.00,,,2023-01-01T12:00:00",
+                "INCOME,0,Main,2.00,,,2023-01-01T12:00:00",
+                "EXPENSE,1,Main,0.50,,,2023-01-02T12:00:00",
+            ],
+        )
+
+        result = self.make_pipeline(batch_size=3).run(CSVImporter(), path)
+
+        assert result.imported == 2
+        assert result.total == 7
+        assert [row for row, _, _ in result.rejected] == [2, 3, 4, 5, 6]
+        assert result.rejected[3][2] == "Не указан ID счета"
+        # Запись без ID счета не создает новый счет
+        assert sorted(result.accounts) == [1]
+        assert len(self.container.bank_account_repository.get_all()) == 1
+
+    def test_existing_account_is_reused(self, tmp_path):
+        self.container.bank_account_repository.add(
+            BankAccount(7, "Existing", Decimal("100"))
+        )
+        path = write_csv(tmp_path, ["EXPENSE,7,Other,30.00,,,2023-01-01T12:00:00"])
+
+        result = self.make_pipeline().run(CSVImporter(), path)
+
+        assert result.accounts[7].name == "Existing"
+        assert self.container.bank_account_facade.get_account(7).balance == Decimal(
+            "70.00"
+        )
+
+    def test_stage_error_stops_pipeline(self, tmp_path):
+        path = write_csv(
+            tmp_path,
+            [f"INCOME,1,Main,1.00,,,2023-01-01T12:00:{i:02d}" for i in range(20)],
+        )
+        importer = CSVImporter()
+
+        def fail(batch):
+            raise RuntimeError("сбой подготовки")
+
+        importer.prepare_batch = fail
+
+        with pytest.raises(RuntimeError):
+            self.make_pipeline(batch_size=2, queue_size=1).run(importer, path)
+        assert self.container.operation_facade.get_all_operations() == []
+        assert threading.active_count() == 1
+
+    def test_failed_batch_is_rejected_without_top_up(self, tmp_path):
+        path = write_csv(
+            tmp_path,
+            [
+                "INCOME,1,Main,10.00,,,2023-01-01T12:00:00",
+                "EXPENSE,1,Main,30.00,,,2023-01-02T12:00:00",
+            ],
+        )
+        repository = self.container.operation_repository
+        add_many = repository.add_many
+        calls = []
+
+        def fail_second_batch(operations):
+            calls.append(operations)
+            if len(calls) == 2:
+                raise RuntimeError("сбой записи")
+            return add_many(operations)
+
+        messages = []
+        with patch.object(repository, "add_many", side_effect=fail_second_batch):
+            result = self.make_pipeline(batch_size=1).run(
+                CSVImporter(), path, on_message=messages.append
+            )
+
+        assert result.imported == 1
+        assert result.total == 2
+        assert [(row, error) for row, _, error in result.rejected] == [
+            (2, "сбой записи")
+        ]
+        assert self.container.bank_account_facade.get_account(1).balance == Decimal(
+            "10.00"
+        )
+        assert not any("Автоматическое пополнение" in m for m in messages)
+
+    def test_process_pool_lives_for_one_run(self, tmp_path):
+        path = write_csv(
+            tmp_path,
+            [f"INCOME,1,Main,1.00,,,2023-01-01T12:00:{i:02d}" for i in range(40)],
+        )
+        importer = CSVImporter(workers=2, chunk_size=5)
+        started = []
+        open_pool = importer.open
+
+        def record_open():
+            started.append(threading.active_count())
+            open_pool()
+
+        with patch.object(importer, "open", side_effect=record_open):
+            result = self.make_pipeline(batch_size=20).run(importer, path)
+
+        assert result.imported == 40
+        # Пул создан до запуска потоков конвейера и остановлен после него
+        assert started[0] == 1
+        assert importer._executor is None
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            self.make_pipeline(batch_size=0)
+        with pytest.raises(ValueError):
+            self.make_pipeline(queue_size=0)
+
+
+class TestImportPipelineSQLite:
+    def test_balances_across_batches(self, tmp_path):
+        container = FinanceModuleContainer(
+            storage="sqlite", database_path=str(tmp_path / "finance.db")
+        )
+        pipeline = ImportPipeline(
+            container.bank_account_repository,
+            container.category_repository,
+            container.operation_facade,
+            container.entity_factory,
+            container.operation_validator,
+            batch_size=1,
+        )
+        path = write_csv(
+            tmp_path,
+            [
+                "INCOME,1,Main,1000.00,,,2023-01-01T12:00:00",
+                "EXPENSE,1,Main,300.00,,,2023-01-02T12:00:00",
+                "EXPENSE,1,Main,800.00,,,2023-01-03T12:00:00",
+                "INCOME,1,Main,50.00,,,2023-01-04T12:00:00",
+            ],
+        )
+        messages = []
+
+        result = pipeline.run(CSVImporter(), path, on_message=messages.append)
+
+        assert result.imported == 4
+        # Вторая пачка видит баланс после первой, пополнение нужно только третьей
+        top_ups = [m for m in messages if "Автоматическое пополнение" in m]
+        assert len(top_ups) == 1 and "на 100.00" in top_ups[0]
+        assert container.bank_account_facade.get_account(1).balance == Decimal("50.00")
+        assert result.accounts[1].balance == Decimal("50.00")
+        container.database.close()
+
+
+class TestExportRoundTrip:
+    @pytest.mark.parametrize("format_type", ["csv", "json", "yaml", "ndjson", "arrow"])
+    def test_console_export_is_reimported(self, tmp_path, monkeypatch, format_type):
+        monkeypatch.chdir(tmp_path)
+        source = ConsoleApp(FinanceModuleContainer())
+        account = source.container.bank_account_facade.create_account(
+            "Main", Decimal("100")
+        )
+        category = source.container.category_facade.create_category(
+            "Food", TransactionType.EXPENSE
+        )
+        facade = source.container.operation_facade
+        facade.create_operation(
+            TransactionType.INCOME,
+            account.id,
+            Decimal("1000.50"),
+            datetime(2024, 1, 1, 9, 30),
+            description='Аванс, "январь"',
+        )
+        facade.create_operation(
+            TransactionType.EXPENSE,
+            account.id,
+            Decimal("250.25"),
+            datetime(2024, 1, 2, 18),
+            category.id,
+        )
+
+        with patch("builtins.print"):
+            source.export_operations(format_type)
+        target = ConsoleApp(FinanceModuleContainer())
+        with patch("builtins.print"), patch(
+            "builtins.input", return_value=f"operations.{format_type}"
+        ):
+            target.import_operations(format_type)
+
+        def snapshot(container):
+            return [
+                (
+                    op.type,
+                    op.bank_account_id,
+                    op.amount,
+                    op.date,
+                    op.category_id,
+                    op.description,
+                )
+                for op in container.operation_facade.get_all_operations()
+            ]
+
+        assert snapshot(target.container) == snapshot(source.container)
+        assert target.container.bank_account_facade.get_account(account.id).name == (
+            "Main"
+        )
+        assert target.container.category_repository.get_by_id(category.id).name == (
+            "Food"
+        )
@@ -1,11 +1,20 @@
+import io
 from decimal import Decimal
+from datetime import datetime
 import json
 import yaml
 
 import pytest
 from unittest.mock import patch, MagicMock
 from models import TransactionType
-from importers import CSVImporter, JSONImporter, YAMLImporter
+from importers import (
+    ArrowImporter,
+    CSVImporter,
+    JSONImporter,
+    NDJSONImporter,
+    RecordPreparer,
+    YAMLImporter,
+)
 
 
 class TestImporters:
@@ -39,7 +48,7 @@ class TestImporters:
                 "description": "January salary"
             }
         ]}"""
-        
+
         original_prepare_data = importer._prepare_data
         importer._prepare_data = lambda data: [
             {
@@ -129,3 +138,273 @@ class TestImporters:
             importer.import_data("something_else: []")
 
         importer._prepare_data = original_prepare
+
+    def test_csv_importer_import_batches_from_stream(self):
+        importer = CSVImporter()
+        rows = "\n".join(
+            f"{i},EXPENSE,{i}.50,2023-01-0{i}T12:00:00" for i in range(1, 6)
+        )
+        stream = io.BytesIO(f"id,type,amount,date\n{rows}\n".encode("utf-8"))
+
+        batches = list(importer.import_batches(stream, batch_size=2))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0][0]["type"] == TransactionType.EXPENSE
+        assert batches[2][0]["amount"] == Decimal("5.50")
+        assert not stream.closed
+
+    def test_csv_importer_import_batches_from_path(self, tmp_path):
+        importer = CSVImporter()
+        path = tmp_path / "operations.csv"
+        path.write_text(
+            'id,type,amount,description\n1,INCOME,10,"Зарплата, январь"\n',
+            encoding="utf-8",
+        )
+
+        batches = list(importer.import_batches(str(path)))
+
+        assert len(batches) == 1
+        assert batches[0][0]["description"] == "Зарплата, январь"
+        assert list(importer.import_batches(io.BytesIO(b""))) == []
+
+    def test_csv_importer_import_batches_invalid_size(self):
+        with pytest.raises(ValueError):
+            next(CSVImporter().import_batches(io.BytesIO(b"id\n1\n"), batch_size=0))
+
+    def test_parallel_prepare_matches_serial(self):
+        rows = [
+            {
+                "id": str(i),
+                "type": ["INCOME", "expense", "Income"][i % 3],
+                "amount": f"{i}.{i % 100:02d}",
+                "date": ["2023-01-01T12:00:00", "2023-01-02 08:30:00"][i % 2],
+                "description": f"row {i}",
+            }
+            for i in range(1, 120)
+        ]
+        serial = CSVImporter()
+        parallel = CSVImporter(workers=2, chunk_size=25)
+
+        try:
+            assert parallel._prepare_data(rows) == serial._prepare_data(rows)
+        finally:
+            parallel.close()
+
+    def test_invalid_parallel_settings(self):
+        with pytest.raises(ValueError):
+            CSVImporter(workers=0)
+        with pytest.raises(ValueError):
+            CSVImporter(chunk_size=0)
+
+
+class TestRecordPreparer:
+    def test_detects_and_caches_date_format(self):
+        preparer = RecordPreparer()
+
+        first = preparer.parse_date("01.02.2023 10:00:00")
+        assert first == datetime(2023, 2, 1, 10, 0)
+        assert list(preparer._parsers_by_shape) == ["00.00.0000 00:00:00"]
+
+        assert preparer.parse_date("05.02.2023 11:30:00") == datetime(
+            2023, 2, 5, 11, 30
+        )
+        assert preparer.parse_date("01.02.2023 10:00:00") is first
+
+    def test_mixed_formats(self):
+        preparer = RecordPreparer()
+
+        assert preparer.parse_date("2023-01-01T12:00:00") == datetime(2023, 1, 1, 12)
+        assert preparer.parse_date("15/03/2023") == datetime(2023, 3, 15)
+        assert preparer.parse_date("2023-01-02 08:30:00") == datetime(2023, 1, 2, 8, 30)
+
+    def test_invalid_values_raise(self):
+        preparer = RecordPreparer()
+
+        with pytest.raises(ValueError):
+            preparer.parse_date("not a date")
+        with pytest.raises(ValueError):
+            preparer.parse_amount("12,5")
+        with pytest.raises(ValueError):
+            preparer.parse_type("TRANSFER")
+
+
+class TestRejectedRows:
+    def test_rows_are_reported_instead_of_current_time(self):
+        importer = CSVImporter()
+        csv_data = """id,type,amount,date
+1,INCOME,100.0,2023-01-01T12:00:00
+2,INCOME,abc,2023-01-01T12:00:00
+3,EXPENSE,10.0,yesterday"""
+
+        result = importer.import_data(csv_data)
+
+        assert [item["id"] for item in result] == ["1"]
+        assert [(row, error) for row, _, error in importer.rejected] == [
+            (2, "Некорректная сумма: abc"),
+            (3, "Некорректная дата: yesterday"),
+        ]
+
+    def test_row_numbers_across_batches_and_processes(self):
+        rows = [
+            {"id": str(i), "amount": "bad" if i % 40 == 0 else "1.0"}
+            for i in range(1, 121)
+        ]
+        importer = CSVImporter(workers=2, chunk_size=25)
+
+        try:
+            importer._start_import()
+            prepared = importer._prepare_data(rows[:60]) + importer._prepare_data(
+                rows[60:]
+            )
+        finally:
+            importer.close()
+
+        assert len(prepared) == 117
+        assert [row for row, _, _ in importer.rejected] == [40, 80, 120]
+
+
+class TestArrowImporter:
+    def setup_method(self):
+        pytest.importorskip("pyarrow")
+        from exporters import ArrowExporter
+
+        self.exporter = ArrowExporter()
+        self.records = [
+            {
+                "id": i + 1,
+                "type": TransactionType.EXPENSE,
+                "bank_account_id": 1,
+                "amount": Decimal("12.34"),
+                "category_id": None if i % 2 else 2,
+                "date": datetime(2023, 1, 1, 12, 0, 0, 123),
+                "description": "Кофе, круассан",
+            }
+            for i in range(5)
+        ]
+
+    def test_round_trip_keeps_types(self):
+        result = ArrowImporter().import_data(self.exporter.export_data(self.records))
+
+        assert result == self.records
+        assert isinstance(result[0]["amount"], Decimal)
+        assert isinstance(result[0]["date"], datetime)
+
+    def test_schema_uses_fixed_point_and_timestamps(self):
+        import pyarrow as pa
+
+        data = self.exporter.export_data(self.records)
+        schema = pa.ipc.open_file(pa.py_buffer(data)).schema
+
+        assert schema.field("amount").type == pa.decimal128(18, 2)
+        assert schema.field("date").type == pa.timestamp("us")
+        assert schema.field("category_id").type == pa.int64()
+
+    def test_import_batches_from_memory_mapped_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(self.exporter, "BATCH_SIZE", 2)
+        path = tmp_path / "operations.arrow"
+        with open(path, "wb") as file:
+            assert self.exporter.export_to_stream(iter(self.records), file) == 5
+
+        batches = list(ArrowImporter().import_batches(path))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert ArrowImporter().import_file(path) == self.records
+
+    def test_empty_export(self):
+        assert ArrowImporter().import_data(self.exporter.export_data([])) == []
+
+
+class TestNDJSONImporter:
+    @pytest.fixture(params=["orjson", "json"])
+    def backend(self, request, monkeypatch):
+        import exporters
+        import importers
+
+        if request.param == "json":
+            monkeypatch.setattr(exporters, "orjson", None)
+            monkeypatch.setattr(importers, "orjson", None)
+        elif importers.orjson is None:
+            pytest.skip("orjson не установлен")
+        return request.param
+
+    def make_records(self, count):
+        return [
+            {
+                "id": i + 1,
+                "type": TransactionType.INCOME,
+                "bank_account_id": 1,
+                "amount": Decimal("100.50"),
+                "date": datetime(2023, 1, 1, 12, 0),
+                "description": "Зарплата, январь",
+            }
+            for i in range(count)
+        ]
+
+    def test_round_trip(self, backend):
+        from exporters import NDJSONExporter
+
+        records = self.make_records(3)
+        data = NDJSONExporter().export_data(records)
+
+        assert data.count(b"\n") == 3
+        assert NDJSONImporter().import_data(data) == records
+
+    def test_resume_from_offset(self, backend, tmp_path):
+        from exporters import NDJSONExporter
+
+        records = self.make_records(5)
+        path = tmp_path / "operations.ndjson"
+        path.write_bytes(NDJSONExporter().export_data(records) + b"\n")
+
+        importer = NDJSONImporter()
+        first_batch, offset = next(importer.read_batches(path, batch_size=2))
+        assert first_batch == records[:2]
+
+        resumed = list(importer.import_batches(path, batch_size=2, offset=offset))
+        assert resumed == [records[2:4], records[4:]]
+
+    def test_invalid_line(self):
+        with pytest.raises(ValueError):
+            NDJSONImporter().import_data('{"id": 1}\n{"id": ')
+
+
+class TestYAMLDocuments:
+    def make_records(self, count):
+        return [
+            {
+                "id": i + 1,
+                "type": TransactionType.EXPENSE,
+                "amount": Decimal("5.25"),
+                "date": datetime(2023, 1, 2, 9, 30),
+                "description": "Обед: суп",
+            }
+            for i in range(count)
+        ]
+
+    def test_multi_document_round_trip(self):
+        from exporters import YAMLExporter
+
+        records = self.make_records(5)
+        exported = YAMLExporter(chunk_size=2, multi_document=True).export_data(
+            records
+        )
+
+        assert exported.count("---") == 3
+        assert YAMLImporter().import_data(exported) == records
+        batches = list(YAMLImporter().import_batches(io.StringIO(exported)))
+        assert batches == [records[:2], records[2:4], records[4:]]
+
+    def test_single_document_in_chunks(self, tmp_path):
+        from exporters import YAMLExporter
+
+        records = self.make_records(5)
+        path = tmp_path / "operations.yaml"
+        path.write_text(
+            YAMLExporter(chunk_size=2).export_data(records), encoding="utf-8"
+        )
+
+        assert list(YAMLImporter().import_batches(path)) == [records]
+
+    def test_document_must_be_list(self):
+        with pytest.raises(ValueError):
+            list(YAMLImporter().import_batches(io.StringIO("operations: []")))
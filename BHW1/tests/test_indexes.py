@@ -0,0 +1,59 @@
+import random
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from indexes import DailyBalanceIndex, SortedIdIndex
+
+
+class TestDailyBalanceIndex:
+    def test_empty_index(self):
+        index = DailyBalanceIndex()
+
+        assert index.prefix_sum(datetime(2023, 1, 1).toordinal()) == Decimal("0")
+        assert index.range_sum(1, 10) == Decimal("0")
+
+    def test_range_sum(self):
+        index = DailyBalanceIndex()
+        index.add(datetime(2023, 1, 10), Decimal("100"))
+        index.add(datetime(2023, 1, 5), Decimal("-30"))
+        index.add(datetime(2023, 1, 20, 18, 30), Decimal("50"))
+
+        first = datetime(2023, 1, 5).toordinal()
+        assert index.range_sum(first, first + 5) == Decimal("70")
+        assert index.range_sum(first + 1, first + 15) == Decimal("150")
+        assert index.range_sum(first + 6, first + 4) == Decimal("0")
+
+    def test_out_of_order_inserts_match_brute_force(self):
+        rng = random.Random(42)
+        index = DailyBalanceIndex()
+        base = datetime(2020, 6, 1)
+        entries = []
+
+        for _ in range(500):
+            date = base + timedelta(days=rng.randint(-800, 800))
+            amount = Decimal(rng.randint(-10000, 10000)) / 100
+            index.add(date, amount)
+            entries.append((date.toordinal(), amount))
+
+        for _ in range(50):
+            first = base.toordinal() + rng.randint(-900, 900)
+            last = first + rng.randint(0, 600)
+            expected = sum(
+                (amount for day, amount in entries if first <= day <= last),
+                Decimal("0"),
+            )
+            assert index.range_sum(first, last) == expected
+
+
+class TestSortedIdIndex:
+    def test_after(self):
+        index = SortedIdIndex()
+        for id in (3, 1, 2, 10, 2):
+            index.add(id)
+        index.discard(10)
+        index.discard(42)
+
+        assert len(index) == 3
+        assert index.after(None, 2) == [1, 2]
+        assert index.after(1, 10) == [2, 3]
+        assert index.after(3, 10) == []
@@ -60,3 +60,28 @@ class TestOperation:
         assert operation.date == now
         assert operation.category_id == 3
         assert operation.description == "Test"
+
+    def test_type_flag_follows_type(self):
+        operation = Operation(
+            1, TransactionType.EXPENSE, 2, Decimal("40.5"), datetime.now()
+        )
+        assert operation.type_flag == -1
+
+        operation.type = TransactionType.INCOME
+        assert operation.type_flag == 1
+        assert not hasattr(operation, "__dict__")
+
+
+class TestCompactModels:
+    @pytest.mark.parametrize(
+        "entity",
+        [
+            BankAccount(1, "Account", Decimal("1.0")),
+            Category(1, "Category", TransactionType.INCOME),
+            Operation(1, TransactionType.INCOME, 1, Decimal("1.0"), datetime.now()),
+        ],
+    )
+    def test_models_have_no_instance_dict(self, entity):
+        assert not hasattr(entity, "__dict__")
+        with pytest.raises(AttributeError):
+            entity.unexpected = True
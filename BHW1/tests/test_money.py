@@ -0,0 +1,67 @@
+from decimal import Decimal
+from datetime import datetime
+
+import pytest
+
+from money import from_minor, to_minor
+from models import Operation, TransactionType
+from repositories import InMemoryOperationRepository
+from validators import OperationValidator
+
+
+class TestMinorUnits:
+    def test_round_trip(self):
+        assert to_minor(Decimal("12.34")) == 1234
+        assert to_minor(Decimal("-0.5")) == -50
+        assert to_minor(Decimal("7"), 0) == 7
+        assert from_minor(1234) == Decimal("12.34")
+        assert from_minor(-50) == Decimal("-0.50")
+
+    def test_rejects_unrepresentable_amount(self):
+        with pytest.raises(ValueError):
+            to_minor(Decimal("0.001"))
+        with pytest.raises(ValueError):
+            to_minor(Decimal("1.5"), 0)
+
+
+class TestMinorUnitStorage:
+    def test_repository_rejects_sub_minor_amount_without_side_effects(self):
+        repository = InMemoryOperationRepository()
+        operation = Operation(
+            0, TransactionType.INCOME, 1, Decimal("0.005"), datetime(2023, 1, 1)
+        )
+
+        with pytest.raises(ValueError):
+            repository.add(operation)
+        assert repository.get_all() == []
+        assert repository.get_account_balance(1) == Decimal("0")
+
+    def test_balances_are_exact(self):
+        repository = InMemoryOperationRepository()
+        repository.add_many(
+            [
+                Operation(
+                    0, TransactionType.INCOME, 1, Decimal("0.10"), datetime(2023, 1, 1)
+                )
+                for _ in range(10)
+            ]
+            + [
+                Operation(
+                    0, TransactionType.EXPENSE, 1, Decimal("0.3"), datetime(2023, 1, 2)
+                )
+            ]
+        )
+
+        assert repository.get_account_balance(1) == Decimal("0.70")
+        assert repository.get_period_balance(
+            datetime(2023, 1, 1), datetime(2023, 1, 2, 23, 59)
+        ) == Decimal("0.70")
+
+    def test_validator_checks_scale(self):
+        operation = Operation(
+            0, TransactionType.INCOME, 1, Decimal("1.234"), datetime(2023, 1, 1)
+        )
+
+        with pytest.raises(ValueError):
+            OperationValidator().validate(operation)
+        assert OperationValidator(scale=3).validate(operation)
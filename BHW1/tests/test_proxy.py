@@ -1,4 +1,5 @@
 from decimal import Decimal
+from unittest.mock import patch
 from datetime import datetime
 
 from proxy import OperationRepositoryProxy
@@ -37,6 +38,15 @@ class TestOperationRepositoryProxy:
         result3 = self.proxy.get_all()
         assert len(result3) == 1
 
+    def test_without_snapshot_reads_repository(self):
+        proxy = OperationRepositoryProxy(self.real_repository, keep_snapshot=False)
+
+        assert len(proxy.get_all()) == 2
+        self.real_repository.delete(self.added_op2.id)
+        assert proxy.get_all() == [self.added_op1]
+        assert list(proxy.iter_all()) == [self.added_op1]
+        assert proxy._snapshot == []
+
     def test_get_by_id_caching(self):
         op1 = self.proxy.get_by_id(self.added_op1.id)
         assert op1.id == self.added_op1.id
@@ -53,7 +63,7 @@ class TestOperationRepositoryProxy:
         op1_cached = self.proxy.get_by_id(self.added_op1.id)
         assert op1_cached.amount == Decimal("100.0")
 
-    def test_add_invalidates_cache(self):
+    def test_add_patches_snapshot(self):
         self.proxy.get_all()
         assert self.proxy.is_cache_valid
 
@@ -62,26 +72,119 @@ class TestOperationRepositoryProxy:
         )
         self.proxy.add(new_op)
 
-        assert not self.proxy.is_cache_valid
+        assert self.proxy.is_cache_valid
 
         all_ops = self.proxy.get_all()
         assert len(all_ops) == 3
+        assert all_ops[-1] is new_op
+
+    def test_returned_snapshot_is_not_changed_by_writes(self):
+        operations = self.proxy.get_all()
+
+        self.proxy.add(
+            Operation(0, TransactionType.INCOME, 2, Decimal("300.0"), datetime.now())
+        )
+        updated = Operation(
+            self.added_op1.id, TransactionType.INCOME, 1, Decimal("1.0"), datetime.now()
+        )
+        self.proxy.update(updated)
+
+        assert operations == [self.added_op1, self.added_op2]
+        assert len(self.proxy.get_all()) == 3
+        assert self.proxy.get_all()[0] is updated
+
+    def test_write_while_iterating_all_terminates(self):
+        for operation in self.proxy.get_all():
+            self.proxy.add(
+                Operation(
+                    0, TransactionType.INCOME, 1, operation.amount, datetime.now()
+                )
+            )
+
+        assert len(self.proxy.get_all()) == 4
 
     def test_update_invalidates_specific_cache(self):
         op1 = self.proxy.get_by_id(self.added_op1.id)
+        self.proxy.get_all()
 
         op1.amount = Decimal("150.0")
         self.proxy.update(op1)
 
-        assert f"id_{op1.id}" not in self.proxy.cache
-
-        assert not self.proxy.is_cache_valid
+        assert op1.id not in self.proxy.cache
+        assert self.proxy.is_cache_valid
+        assert self.proxy.get_all()[0].amount == Decimal("150.0")
 
     def test_delete_invalidates_specific_cache(self):
         self.proxy.get_by_id(self.added_op1.id)
+        self.proxy.get_all()
 
         self.proxy.delete(self.added_op1.id)
 
-        assert f"id_{self.added_op1.id}" not in self.proxy.cache
+        assert self.added_op1.id not in self.proxy.cache
+        assert self.proxy.is_cache_valid
+        assert self.proxy.get_all() == [self.added_op2]
+
+    def test_delete_then_add_same_id(self):
+        self.proxy.get_all()
+
+        self.proxy.delete(self.added_op1.id)
+        readded = Operation(
+            self.added_op1.id, TransactionType.INCOME, 1, Decimal("1.0"), datetime.now()
+        )
+        self.proxy.add(readded)
+
+        assert self.proxy.get_all() == [self.added_op2, readded]
+
+    def test_get_stored_reads_repository(self):
+        cached = self.proxy.get_by_id(self.added_op1.id)
+        cached.amount = Decimal("1.0")
+
+        stored = self.proxy.get_stored(self.added_op1.id)
+
+        assert stored is not cached
+        assert stored.amount == Decimal("100.0")
+
+    def test_missing_id_is_not_cached(self):
+        assert self.proxy.get_by_id(100) is None
+
+        added = self.proxy.add(
+            Operation(100, TransactionType.INCOME, 1, Decimal("1.0"), datetime.now())
+        )
+
+        assert self.proxy.get_by_id(100) is added
+
+    def test_lru_is_bounded(self):
+        proxy = OperationRepositoryProxy(self.real_repository, max_entries=1)
+
+        proxy.get_by_id(self.added_op1.id)
+        proxy.get_by_id(self.added_op2.id)
+
+        assert list(proxy.cache) == [self.added_op2.id]
+
+    def test_ttl_expires_entries(self):
+        proxy = OperationRepositoryProxy(self.real_repository, ttl=10)
+
+        with patch("proxy.time.monotonic", return_value=100.0):
+            proxy.get_by_id(self.added_op1.id)
+        with patch("proxy.time.monotonic", return_value=105.0):
+            proxy.get_by_id(self.added_op1.id)
+        with patch("proxy.time.monotonic", return_value=111.0):
+            proxy.get_by_id(self.added_op1.id)
+
+        assert proxy.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+    def test_write_through(self):
+        proxy = OperationRepositoryProxy(self.real_repository, write_through=True)
+
+        new_op = proxy.add(
+            Operation(0, TransactionType.INCOME, 2, Decimal("300.0"), datetime.now())
+        )
+
+        assert proxy.get_by_id(new_op.id) is new_op
+        assert proxy.hits == 1
+        assert proxy.misses == 0
 
-        assert not self.proxy.is_cache_valid
+    def test_page_and_iter_all(self):
+        assert [op.id for op in self.proxy.page(limit=1)] == [self.added_op1.id]
+        assert list(self.proxy.iter_all()) == [self.added_op1, self.added_op2]
+        assert self.proxy.get_all() is self.proxy.get_all()
@@ -0,0 +1,158 @@
+from decimal import Decimal
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from queries import OperationQueryService
+from repositories import (
+    InMemoryBankAccountRepository,
+    InMemoryCategoryRepository,
+    InMemoryOperationRepository,
+)
+from sqlite_repositories import (
+    SQLiteBankAccountRepository,
+    SQLiteCategoryRepository,
+    SQLiteDatabase,
+    SQLiteOperationRepository,
+)
+from models import BankAccount, Category, Operation, TransactionType
+
+
+class TestOperationQueryService:
+    def setup_method(self):
+        self.accounts = InMemoryBankAccountRepository()
+        self.categories = InMemoryCategoryRepository()
+        self.operations = InMemoryOperationRepository()
+        self.service = OperationQueryService(
+            self.operations, self.accounts, self.categories
+        )
+
+        self.accounts.add(BankAccount(1, "Основной", Decimal("0")))
+        self.accounts.add(BankAccount(2, "Карта", Decimal("0")))
+        self.categories.add(Category(1, "Зарплата", TransactionType.INCOME))
+        self.categories.add(Category(2, "Еда", TransactionType.EXPENSE))
+
+        self.operations.add_many(
+            [
+                Operation(
+                    0,
+                    TransactionType.INCOME,
+                    1,
+                    Decimal("1000"),
+                    datetime(2024, 1, 1),
+                    1,
+                    "Аванс",
+                ),
+                Operation(
+                    0,
+                    TransactionType.EXPENSE,
+                    1,
+                    Decimal("50"),
+                    datetime(2024, 1, 5),
+                    2,
+                ),
+                Operation(
+                    0,
+                    TransactionType.EXPENSE,
+                    2,
+                    Decimal("20"),
+                    datetime(2024, 2, 1),
+                    2,
+                ),
+                Operation(
+                    0, TransactionType.EXPENSE, 3, Decimal("5"), datetime(2024, 3, 1)
+                ),
+            ]
+        )
+
+    def test_rows_are_joined_with_names(self):
+        rows = self.service.list_operations()
+
+        assert [row["id"] for row in rows] == [1, 2, 3, 4]
+        assert rows[0] == {
+            "id": 1,
+            "type": TransactionType.INCOME,
+            "account_name": "Основной",
+            "account_id": 1,
+            "amount": Decimal("1000"),
+            "category_name": "Зарплата",
+            "category_id": 1,
+            "date": datetime(2024, 1, 1),
+            "description": "Аванс",
+        }
+        assert rows[3]["account_name"] == "Неизвестный счет"
+        assert rows[3]["category_name"] == "Без категории"
+
+    def test_filters(self):
+        assert [row["id"] for row in self.service.list_operations(account_id=1)] == [
+            1,
+            2,
+        ]
+        assert [row["id"] for row in self.service.list_operations(category_id=2)] == [
+            2,
+            3,
+        ]
+        rows = self.service.list_operations(type=TransactionType.EXPENSE, account_id=2)
+        assert [row["id"] for row in rows] == [3]
+
+        rows = self.service.list_operations(
+            start_date=datetime(2024, 1, 2), end_date=datetime(2024, 2, 28)
+        )
+        assert [row["id"] for row in rows] == [2, 3]
+        rows = self.service.list_operations(
+            account_id=1, start_date=datetime(2024, 1, 2)
+        )
+        assert [row["id"] for row in rows] == [2]
+        assert self.service.count(end_date=datetime(2024, 1, 31)) == 2
+
+    def test_paging(self):
+        rows = self.service.list_operations(offset=1, limit=2)
+        assert [row["id"] for row in rows] == [2, 3]
+
+        pages = list(self.service.iter_pages(page_size=3))
+        assert [[row["id"] for row in page] for page in pages] == [[1, 2, 3], [4]]
+
+        with pytest.raises(ValueError):
+            self.service.iter_pages(page_size=0)
+        with pytest.raises(ValueError):
+            self.service.list_operations(offset=-1)
+
+    def test_names_resolved_once_per_page(self):
+        with patch.object(
+            self.accounts, "get_by_ids", wraps=self.accounts.get_by_ids
+        ) as get_accounts, patch.object(
+            self.accounts, "get_by_id", wraps=self.accounts.get_by_id
+        ) as get_account:
+            list(self.service.iter_pages(page_size=2))
+
+        assert get_accounts.call_count == 2
+        assert set(get_accounts.call_args_list[0][0][0]) == {1}
+        assert set(get_accounts.call_args_list[1][0][0]) == {2, 3}
+        # По одному обращению на уникальный счет страницы, а не на операцию
+        assert get_account.call_count == 3
+
+
+class TestOperationQueryServiceSQLite:
+    def test_bulk_name_lookup(self, tmp_path):
+        database = SQLiteDatabase(str(tmp_path / "finance.db"))
+        accounts = SQLiteBankAccountRepository(database)
+        categories = SQLiteCategoryRepository(database)
+        operations = SQLiteOperationRepository(database)
+        service = OperationQueryService(operations, accounts, categories)
+
+        accounts.add(BankAccount(1, "Основной", Decimal("0")))
+        categories.add(Category(7, "Еда", TransactionType.EXPENSE))
+        operations.add(
+            Operation(
+                0, TransactionType.EXPENSE, 1, Decimal("12.50"), datetime(2024, 1, 1), 7
+            )
+        )
+
+        found = accounts.get_by_ids([1, 1, 99])
+        assert list(found) == [1]
+        assert found[1].name == "Основной"
+        rows = service.list_operations()
+        assert rows[0]["account_name"] == "Основной"
+        assert rows[0]["category_name"] == "Еда"
+        database.close()
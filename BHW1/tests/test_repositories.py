@@ -186,6 +186,30 @@ class TestInMemoryOperationRepository:
         assert updated_operation.amount == Decimal("150.0")
         assert repository.get_by_id(operation.id).amount == Decimal("150.0")
 
+    def test_get_stored_ignores_in_place_changes(self):
+        repository = InMemoryOperationRepository()
+        operation = repository.add(
+            Operation(
+                0, TransactionType.EXPENSE, 1, Decimal("40"), datetime(2023, 1, 1), 3
+            )
+        )
+
+        operation.type = TransactionType.INCOME
+        operation.amount = Decimal("150.0")
+        operation.date = datetime(2023, 2, 1)
+        operation.category_id = 5
+        stored = repository.get_stored(operation.id)
+
+        assert stored is not operation
+        assert stored.type == TransactionType.EXPENSE
+        assert stored.amount == Decimal("40")
+        assert stored.date == datetime(2023, 1, 1)
+        assert stored.category_id == 3
+
+        repository.update(operation)
+        assert repository.get_stored(operation.id).amount == Decimal("150.0")
+        assert repository.get_stored(999) is None
+
     def test_update_nonexistent(self):
         repository = InMemoryOperationRepository()
         operation = Operation(
@@ -209,3 +233,218 @@ class TestInMemoryOperationRepository:
 
         with pytest.raises(ValueError):
             repository.delete(999)
+
+    def test_get_by_period(self):
+        repository = InMemoryOperationRepository()
+        early = repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("10"), datetime(2023, 3, 1))
+        )
+        late = repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("20"), datetime(2023, 1, 1))
+        )
+        repository.add(
+            Operation(0, TransactionType.EXPENSE, 1, Decimal("5"), datetime(2023, 5, 1))
+        )
+
+        result = repository.get_by_period(datetime(2023, 1, 1), datetime(2023, 3, 1))
+
+        assert result == [late, early]
+        assert (
+            repository.get_by_period(datetime(2023, 3, 2), datetime(2023, 1, 1)) == []
+        )
+
+    def test_get_by_period_tracks_update_and_delete(self):
+        repository = InMemoryOperationRepository()
+        operation = repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("10"), datetime(2023, 1, 1))
+        )
+
+        operation.date = datetime(2023, 6, 1)
+        repository.update(operation)
+
+        assert (
+            repository.get_by_period(datetime(2023, 1, 1), datetime(2023, 1, 31)) == []
+        )
+        assert repository.get_by_period(datetime(2023, 6, 1), datetime(2023, 6, 1)) == [
+            operation
+        ]
+
+        repository.delete(operation.id)
+        assert (
+            repository.get_by_period(datetime(2023, 1, 1), datetime(2023, 12, 31)) == []
+        )
+
+    def test_get_period_balance(self):
+        repository = InMemoryOperationRepository()
+        repository.add(
+            Operation(
+                0, TransactionType.INCOME, 1, Decimal("100"), datetime(2023, 1, 1, 9)
+            )
+        )
+        repository.add(
+            Operation(
+                0, TransactionType.EXPENSE, 1, Decimal("30"), datetime(2023, 1, 2, 12)
+            )
+        )
+        late = repository.add(
+            Operation(
+                0, TransactionType.INCOME, 1, Decimal("50"), datetime(2023, 1, 3, 20)
+            )
+        )
+
+        assert repository.get_period_balance(
+            datetime(2023, 1, 1), datetime(2023, 1, 3, 23, 59, 59)
+        ) == Decimal("120")
+        assert repository.get_period_balance(
+            datetime(2023, 1, 1, 10), datetime(2023, 1, 3, 12)
+        ) == Decimal("-30")
+
+        late.amount = Decimal("80")
+        repository.update(late)
+        assert repository.get_period_balance(
+            datetime(2023, 1, 2), datetime(2023, 1, 4)
+        ) == Decimal("50")
+
+        repository.delete(late.id)
+        assert repository.get_period_balance(
+            datetime(2023, 1, 2), datetime(2023, 1, 4)
+        ) == Decimal("-30")
+
+    def test_account_index_and_balance(self):
+        repository = InMemoryOperationRepository()
+        income = repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("100"), datetime.now())
+        )
+        expense = repository.add(
+            Operation(0, TransactionType.EXPENSE, 1, Decimal("30"), datetime.now())
+        )
+        other = repository.add(
+            Operation(0, TransactionType.INCOME, 2, Decimal("5"), datetime.now())
+        )
+
+        assert repository.get_by_account(1) == [income, expense]
+        assert repository.get_account_balance(1) == Decimal("70")
+        assert repository.get_account_balance(2) == Decimal("5")
+        assert repository.get_account_balance(3) == Decimal("0")
+
+        other.bank_account_id = 1
+        repository.update(other)
+        assert repository.get_account_balance(1) == Decimal("75")
+        assert repository.get_by_account(2) == []
+
+        repository.delete(expense.id)
+        assert repository.get_account_balance(1) == Decimal("105")
+        assert repository.get_by_account(1) == [income, other]
+
+    def test_add_many(self):
+        repository = InMemoryOperationRepository()
+        repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("1"), datetime(2023, 1, 2))
+        )
+        operations = repository.add_many(
+            [
+                Operation(
+                    0, TransactionType.INCOME, 1, Decimal("10"), datetime(2023, 1, 3)
+                ),
+                Operation(
+                    0, TransactionType.EXPENSE, 1, Decimal("4"), datetime(2023, 1, 1)
+                ),
+            ]
+        )
+
+        assert [op.id for op in operations] == [2, 3]
+        assert repository.next_id == 4
+        assert repository.get_account_balance(1) == Decimal("7")
+        assert repository.get_by_period(datetime(2023, 1, 1), datetime(2023, 1, 1)) == [
+            operations[1]
+        ]
+
+    def test_add_many_unordered_dates(self):
+        repository = InMemoryOperationRepository()
+        repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("1"), datetime(2023, 1, 5))
+        )
+        repository.add_many(
+            [
+                Operation(
+                    0, TransactionType.INCOME, 1, Decimal("1"), datetime(2023, 1, day)
+                )
+                for day in (9, 2, 7, 3)
+            ]
+            + [
+                Operation(
+                    1, TransactionType.EXPENSE, 1, Decimal("2"), datetime(2023, 1, 8)
+                ),
+                Operation(
+                    3, TransactionType.INCOME, 1, Decimal("5"), datetime(2023, 1, 1)
+                ),
+            ]
+        )
+
+        period = repository.get_by_period(datetime(2023, 1, 1), datetime(2023, 1, 31))
+        assert [op.id for op in period] == [3, 5, 4, 1, 2]
+        assert repository._date_index == sorted(repository._date_index)
+        assert repository.get_account_balance(1) == Decimal("6")
+
+    def test_page_and_iter_all(self):
+        repository = InMemoryOperationRepository()
+        for id in (5, 2, 9, 7):
+            repository.add(
+                Operation(
+                    id, TransactionType.INCOME, 1, Decimal("1"), datetime(2023, 1, id)
+                )
+            )
+        repository.delete(7)
+
+        assert [op.id for op in repository.page(limit=2)] == [2, 5]
+        assert [op.id for op in repository.page(after_id=5, limit=2)] == [9]
+        assert repository.page(after_id=9) == []
+        assert sorted(op.id for op in repository.iter_all()) == [2, 5, 9]
+        with pytest.raises(ValueError):
+            repository.page(limit=0)
+
+    def test_update_keeps_page_position(self):
+        repository = InMemoryOperationRepository()
+        first = repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("1"), datetime(2023, 1, 1))
+        )
+        repository.add(
+            Operation(0, TransactionType.INCOME, 1, Decimal("2"), datetime(2023, 1, 2))
+        )
+        first.amount = Decimal("3")
+        repository.update(first)
+
+        assert [op.id for op in repository.page()] == [1, 2]
+
+    def test_update_after_type_change(self):
+        repository = InMemoryOperationRepository()
+        operation = repository.add(
+            Operation(
+                0, TransactionType.EXPENSE, 1, Decimal("30"), datetime(2023, 1, 1)
+            )
+        )
+        assert repository.get_account_balance(1) == Decimal("-30")
+
+        operation.type = TransactionType.INCOME
+        repository.update(operation)
+
+        assert repository.get_account_balance(1) == Decimal("30")
+        assert repository.get_period_balance(
+            datetime(2023, 1, 1), datetime(2023, 1, 2)
+        ) == Decimal("30")
+
+
+class TestInMemoryEntityPaging:
+    def test_accounts_and_categories(self):
+        accounts = InMemoryBankAccountRepository()
+        accounts.add(BankAccount(3, "Account 3", Decimal("0")))
+        accounts.add(BankAccount(1, "Account 1", Decimal("0")))
+        categories = InMemoryCategoryRepository()
+        categories.add(Category(0, "Food", TransactionType.EXPENSE))
+        categories.add(Category(0, "Salary", TransactionType.INCOME))
+        categories.delete(1)
+
+        assert [a.id for a in accounts.page(limit=1)] == [1]
+        assert [a.id for a in accounts.page(after_id=1)] == [3]
+        assert [c.name for c in categories.page()] == ["Salary"]
+        assert [c.name for c in categories.iter_all()] == ["Salary"]
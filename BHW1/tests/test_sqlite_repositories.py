@@ -0,0 +1,210 @@
+from decimal import Decimal
+from datetime import datetime
+
+import pytest
+
+from container import FinanceModuleContainer
+from models import BankAccount, Category, Operation, TransactionType
+from sqlite_repositories import (
+    SQLiteDatabase,
+    SQLiteBankAccountRepository,
+    SQLiteCategoryRepository,
+    SQLiteOperationRepository,
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SQLiteDatabase(str(tmp_path / "finance.db"))
+    yield database
+    database.close()
+
+
+class TestSQLiteDatabase:
+    def test_wal_mode_and_indexes(self, database):
+        (mode,) = database.connection.execute("PRAGMA journal_mode").fetchone()
+        indexes = {
+            row[1]
+            for row in database.connection.execute("PRAGMA index_list(operations)")
+        }
+
+        assert mode == "wal"
+        assert "idx_operations_account_date" in indexes
+        assert "idx_operations_category_date" in indexes
+
+    def test_nested_transaction_commits_once(self, database):
+        accounts = SQLiteBankAccountRepository(database)
+
+        with pytest.raises(RuntimeError):
+            with database.transaction():
+                accounts.add(BankAccount(1, "Main", Decimal("10")))
+                raise RuntimeError("сбой")
+        assert accounts.get_all() == []
+
+        with database.transaction():
+            accounts.add(BankAccount(1, "Main", Decimal("10")))
+            accounts.update(BankAccount(1, "Main", Decimal("20")))
+        assert accounts.get_by_id(1).balance == Decimal("20")
+
+
+class TestSQLiteBankAccountRepository:
+    def test_crud(self, database):
+        repository = SQLiteBankAccountRepository(database)
+        account = repository.add(BankAccount(0, "Main", Decimal("10.50")))
+
+        assert account.id == 1
+        assert repository.get_by_id(1).balance == Decimal("10.50")
+
+        account.balance = Decimal("20")
+        repository.update(account)
+        assert [a.balance for a in repository.get_all()] == [Decimal("20")]
+
+        repository.delete(account.id)
+        assert repository.get_by_id(account.id) is None
+        with pytest.raises(ValueError):
+            repository.delete(account.id)
+        with pytest.raises(ValueError):
+            repository.update(account)
+
+
+class TestSQLiteCategoryRepository:
+    def test_crud(self, database):
+        repository = SQLiteCategoryRepository(database)
+        category = repository.add(Category(5, "Food", TransactionType.EXPENSE))
+
+        assert repository.get_by_id(5).type == TransactionType.EXPENSE
+
+        category.name = "Groceries"
+        repository.update(category)
+        assert repository.get_all()[0].name == "Groceries"
+
+        repository.delete(5)
+        with pytest.raises(ValueError):
+            repository.delete(5)
+
+
+class TestSQLiteOperationRepository:
+    def test_queries(self, database):
+        repository = SQLiteOperationRepository(database)
+        repository.add(
+            Operation(
+                0, TransactionType.INCOME, 1, Decimal("100"), datetime(2023, 1, 1), 1
+            )
+        )
+        created = repository.add_many(
+            [
+                Operation(
+                    0,
+                    TransactionType.EXPENSE,
+                    1,
+                    Decimal("30.5"),
+                    datetime(2023, 1, 2, 12, 0, 0, 5),
+                    2,
+                    "Lunch",
+                ),
+                Operation(
+                    0, TransactionType.INCOME, 2, Decimal("7"), datetime(2023, 2, 1)
+                ),
+            ]
+        )
+
+        assert [op.id for op in created] == [2, 3]
+        assert repository.get_by_id(2).date == datetime(2023, 1, 2, 12, 0, 0, 5)
+        assert repository.get_by_id(2).description == "Lunch"
+        assert [
+            op.id
+            for op in repository.get_by_period(
+                datetime(2023, 1, 1), datetime(2023, 1, 31)
+            )
+        ] == [1, 2]
+        assert repository.get_period_balance(
+            datetime(2023, 1, 1), datetime(2023, 12, 31)
+        ) == Decimal("76.5")
+        assert repository.get_account_balance(1) == Decimal("69.5")
+        assert [op.id for op in repository.get_by_account(2)] == [3]
+        assert repository.get_category_totals(
+            datetime(2023, 1, 1), datetime(2023, 12, 31)
+        ) == {1: [Decimal("100"), 1], 2: [Decimal("-30.5"), 1]}
+
+        operation = repository.get_by_id(3)
+        operation.amount = Decimal("8")
+        repository.update(operation)
+        assert repository.get_account_balance(2) == Decimal("8")
+
+        repository.delete(3)
+        assert repository.get_by_id(3) is None
+        with pytest.raises(ValueError):
+            repository.update(operation)
+
+    def test_page_and_iter_all(self, database):
+        repository = SQLiteOperationRepository(database)
+        repository.add_many(
+            [
+                Operation(
+                    0, TransactionType.INCOME, 1, Decimal(day), datetime(2023, 1, day)
+                )
+                for day in range(1, 6)
+            ]
+        )
+        repository.delete(2)
+        accounts = SQLiteBankAccountRepository(database)
+        accounts.add(BankAccount(4, "Main", Decimal("0")))
+
+        assert [op.id for op in repository.page(limit=2)] == [1, 3]
+        assert [op.id for op in repository.page(after_id=3, limit=2)] == [4, 5]
+        assert repository.page(after_id=5) == []
+        assert [op.id for op in repository.iter_all()] == [1, 3, 4, 5]
+        assert [a.name for a in accounts.page(after_id=3)] == ["Main"]
+        assert [a.id for a in accounts.iter_all()] == [4]
+
+
+class TestSQLiteContainer:
+    def test_data_survives_restart(self, tmp_path):
+        path = str(tmp_path / "finance.db")
+        container = FinanceModuleContainer(storage="sqlite", database_path=path)
+        account = container.bank_account_facade.create_account("Main", Decimal("100"))
+        container.operation_facade.create_operation(
+            TransactionType.EXPENSE, account.id, Decimal("40"), datetime(2023, 1, 1)
+        )
+        container.database.close()
+
+        restarted = FinanceModuleContainer(storage="sqlite", database_path=path)
+
+        assert restarted.rollups is None
+        assert restarted.bank_account_facade.get_account(account.id).balance == Decimal(
+            "60"
+        )
+        assert len(restarted.operation_facade.get_all_operations()) == 1
+        assert restarted.analytics_service.calculate_balance_for_period(
+            datetime(2023, 1, 1), datetime(2023, 1, 2)
+        ) == Decimal("-40")
+        restarted.database.close()
+
+    def test_bulk_insert_failure_keeps_balances(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "finance.db")
+        container = FinanceModuleContainer(storage="sqlite", database_path=path)
+        account = container.bank_account_facade.create_account("Main", Decimal("100"))
+
+        def fail(entities):
+            raise RuntimeError("сбой записи")
+
+        monkeypatch.setattr(container.operation_repository, "add_many", fail)
+        with pytest.raises(RuntimeError):
+            container.operation_facade.create_operations_bulk(
+                [
+                    Operation(
+                        0,
+                        TransactionType.EXPENSE,
+                        account.id,
+                        Decimal("40"),
+                        datetime(2023, 1, 1),
+                    )
+                ]
+            )
+        container.database.close()
+
+        restarted = FinanceModuleContainer(storage="sqlite", database_path=path)
+        assert restarted.bank_account_facade.get_account(account.id).balance == Decimal(
+            "100"
+        )
+        restarted.database.close()
@@ -3,6 +3,7 @@ from decimal import Decimal
 from abc import ABC, abstractmethod
 
 from models import BankAccount, Category, Operation, TransactionType
+from money import DEFAULT_SCALE, to_minor
 
 
 class EntityValidator(ABC):
@@ -28,9 +29,14 @@ class CategoryValidator(EntityValidator):
 
 
 class OperationValidator(EntityValidator):
+    def __init__(self, scale: int = DEFAULT_SCALE):
+        self.scale = scale
+
     def validate(self, operation: Operation) -> bool:
         if operation.amount <= Decimal("0.0"):
             raise ValueError("Сумма операции должна быть положительной")
+        # Хранилища считают суммы в минимальных единицах валюты
+        to_minor(operation.amount, self.scale)
         if operation.type not in TransactionType:
             raise ValueError("Неправильный тип операции")
         return True
@@ -122,14 +122,17 @@ class StatisticsService:
         self.enclosure_repository = enclosure_repository
 
     def get_statistics(self) -> Dict[str, Any]:
-        animals = self.animal_repository.get_all()
-        enclosures = self.enclosure_repository.get_all()
-
-        total_animals = len(animals)
-        total_enclosures = len(enclosures)
+        total_animals = sum(1 for _ in self.animal_repository.iter_all())
 
+        # Single pass over enclosures: iter_all may be a one-shot iterator
+        total_enclosures = 0
+        available_enclosures = 0
         occupancy_by_type = {}
-        for enclosure in enclosures:
+        for enclosure in self.enclosure_repository.iter_all():
+            total_enclosures += 1
+            if len(enclosure.current_animals) < enclosure.max_capacity:
+                available_enclosures += 1
+
             enclosure_type = str(enclosure.type).split(".")[-1].lower()
             if enclosure_type not in occupancy_by_type:
                 occupancy_by_type[enclosure_type] = 0.0
@@ -138,10 +141,6 @@ class StatisticsService:
                 if occupancy > occupancy_by_type[enclosure_type]:
                     occupancy_by_type[enclosure_type] = occupancy
 
-        available_enclosures = sum(
-            1 for e in enclosures if len(e.current_animals) < e.max_capacity
-        )
-
         return {
             "total_animals": total_animals,
             "total_enclosures": total_enclosures,
@@ -150,5 +149,6 @@ class StatisticsService:
         }
 
     def get_available_enclosures(self) -> List[Enclosure]:
-        enclosures = self.enclosure_repository.get_all()
-        return [e for e in enclosures if not e.current_animals]
+        return [
+            e for e in self.enclosure_repository.iter_all() if not e.current_animals
+        ]
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic
+from typing import Iterator, List, Optional, TypeVar, Generic
 
 T = TypeVar("T")
 
 
 class Repository(ABC, Generic[T]):
+    DEFAULT_PAGE_SIZE = 100
+
     @abstractmethod
     def add(self, entity: T) -> T:
         pass
@@ -17,6 +19,17 @@ class Repository(ABC, Generic[T]):
     def get_all(self) -> List[T]:
         pass
 
+    # Lazy, copy-free iteration and cursor pagination ordered by id
+    @abstractmethod
+    def iter_all(self) -> Iterator[T]:
+        pass
+
+    @abstractmethod
+    def page(
+        self, after_id: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> List[T]:
+        pass
+
     @abstractmethod
     def update(self, entity: T) -> T:
         pass
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, TypeVar, Generic
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, TypeVar, Generic
 
 from domain.repositories import (
     Repository,
@@ -14,8 +15,13 @@ T = TypeVar("T")
 class InMemoryRepository(Repository[T], Generic[T]):
     def __init__(self):
         self._storage: Dict[str, T] = {}
+        # Sorted ids let page() find the cursor position with a binary search
+        self._ids: List[str] = []
 
     def add(self, entity: T) -> T:
+        if entity.id not in self._storage:
+            position = bisect_left(self._ids, entity.id)
+            self._ids.insert(position, entity.id)
         self._storage[entity.id] = entity
         return entity
 
@@ -25,6 +31,17 @@ class InMemoryRepository(Repository[T], Generic[T]):
     def get_all(self) -> List[T]:
         return list(self._storage.values())
 
+    def iter_all(self) -> Iterator[T]:
+        return iter(self._storage.values())
+
+    def page(
+        self, after_id: Optional[str] = None, limit: int = Repository.DEFAULT_PAGE_SIZE
+    ) -> List[T]:
+        if limit < 1:
+            raise ValueError("Page limit must be positive")
+        start = 0 if after_id is None else bisect_right(self._ids, after_id)
+        return [self._storage[id] for id in self._ids[start : start + limit]]
+
     def update(self, entity: T) -> T:
         if entity.id in self._storage:
             self._storage[entity.id] = entity
@@ -34,6 +51,7 @@ class InMemoryRepository(Repository[T], Generic[T]):
     def delete(self, id: str) -> bool:
         if id in self._storage:
             del self._storage[id]
+            del self._ids[bisect_left(self._ids, id)]
             return True
         return False
 
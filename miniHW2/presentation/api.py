@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query
 
 from domain.models import Animal, Enclosure, FeedingSchedule
+from domain.repositories import Repository
 from application.services import (
     AnimalTransferService,
     FeedingService,
@@ -12,6 +13,8 @@ from application.services import (
 
 app = FastAPI()
 
+MAX_PAGE_SIZE = 1000
+
 
 def get_transfer_service() -> AnimalTransferService:
     return app.dependency_overrides.get(
@@ -39,9 +42,11 @@ def create_animal(
 
 @app.get("/animals/", response_model=List[Animal])
 def get_animals(
+    after_id: Optional[str] = None,
+    limit: int = Query(Repository.DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     transfer_service: AnimalTransferService = Depends(get_transfer_service),
 ):
-    return transfer_service.animal_repository.get_all()
+    return transfer_service.animal_repository.page(after_id, limit)
 
 
 @app.get("/animals/{animal_id}", response_model=Animal)
@@ -76,9 +81,11 @@ def create_enclosure(
 
 @app.get("/enclosures/", response_model=List[Enclosure])
 def get_enclosures(
+    after_id: Optional[str] = None,
+    limit: int = Query(Repository.DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     transfer_service: AnimalTransferService = Depends(get_transfer_service),
 ):
-    return transfer_service.enclosure_repository.get_all()
+    return transfer_service.enclosure_repository.page(after_id, limit)
 
 
 @app.delete("/enclosures/{enclosure_id}")
@@ -39,11 +39,23 @@ def test_create_animal():
 
 
 def test_get_animals():
-    transfer_service.animal_repository.get_all.return_value = []
+    transfer_service.animal_repository.page.return_value = []
 
     response = client.get("/animals/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+    transfer_service.animal_repository.page.assert_called_with(None, 100)
+
+
+def test_get_animals_page():
+    transfer_service.animal_repository.page.return_value = []
+
+    response = client.get("/animals/", params={"after_id": "test1", "limit": 10})
+    assert response.status_code == 200
+    transfer_service.animal_repository.page.assert_called_with("test1", 10)
+
+    response = client.get("/animals/", params={"limit": 0})
+    assert response.status_code == 422
 
 
 def test_get_animal():
@@ -85,7 +97,7 @@ def test_create_enclosure():
 
 
 def test_get_enclosures():
-    transfer_service.enclosure_repository.get_all.return_value = []
+    transfer_service.enclosure_repository.page.return_value = []
 
     response = client.get("/enclosures/")
     assert response.status_code == 200
@@ -0,0 +1,68 @@
+import pytest
+
+from domain.models import Enclosure, EnclosureType
+from infrastructure.repository import InMemoryEnclosureRepository
+
+
+def make_enclosure(id: str) -> Enclosure:
+    return Enclosure(id=id, type=EnclosureType.CAGE, size=100.0, max_capacity=2)
+
+
+@pytest.fixture
+def repository():
+    repository = InMemoryEnclosureRepository()
+    for id in ["e3", "e1", "e5", "e2", "e4"]:
+        repository.add(make_enclosure(id))
+    return repository
+
+
+def ids(entities):
+    return [entity.id for entity in entities]
+
+
+def test_first_page(repository):
+    assert ids(repository.page(limit=2)) == ["e1", "e2"]
+    assert ids(repository.page()) == ["e1", "e2", "e3", "e4", "e5"]
+
+
+def test_page_after_id(repository):
+    assert ids(repository.page(after_id="e2", limit=2)) == ["e3", "e4"]
+    assert ids(repository.page(after_id="e4", limit=2)) == ["e5"]
+    assert repository.page(after_id="e5", limit=2) == []
+
+
+def test_page_after_missing_id(repository):
+    # The cursor does not have to exist: paging resumes after its position
+    assert ids(repository.page(after_id="e25", limit=2)) == ["e3", "e4"]
+    assert ids(repository.page(after_id="a", limit=1)) == ["e1"]
+    assert repository.page(after_id="z") == []
+
+
+def test_page_after_delete(repository):
+    assert repository.delete("e3")
+    assert ids(repository.page(after_id="e2", limit=2)) == ["e4", "e5"]
+
+    # Deleting the cursor entity itself does not break the next page
+    assert repository.delete("e2")
+    assert ids(repository.page(after_id="e2", limit=2)) == ["e4", "e5"]
+    assert ids(repository.page()) == ["e1", "e4", "e5"]
+
+    repository.add(make_enclosure("e3"))
+    assert ids(repository.page(after_id="e1", limit=1)) == ["e3"]
+
+
+def test_update_keeps_page_position(repository):
+    repository.update(make_enclosure("e2"))
+    assert ids(repository.page()) == ["e1", "e2", "e3", "e4", "e5"]
+
+
+def test_iter_all(repository):
+    assert sorted(ids(repository.iter_all())) == ["e1", "e2", "e3", "e4", "e5"]
+    repository.delete("e1")
+    assert sorted(ids(repository.iter_all())) == ["e2", "e3", "e4", "e5"]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_page_limit_must_be_positive(repository, limit):
+    with pytest.raises(ValueError):
+        repository.page(limit=limit)
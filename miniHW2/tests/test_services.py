@@ -238,8 +238,8 @@ def test_zoo_statistics(statistics_service, animal_repository, enclosure_reposit
         ),
     ]
 
-    animal_repository.get_all.return_value = animals
-    enclosure_repository.get_all.return_value = enclosures
+    animal_repository.iter_all.return_value = iter(animals)
+    enclosure_repository.iter_all.return_value = iter(enclosures)
 
     stats = statistics_service.get_statistics()
 
@@ -282,8 +282,8 @@ def test_get_available_enclosures(
         ),
     ]
 
-    animal_repository.get_all.return_value = animals
-    enclosure_repository.get_all.return_value = enclosures
+    animal_repository.iter_all.return_value = iter(animals)
+    enclosure_repository.iter_all.return_value = iter(enclosures)
 
     available = statistics_service.get_available_enclosures()
 